@@ -0,0 +1,139 @@
+# ============================================================
+# backend/admission.py
+# ------------------------------------------------------------
+# Adaptive load shedding for the scoring endpoints. The
+# controller tracks requests in flight (including those still
+# queued for the threadpool) and an EWMA of their end-to-end
+# latency. When either crosses its "enter" threshold, new
+# requests are served degraded (classifier + exact leak lookup
+# only); once both are back under the lower "exit" thresholds
+# it returns to full fidelity. The gap between the two
+# (hysteresis) keeps the mode from flapping.
+#
+# Configured per worker process from the environment:
+#   SENTINEL_SHED=0                       disable
+#   SENTINEL_SHED_ENTER_INFLIGHT / _EXIT_INFLIGHT      (64 / 32)
+#   SENTINEL_SHED_ENTER_LATENCY_MS / _EXIT_LATENCY_MS  (500 / 200)
+#   SENTINEL_SHED_EWMA_ALPHA                            (0.2)
+# ============================================================
+
+import contextvars
+import os
+import threading
+import time
+
+from backend import metrics
+
+_degraded = contextvars.ContextVar("degraded", default=False)
+
+DEGRADED_REQUESTS = metrics.REGISTRY.counter(
+    "sentinel_degraded_requests_total", "Scoring requests served in degraded mode.")
+MODE_CHANGES = metrics.REGISTRY.counter(
+    "sentinel_degraded_transitions_total", "Switches between full and degraded scoring.", labels=("to",))
+
+
+def is_degraded():
+    """True if the current request was admitted in degraded mode."""
+    return _degraded.get()
+
+
+class AdmissionController:
+    def __init__(self, enter_inflight=64, exit_inflight=32, enter_latency=0.5, exit_latency=0.2,
+                 alpha=0.2, enabled=True, warm=None):
+        self.enter_inflight, self.exit_inflight = enter_inflight, exit_inflight
+        self.enter_latency, self.exit_latency = enter_latency, exit_latency
+        self.alpha = alpha
+        self.enabled = enabled
+        self.warm = warm        # callable; requests admitted before it returns True (model loading) are not sampled
+        self.inflight = 0
+        self.latency = 0.0      # EWMA, seconds
+        self.degraded = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, environ=os.environ, warm=None):
+        return cls(
+            enter_inflight=int(environ.get("SENTINEL_SHED_ENTER_INFLIGHT", 64)),
+            exit_inflight=int(environ.get("SENTINEL_SHED_EXIT_INFLIGHT", 32)),
+            enter_latency=float(environ.get("SENTINEL_SHED_ENTER_LATENCY_MS", 500)) / 1e3,
+            exit_latency=float(environ.get("SENTINEL_SHED_EXIT_LATENCY_MS", 200)) / 1e3,
+            alpha=float(environ.get("SENTINEL_SHED_EWMA_ALPHA", 0.2)),
+            enabled=environ.get("SENTINEL_SHED", "1") != "0",
+            warm=warm,
+        )
+
+    def _update_mode(self):
+        # Called with the lock held
+        if not self.degraded and (self.inflight >= self.enter_inflight or self.latency >= self.enter_latency):
+            self.degraded = True
+            MODE_CHANGES.inc(to="degraded")
+            print(f"[WARN] Load shedding on: {self.inflight} in flight, "
+                  f"EWMA latency {self.latency * 1e3:.0f} ms; serving classifier + leak lookup only")
+        elif self.degraded and self.inflight <= self.exit_inflight and self.latency <= self.exit_latency:
+            self.degraded = False
+            MODE_CHANGES.inc(to="full")
+            print(f"[INFO] Load shedding off: {self.inflight} in flight, EWMA latency {self.latency * 1e3:.0f} ms")
+
+    def is_warm(self):
+        return self.warm is None or self.warm()
+
+    def admit(self):
+        """Register a new request; returns whether it should be served degraded."""
+        if not self.enabled:
+            return False
+        with self._lock:
+            self.inflight += 1
+            self._update_mode()
+            return self.degraded
+
+    def release(self, elapsed, sample=True):
+        """Unregister a request; its latency feeds the EWMA if `sample` (it was admitted warm)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.inflight -= 1
+            if sample:
+                self.latency += self.alpha * (elapsed - self.latency)
+            self._update_mode()
+
+    def status(self):
+        return {
+            "enabled": self.enabled,
+            "degraded": self.degraded,
+            "inflight": self.inflight,
+            "latency_ewma_ms": round(self.latency * 1e3, 2),
+        }
+
+    def collector(self):
+        """Gauges for metrics.REGISTRY.register_collector."""
+        def collect():
+            return [
+                ("sentinel_admission_inflight", "gauge", "Scoring requests in flight (incl. queued).", [({}, self.inflight)]),
+                ("sentinel_admission_latency_ewma_seconds", "gauge", "EWMA of scoring request latency.", [({}, self.latency)]),
+                ("sentinel_degraded", "gauge", "1 while serving degraded scoring.", [({}, int(self.degraded))]),
+            ]
+        return collect
+
+
+class AdmissionMiddleware:
+    """ASGI middleware admitting requests to `paths`; the endpoint reads the mode via is_degraded()."""
+
+    def __init__(self, app, controller, paths):
+        self.app = app
+        self.controller = controller
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+        sample = self.controller.is_warm()
+        degraded = self.controller.admit()
+        if degraded:
+            DEGRADED_REQUESTS.inc()
+        token = _degraded.set(degraded)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(time.perf_counter() - start, sample)
+            _degraded.reset(token)
@@ -5,27 +5,145 @@
 # Compatible with Python 3.9 and FastAPI frontend integrations
 # ============================================================
 
-from fastapi import FastAPI
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Heavy libraries (torch, lightgbm, sklearn, pandas) are imported by the
+# model loaders below on first use, not here; see backend/registry.py.
+import json
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
-from typing import Optional
-import torch
+from starlette.datastructures import Headers
+from typing import List, Optional
 import numpy as np
-import pandas as pd
-from src.models.classifier_model import PasswordClassifier
-from src.models.leak_model import LeakRiskScorer
-from src.models.anomaly_model import PasswordAutoencoder
-from src.generator.password_generator import generate_password
-from src.features.extractors import extract_features
-from src.config import MODEL_A_PATH, MODEL_C_PATH
-import sys, os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.ensemble import FusionModel
+from backend import metrics
+from backend.metrics import stage, record_fallback
+from backend import profiling
+from backend.profiling import profiled
+from backend.registry import ModelRegistry
+from backend.singleflight import SingleFlight, flight_key
+from backend.admission import AdmissionController, AdmissionMiddleware, is_degraded
+from backend.zerocopy import FileSliceResponse
+from src.inference.anomaly_detector import get_model as get_model_c
+from src.generator.password_generator import generate_batch
+from src.features.extractors import features_matrix
+from src.features.patterns import get_matcher, pattern_feedback
+from src.models.classifier_model import PasswordClassifier, LABELS
+from src.config import (
+    MODEL_A_PATH, MODEL_B_PATH, MODEL_C_PATH, FUSION_PATH, GUESS_NUMBER_PATH, RANGE_DIR, ANOMALY_THRESHOLDS_PATH,
+    STUDENT_PATH,
+)
+
+
+# ------------------------------------------------------------
+# Models (loaded lazily, warmed up in the background)
+# ------------------------------------------------------------
+def _load_model_a():
+    print("[INFO] Loading Model A (Classifier)...")
+    return PasswordClassifier.load(MODEL_A_PATH)
+
+
+def _load_model_b():
+    print("[INFO] Loading Model B (Leak / Hacker Risk Scorer)...")
+    from src.models.leak_model import LeakRiskScorer
+    return LeakRiskScorer()
+
+
+def _load_hacker_risk():
+    # Optional: used by the generator to reject risky suggestions
+    from src.models.hacker_risk import HackerRiskModel
+    try:
+        return HackerRiskModel.load(MODEL_B_PATH)
+    except Exception as e:
+        print(f"[WARN] Hacker risk model unavailable ({e}); generator skips risk rejection.")
+        return None
+
+
+def _load_model_c():
+    print("[INFO] Loading Model C (Unsupervised Autoencoder)...")
+    return get_model_c(MODEL_C_PATH)
+
+
+def _load_fusion():
+    return FusionModel.load_or_default(FUSION_PATH)
+
+
+def _load_guess_number():
+    # Optional: built offline by src/train/build_guess_number.py
+    if not os.path.exists(GUESS_NUMBER_PATH):
+        print(f"[WARN] {GUESS_NUMBER_PATH} not found; responses carry no guess_number.")
+        return None
+    from src.models.guess_number import GuessNumberEstimator
+    return GuessNumberEstimator.load(GUESS_NUMBER_PATH)
+
+
+def _load_anomaly_threshold():
+    # Calibrated by src/unsupervised/calibrate_thresholds.py; the default otherwise
+    if not os.path.exists(ANOMALY_THRESHOLDS_PATH):
+        return ANOMALY_THRESHOLD
+    with open(ANOMALY_THRESHOLDS_PATH, "r", encoding="utf-8") as f:
+        component = json.load(f)["components"]["model_c.reconstruction_error"]
+    print(f"[INFO] Anomaly threshold {component['threshold']:.4f} "
+          f"(q={component['quantile']} over {component['n']:,} passwords)")
+    return float(component["threshold"])
+
+
+def _load_student():
+    # Optional: distilled by src/train/distill_ensemble.py. SENTINEL_PREFILTER=0 disables it;
+    # SENTINEL_PREFILTER_MARGIN overrides the margin (risk points) picked at distillation
+    if os.environ.get("SENTINEL_PREFILTER", "1") == "0" or not os.path.exists(STUDENT_PATH):
+        return None
+    from src.models.student_model import StudentModel
+    student = StudentModel.load(STUDENT_PATH)
+    if student.teacher != models.get("fusion").to_dict():
+        print(f"[WARN] {STUDENT_PATH} was distilled from another fusion calibration; pre-filter off "
+              "until it is re-distilled (python -m src.train.distill_ensemble)")
+        return None
+    if os.environ.get("SENTINEL_PREFILTER_MARGIN"):
+        student.margin = float(os.environ["SENTINEL_PREFILTER_MARGIN"])
+    print(f"[INFO] Student pre-filter loaded (margin {student.margin:g} risk points)")
+    return student
+
+
+def _load_range_index():
+    # Optional: built offline by src/data/range_index.py
+    from src.data.range_index import RangeIndex, blob_path
+    if not os.path.exists(blob_path(RANGE_DIR)):
+        print(f"[WARN] {RANGE_DIR} has no range index; /range is unavailable.")
+        return None
+    return RangeIndex(RANGE_DIR)
+
+
+models = ModelRegistry()
+models.register("model_a", _load_model_a)
+models.register("fusion", _load_fusion)
+models.register("model_c", _load_model_c)
+models.register("model_b", _load_model_b)
+models.register("hacker_risk", _load_hacker_risk)
+models.register("patterns", get_matcher)
+models.register("guess_number", _load_guess_number)
+models.register("student", _load_student)
+models.register("range_index", _load_range_index)
+models.register("anomaly_threshold", _load_anomaly_threshold)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # SENTINEL_WARMUP=0 disables background warmup (models then load on first request)
+    if os.environ.get("SENTINEL_WARMUP", "1") != "0":
+        models.warmup()
+    yield
 
 
 # ------------------------------------------------------------
 # Initialize FastAPI
 # ------------------------------------------------------------
-app = FastAPI(title="Password Safety API")
+app = FastAPI(title="Password Safety API", lifespan=lifespan)
 
 # ------------------------------------------------------------
 # ✅ Enable CORS for Frontend Integration
@@ -48,21 +166,64 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+metrics.REGISTRY.register_collector(metrics.lru_cache_collector("model_c", get_model_c))
+
 # ------------------------------------------------------------
-# Load Models
+# Request timing (/metrics + opt-in Server-Timing header)
+# and per-request cProfile (admin only, see backend/profiling.py)
 # ------------------------------------------------------------
-print("[INFO] Loading Model A (Classifier)...")
-model_a = PasswordClassifier.load(MODEL_A_PATH)
+# Send "X-Server-Timing: 1" to get per-stage durations back
+SERVER_TIMING_REQUEST_HEADER = "x-server-timing"
 
-print("[INFO] Loading Model B (Leak / Hacker Risk Scorer)...")
-model_b = LeakRiskScorer()
 
-print("[INFO] Loading Model C (Unsupervised Autoencoder)...")
-model_c = PasswordAutoencoder(input_dim=8)
-model_c.load_state_dict(torch.load(MODEL_C_PATH, map_location="cpu"))
-model_c.eval()
+class RequestInstrumentation:
+    """
+    Plain ASGI middleware (not @app.middleware("http")) so response messages pass
+    through untouched, including zero-copy file responses from /range.
+    """
 
-print("[✅] All models loaded successfully.")
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = Headers(scope=scope)
+        timings = metrics.begin_server_timing() if headers.get(SERVER_TIMING_REQUEST_HEADER) else None
+        profile = profiling.begin_request_profile(headers)
+        start = time.perf_counter()
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                extra = []
+                if timings is not None:
+                    value = metrics.server_timing_header(timings, total=time.perf_counter() - start)
+                    extra.append((b"server-timing", value.encode("latin-1")))
+                if profile and "id" in profile:
+                    extra.append((b"x-profile-id", profile["id"].encode("latin-1")))
+                if extra:
+                    message = {**message, "headers": list(message.get("headers", [])) + extra}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            endpoint = scope.get("endpoint")
+            metrics.REQUEST_SECONDS.observe(time.perf_counter() - start,
+                                            endpoint=getattr(endpoint, "__name__", "unmatched"))
+
+
+app.add_middleware(RequestInstrumentation)
+
+# Load shedding for the scoring endpoints (see backend/admission.py); latency is
+# sampled once the models /evaluate uses have loaded (or failed), whether by
+# warmup or by the first request
+SCORING_MODELS = ("model_a", "model_b", "fusion", "model_c", "patterns", "guess_number", "anomaly_threshold",
+                  "student")
+admission = AdmissionController.from_env(warm=lambda: models.settled(SCORING_MODELS))
+app.add_middleware(AdmissionMiddleware, controller=admission, paths=("/evaluate", "/evaluate_batch"))
+metrics.REGISTRY.register_collector(admission.collector())
+app.include_router(profiling.router)
 
 # ------------------------------------------------------------
 # Request Schemas
@@ -71,6 +232,10 @@ class PasswordReq(BaseModel):
     password: str
 
 
+class PasswordBatchReq(BaseModel):
+    passwords: List[str]
+
+
 class PasswordBaseReq(BaseModel):
     base: Optional[str] = None
     length: Optional[int] = None
@@ -78,105 +243,269 @@ class PasswordBaseReq(BaseModel):
 
 
 # ------------------------------------------------------------
-# Evaluate Password
+# Evaluate Password(s)
 # ------------------------------------------------------------
-@app.post("/evaluate")
-def evaluate(req: PasswordReq):
-    pw = req.password.strip()
+MAX_BATCH = 1000
+ANOMALY_THRESHOLD = 0.2  # used until an anomaly_thresholds.json is calibrated
+
+
+def score_batch(passwords, degraded=False):
+    """
+    Run every model over a batch at once; returns one response dict per password.
+    degraded=True (load shedding) keeps the classifier and the exact leak lookup only:
+    no autoencoder, pattern scan or n-gram guess number. Otherwise, if a distilled
+    student is available, rows it is confident about take its risk estimate and skip
+    those same stages; only borderline rows run the full stack.
+    """
+    n = len(passwords)
+    model_a, model_b, fusion = models.get("model_a"), models.get("model_b"), models.get("fusion")
+    student = threshold = None
+    if not degraded:
+        model_c, matcher, guesser = models.get("model_c"), models.get("patterns"), models.get("guess_number")
+        threshold = models.get("anomaly_threshold")
+        student = models.get("student")
+
+    with stage("features"):
+        X = features_matrix(passwords)
 
     # --- Model A ---
-    a_label, a_conf = model_a.predict(pw)
+    with stage("model_a"):
+        probs = model_a.predict_proba_features(X)
 
     # --- Model B ---
-    b_score = model_b.score(pw)
-    leak_risk = {
-        "score": round(b_score, 2),
-        "is_leaked": b_score > 70,
-        "message": (
-            "⚠️ Found in common password leaks!" if b_score > 70
-            else "✅ Not found in major leaks."
-        ),
-    }
+    with stage("model_b"):
+        b_scores = np.array([model_b.score(pw) for pw in passwords], dtype=np.float64)
+        metrics.LEAK_HITS.inc(sum(pw in model_b.freq_table for pw in passwords))
+
+    # --- Student pre-filter: rows far from every label cutoff skip the rest ---
+    full = np.full(n, not degraded)
+    if student is not None:
+        with stage("student"):
+            student_risk = student.predict_risk(X, probs, b_scores)
+            full = ~student.confident(student_risk)
+        metrics.PREFILTERED.inc(int(n - full.sum()))
+    rows = np.flatnonzero(full)
 
     # --- Model C ---
-    try:
-        with torch.no_grad():
-            recon_error = model_c.reconstruction_error(pw)
-        anomaly_score = float(recon_error)
-        anomaly_detection = {
+    anomaly, c_ok = np.zeros(n), False
+    if len(rows):
+        with stage("model_c"):
+            try:
+                anomaly[rows] = model_c.reconstruction_error(X[rows])
+                c_ok = True
+            except Exception as e:
+                record_fallback("model_c", e)
+                anomaly[rows] = 0.1
+
+    # --- Fusion (the student's estimate for rows it answered) ---
+    with stage("fusion"):
+        fused = fusion.fuse(probs, b_scores, anomaly if c_ok else np.zeros(n))
+        if student is not None and len(rows) < n:
+            skip = ~full
+            fused["risk_score"][skip] = np.round(student_risk[skip], 2)
+            fused["final_label"][skip] = fusion.labels(fused["risk_score"][skip])
+
+    # --- Patterns (sequences, keyboard walks, dates, words, names) ---
+    analyses = [None] * n
+    if len(rows):
+        with stage("patterns"):
+            for i in rows:
+                analyses[i] = matcher.analyze(passwords[i])
+
+    # --- Guess number (Monte-Carlo rank table) ---
+    log10_guesses = [None] * n
+    if len(rows) and guesser is not None:
+        with stage("guess_number"):
+            for i in rows:
+                log10_guesses[i] = guesser.log10_guess_number(passwords[i])
+
+    metrics.PASSWORDS_SCORED.inc(n)
+    with stage("feedback"):
+        return _assemble(passwords, probs, b_scores, anomaly, c_ok, threshold, fused, analyses, log10_guesses,
+                         full, degraded)
+
+
+def _assemble(passwords, probs, b_scores, anomaly, c_ok, threshold, fused, analyses, log10_guesses, full,
+              degraded):
+    """Per-password response dicts (labels, leak/anomaly blocks, feedback); `full` marks full-stack rows."""
+    results = []
+    for i in range(len(passwords)):
+        # --- Strength Mapping ---
+        strength = LABELS[int(np.argmax(probs[i]))]
+        b_score = float(b_scores[i])
+        leak_risk = {
+            "score": round(b_score, 2),
+            "is_leaked": b_score > 70,
+            "message": (
+                "⚠️ Found in common password leaks!" if b_score > 70
+                else "✅ Not found in major leaks."
+            ),
+        }
+        anomaly_score = float(anomaly[i])
+        anomaly_detection = None if not full[i] else {
             "score": anomaly_score,
-            "is_anomaly": anomaly_score > 0.2,
+            "is_anomaly": c_ok and anomaly_score > threshold,
             "reconstruction_error": anomaly_score,
         }
-    except Exception:
-        anomaly_detection = {
-            "score": 0.1,
-            "is_anomaly": False,
-            "reconstruction_error": 0.1,
+
+        # --- Probabilities ---
+        classifier_probabilities = {
+            "weak": round(float(probs[i, 0]), 3),
+            "medium": round(float(probs[i, 1]), 3),
+            "strong": round(float(probs[i, 2]), 3),
         }
 
-    # --- Strength Mapping ---
-    # a_label is already a string ("weak", "medium", "strong") from model_a.predict
-    strength = a_label
-
-    # --- Probabilities ---
-    # Get actual probabilities from the model (using same method as predict)
-    feat_dict = extract_features(pw)
-    df = pd.DataFrame([feat_dict])
-    
-    # Get numeric features in the same order as classifier_model.predict
-    numeric_cols = ['length', 'upper', 'lower', 'digits', 'special', 
-                   'diversity', 'entropy', 'sequence_score']
-    X_numeric = df[numeric_cols].values
-    
-    # Pad or truncate to match model's expected feature count
-    if X_numeric.shape[1] < model_a.model.n_features_:
-        padding = np.zeros((1, model_a.model.n_features_ - X_numeric.shape[1]))
-        feats = np.hstack([X_numeric, padding]).reshape(1, -1)
-    elif X_numeric.shape[1] > model_a.model.n_features_:
-        feats = X_numeric[:, :model_a.model.n_features_].reshape(1, -1)
-    else:
-        feats = X_numeric.reshape(1, -1)
-    
-    probs = model_a.model.predict_proba(feats)[0]
-    classifier_probabilities = {
-        "weak": round(probs[0], 3),
-        "medium": round(probs[1], 3),
-        "strong": round(probs[2], 3),
-    }
+        # --- Feedback ---
+        feedback = []
+        if strength == "weak":
+            feedback.append("Use a mix of uppercase, lowercase, digits, and symbols.")
+        if b_score > 60:
+            feedback.append("Avoid passwords found in breach databases.")
+        if anomaly_detection and anomaly_detection["is_anomaly"]:
+            feedback.append("Try a less predictable pattern.")
+        patterns = None
+        if analyses[i] is not None:
+            feedback += pattern_feedback(passwords[i], analyses[i])
+            patterns = {
+                "sequence_score": analyses[i]["sequence_score"],
+                "counts": analyses[i]["counts"],
+                "matches": [m._asdict() for m in analyses[i]["cover"]],
+            }
 
-    # --- Feedback ---
-    feedback = []
-    if strength == "weak":
-        feedback.append("Use a mix of uppercase, lowercase, digits, and symbols.")
-    if b_score > 60:
-        feedback.append("Avoid passwords found in breach databases.")
-    if anomaly_detection["is_anomaly"]:
-        feedback.append("Try a less predictable pattern.")
+        results.append({
+            "strength": strength,
+            "classifier_probabilities": classifier_probabilities,
+            "leak_risk": leak_risk,
+            "anomaly_detection": anomaly_detection,
+            "patterns": patterns,
+            "guess_number": None if log10_guesses[i] is None else {
+                "log10": round(log10_guesses[i], 2),
+                "guesses": float(f"{10 ** min(log10_guesses[i], 300):.3g}"),
+            },
+            "final": {
+                "label": str(fused["final_label"][i]),
+                "risk_score": float(fused["risk_score"][i]),
+            },
+            "feedback": feedback,
+            "degraded": degraded,
+            "prefiltered": not degraded and not bool(full[i]),
+        })
+    return results
 
-    return {
-        "strength": strength,
-        "classifier_probabilities": classifier_probabilities,
-        "leak_risk": leak_risk,
-        "anomaly_detection": anomaly_detection,
-        "feedback": feedback,
-    }
+
+# Identical passwords in flight at the same time are scored once (see backend/singleflight.py)
+flights = SingleFlight()
+
+
+def score_unique(passwords):
+    """score_batch over distinct passwords, sharing work with concurrent requests for the same ones."""
+    degraded = is_degraded()
+    mode = b"d" if degraded else b"f"  # full and degraded results are never shared
+    return flights.do_many([mode + flight_key(pw) for pw in passwords],
+                           lambda positions: score_batch([passwords[i] for i in positions], degraded))
+
+
+@app.post("/evaluate")
+@profiled
+def evaluate(req: PasswordReq):
+    return score_unique([req.password.strip()])[0]
+
+
+@app.post("/evaluate_batch")
+@profiled
+def evaluate_batch(req: PasswordBatchReq):
+    if len(req.passwords) > MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH} passwords per request.")
+    if not req.passwords:
+        return {"results": []}
+    passwords = [pw.strip() for pw in req.passwords]
+    unique = list(dict.fromkeys(passwords))
+    scored = dict(zip(unique, score_unique(unique)))
+    return {"results": [scored[pw] for pw in passwords]}
 
 
 # ------------------------------------------------------------
 # Generate Passwords
 # ------------------------------------------------------------
+def _peek_or_prefetch(name):
+    """The model if loaded, else None after starting a background load."""
+    model = models.peek(name)
+    if model is None:
+        models.prefetch(name)
+    return model
+
+
 @app.post("/generate_password")
+@profiled
 def generate_pw(req: PasswordBaseReq):
     base_word = req.base.strip() if req.base else "sentinel"
+    # Never wait on a model load here (the leak table alone reads the whole leak
+    # dump): scorers that are not in yet start loading in the background, and until
+    # then suggestions skip leak / risk rejection and rank by charset entropy
+    model_b, classifier, risk_model = (_peek_or_prefetch(name) for name in ("model_b", "model_a", "hacker_risk"))
 
     try:
-        result = generate_password(base_word)
+        with stage("generator"):
+            result = generate_batch(
+                base_word,
+                length=req.length,
+                mode=req.mode or "balanced",
+                leak_table=model_b.freq_table if model_b else None,
+                risk_model=risk_model,
+                classifier=classifier,
+            )
         return {"passwords": result["suggestions"]}
+    except ValueError as e:
+        # Bad input (unknown mode, base too short, length out of range): the client's error
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        record_fallback("generator", e)
         return {"passwords": [f"Error: {str(e)}"]}
 
 
+# ------------------------------------------------------------
+# k-Anonymity Range Lookup (HIBP-style)
+# ------------------------------------------------------------
+# Clients send the first 5 hex chars of SHA-1(password) and match the
+# "SUFFIX:COUNT" lines locally; the password never leaves the client.
+RANGE_CACHE_CONTROL = "public, max-age=86400"
+
+
+@app.get("/range/{prefix}")
+async def range_lookup(prefix: str):
+    index = models.get("range_index")
+    if index is None:
+        raise HTTPException(status_code=503, detail="Range index not built (python -m src.data.range_index).")
+    try:
+        offset, length = index.span(prefix)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FileSliceResponse(index.file, offset, length, headers={"Cache-Control": RANGE_CACHE_CONTROL})
+
+
+# ------------------------------------------------------------
+# Metrics
+# ------------------------------------------------------------
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+# ------------------------------------------------------------
+# Health
+# ------------------------------------------------------------
+@app.get("/health")
+def health():
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready():
+    body = {"ready": models.ready(), "models": models.status(), "errors": models.errors(),
+            "admission": admission.status()}
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
+
+
 # ------------------------------------------------------------
 # Root Endpoint
 # ------------------------------------------------------------
@@ -184,5 +513,5 @@ def generate_pw(req: PasswordBaseReq):
 def root():
     return {
         "message": "🔐 Password Safety API is running!",
-        "endpoints": ["/evaluate", "/generate_password"],
+        "endpoints": ["/evaluate", "/evaluate_batch", "/generate_password", "/range/{prefix}", "/metrics", "/health", "/ready"],
     }
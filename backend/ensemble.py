@@ -1,4 +1,13 @@
+import json
+import os
+
+import numpy as np
+
+LABEL_NAMES = np.array(["weak", "medium", "strong"])
+
+
 def combine_scores(a_label, a_conf, b_score, c_score):
+    """Legacy scalar fusion with fixed weights (see FusionModel for the batch path)."""
     weights = {"a": 0.5, "b": 0.3, "c": 0.2}
     label_to_base = {"weak": 80, "medium": 50, "strong": 20}
 
@@ -13,3 +22,88 @@ def combine_scores(a_label, a_conf, b_score, c_score):
         final_label = "strong"
 
     return {"final_label": final_label, "risk_score": round(risk, 2)}
+
+
+class FusionModel:
+    """
+    Vectorized fusion of per-model scores for a batch:
+        z    = [p_weak, p_medium, p_strong, leak / 100, clip(anomaly, 0, 1)]
+        lin  = z @ weights + bias
+        risk = 100 * calibrate(lin)          (0..100, higher = riskier)
+        label: weak if risk > cutoffs[1], medium if risk > cutoffs[0], else strong
+
+    calibrate is the identity (lin already on the 0..1 scale), "platt"
+    (sigmoid) or "isotonic" (piecewise-linear knots). Fitted offline by
+    src/train/fit_fusion.py and stored as JSON next to the models.
+    """
+
+    FEATURES = ["p_weak", "p_medium", "p_strong", "leak", "anomaly"]
+
+    def __init__(self, weights, bias=0.0, calibration=None, cutoffs=(40.0, 70.0)):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.calibration = calibration or {"type": "identity"}
+        self.cutoffs = tuple(float(c) for c in cutoffs)
+
+    @classmethod
+    def default(cls):
+        """Uncalibrated weights matching combine_scores (expected label base instead of argmax)."""
+        a, b, c = 0.5, 0.3, 0.2
+        return cls(weights=[a * 0.8, a * 0.5, a * 0.2, b, c], bias=0.0)
+
+    # -------------------------
+    # Scoring
+    # -------------------------
+    @staticmethod
+    def stack(probs, leak, anomaly):
+        """Design matrix z (N, 5) from per-model score arrays."""
+        probs = np.asarray(probs, dtype=np.float64).reshape(-1, 3)
+        leak = np.asarray(leak, dtype=np.float64).reshape(-1, 1) / 100.0
+        anomaly = np.clip(np.asarray(anomaly, dtype=np.float64).reshape(-1, 1), 0.0, 1.0)
+        return np.hstack([probs, leak, anomaly])
+
+    def calibrate(self, lin):
+        kind = self.calibration["type"]
+        if kind == "platt":
+            return 1.0 / (1.0 + np.exp(-lin))
+        if kind == "isotonic":
+            return np.interp(lin, self.calibration["x"], self.calibration["y"])
+        return np.clip(lin, 0.0, 1.0)
+
+    def labels(self, risk):
+        """Final labels for risk scores (0..100)."""
+        risk = np.asarray(risk)
+        return LABEL_NAMES[np.where(risk > self.cutoffs[1], 0, np.where(risk > self.cutoffs[0], 1, 2))]
+
+    def fuse(self, probs, leak, anomaly):
+        """Final labels (N,) and risk scores (N,) in one NumPy pass."""
+        lin = self.stack(probs, leak, anomaly) @ self.weights + self.bias
+        risk = np.round(100.0 * self.calibrate(lin), 2)
+        return {"final_label": self.labels(risk), "risk_score": risk}
+
+    # -------------------------
+    # Save / load
+    # -------------------------
+    def to_dict(self):
+        return {
+            "features": self.FEATURES,
+            "weights": self.weights.tolist(),
+            "bias": self.bias,
+            "calibration": self.calibration,
+            "cutoffs": list(self.cutoffs),
+        }
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["weights"], data["bias"], data.get("calibration"), data.get("cutoffs", (40.0, 70.0)))
+
+    @classmethod
+    def load_or_default(cls, path):
+        return cls.load(path) if os.path.exists(path) else cls.default()
@@ -0,0 +1,192 @@
+# ============================================================
+# backend/metrics.py
+# ------------------------------------------------------------
+# Lightweight in-process metrics for the API:
+#   - counters and fixed-bucket histograms (thread-safe)
+#   - stage() timer (time.perf_counter) feeding the per-stage
+#     latency histogram and, when a request opted in, its
+#     Server-Timing header (collected through a contextvar)
+#   - render() -> Prometheus text exposition format (/metrics)
+# ============================================================
+
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Seconds; covers ~50µs lookups up to multi-second generator calls
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _fmt_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (extra or [])
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _fmt_value(v):
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[k]) for k in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels[k]) for k in self.labels), 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines += [f"{self.name}{_fmt_labels(self.labels, k)} {_fmt_value(v)}" for k, v in items]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[k]) for k in self.labels)
+        i = bisect_left(self.buckets, value)  # first bucket with value <= le
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[i] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(list(self.buckets) + ["+Inf"], series[:-1]):
+                cumulative += count
+                le = bound if bound == "+Inf" else repr(float(bound))
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, key, [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labels, key)} {series[-1]!r}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Holds metrics plus collectors: callables returning [(name, type, help, [(labels dict, value)])]."""
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def counter(self, name, help_text, labels=()):
+        m = Counter(name, help_text, labels)
+        self.metrics.append(m)
+        return m
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        m = Histogram(name, help_text, labels, buckets)
+        self.metrics.append(m)
+        return m
+
+    def register_collector(self, fn):
+        self.collectors.append(fn)
+        return fn
+
+    def render(self):
+        lines = []
+        for m in self.metrics:
+            lines += m.render()
+        for collect in self.collectors:
+            for name, kind, help_text, samples in collect():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for labels, value in samples:
+                    lines.append(f"{name}{_fmt_labels(list(labels), list(labels.values()))} {_fmt_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "sentinel_request_seconds", "End-to-end request latency by endpoint.", labels=("endpoint",))
+STAGE_SECONDS = REGISTRY.histogram(
+    "sentinel_stage_seconds", "Latency of each scoring stage (per batch).", labels=("stage",))
+PASSWORDS_SCORED = REGISTRY.counter(
+    "sentinel_passwords_scored_total", "Passwords scored by /evaluate and /evaluate_batch.")
+LEAK_HITS = REGISTRY.counter(
+    "sentinel_leak_hits_total", "Scored passwords found verbatim in the leak table.")
+PREFILTERED = REGISTRY.counter(
+    "sentinel_prefiltered_total", "Scored passwords answered by the student pre-filter alone.")
+FALLBACKS = REGISTRY.counter(
+    "sentinel_fallbacks_total", "Exceptions caught and replaced by a fallback value.",
+    labels=("stage", "error"))
+
+
+def lru_cache_collector(name, fn):
+    """Collector exposing functools.lru_cache statistics of `fn` under cache=name."""
+    def collect():
+        info = fn.cache_info()
+        return [
+            ("sentinel_lru_cache_hits_total", "counter", "functools.lru_cache hits.", [({"cache": name}, info.hits)]),
+            ("sentinel_lru_cache_misses_total", "counter", "functools.lru_cache misses.", [({"cache": name}, info.misses)]),
+            ("sentinel_lru_cache_size", "gauge", "functools.lru_cache current size.", [({"cache": name}, info.currsize)]),
+        ]
+    return collect
+
+
+def record_fallback(stage_name, exc):
+    """Count a swallowed exception; the first one of each kind is also printed."""
+    error = type(exc).__name__
+    if FALLBACKS.value(stage=stage_name, error=error) == 0:
+        print(f"[WARN] {stage_name} failed, using fallback ({error}: {exc}); further occurrences only counted")
+    FALLBACKS.inc(stage=stage_name, error=error)
+
+
+# ------------------------------------------------------------
+# Stage timers / Server-Timing
+# ------------------------------------------------------------
+# Set to a list by the middleware for requests that asked for
+# Server-Timing; the (copied) context reaches the endpoint's
+# worker thread, and the list is shared, so stages append to it.
+_server_timing = contextvars.ContextVar("server_timing", default=None)
+
+
+@contextmanager
+def stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        timings = _server_timing.get()
+        if timings is not None:
+            timings.append((name, elapsed))
+
+
+def begin_server_timing():
+    """Start collecting stage timings for the current request."""
+    timings = []
+    _server_timing.set(timings)
+    return timings
+
+
+def server_timing_header(timings, total=None):
+    parts = [f"{name};dur={elapsed * 1e3:.3f}" for name, elapsed in timings]
+    if total is not None:
+        parts.append(f"total;dur={total * 1e3:.3f}")
+    return ", ".join(parts)
@@ -0,0 +1,255 @@
+# ============================================================
+# backend/profiling.py
+# ------------------------------------------------------------
+# Opt-in, admin-only profiling for the running API.
+#   - StackSampler: pure-Python sampler over sys._current_frames()
+#     for N seconds at a given rate; exports collapsed stacks
+#     (flamegraph.pl / speedscope) or a speedscope JSON file
+#   - @profiled: cProfile around a single endpoint call when the
+#     request carries "X-Profile: 1" (plus the admin token); the
+#     result is kept in memory and its id returned in X-Profile-Id
+# Everything is disabled unless SENTINEL_ADMIN_TOKEN is set, and
+# every call must send it in the X-Admin-Token header.
+# ============================================================
+
+import contextvars
+import cProfile
+import functools
+import hmac
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+ADMIN_TOKEN_ENV = "SENTINEL_ADMIN_TOKEN"
+MAX_SECONDS = 60.0
+MAX_HZ = 1000.0
+MAX_STORED_PROFILES = 20
+
+
+def admin_token():
+    return os.environ.get(ADMIN_TOKEN_ENV) or None
+
+
+def is_admin(token):
+    expected = admin_token()
+    return bool(expected and token and hmac.compare_digest(token.encode(), expected.encode()))
+
+
+def require_admin(x_admin_token: str = Header(default=None)):
+    if not admin_token():
+        raise HTTPException(status_code=404, detail="Not Found")  # profiling disabled: hide the surface
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required.")
+
+
+# ------------------------------------------------------------
+# Stack sampler
+# ------------------------------------------------------------
+def _frame_name(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples every thread's Python stack (except its own) every 1/hz seconds."""
+
+    def __init__(self, hz=100.0):
+        self.interval = 1.0 / hz
+        self.stacks = Counter()  # (thread name, frame, ..., leaf frame) -> samples
+        self.samples = 0
+        self.elapsed = 0.0
+
+    def sample_once(self, skip_ident):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == skip_ident:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[tuple(reversed(stack))] += 1
+        self.samples += 1
+
+    def run(self, seconds):
+        """Sample from the calling thread for `seconds` (blocking)."""
+        me = threading.get_ident()
+        start = time.perf_counter()
+        deadline = start + seconds
+        next_tick = start
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            self.sample_once(me)
+            next_tick += self.interval
+            time.sleep(max(0.0, next_tick - time.perf_counter()))
+        self.elapsed = time.perf_counter() - start
+        return self
+
+    def collapsed(self, include_idle=False):
+        """Brendan Gregg's collapsed format: 'thread;outer;...;leaf count' per line."""
+        lines = [";".join(stack) + f" {count}" for stack, count in self.stacks.most_common()
+                 if include_idle or not _is_idle(stack)]
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name="sentinel-api", include_idle=False):
+        """speedscope file-format JSON: one sampled profile per thread."""
+        frames, index = [], {}
+        profiles = {}
+        for stack, count in self.stacks.items():
+            if not include_idle and _is_idle(stack):
+                continue
+            thread, calls = stack[0], stack[1:]
+            ids = []
+            for call in calls:
+                if call not in index:
+                    index[call] = len(frames)
+                    fn, _, where = call.partition(" (")
+                    frames.append({"name": fn, "file": where.rstrip(")")})
+                ids.append(index[call])
+            p = profiles.setdefault(thread, {
+                "type": "sampled", "name": thread, "unit": "seconds",
+                "startValue": 0.0, "endValue": 0.0, "samples": [], "weights": [],
+            })
+            p["samples"].append(ids)
+            p["weights"].append(count * self.interval)
+            p["endValue"] += count * self.interval
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "sentinel-api StackSampler",
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values()),
+        }
+
+
+# Leaf frames of threads that are just waiting for work
+_IDLE_LEAVES = ("wait (threading.py", "select (selectors.py", "_worker (thread.py", "run (_thread.py",
+                "_run_once (base_events.py", "get (queue.py")
+
+
+def _is_idle(stack):
+    return stack[-1].startswith(_IDLE_LEAVES)
+
+
+# ------------------------------------------------------------
+# Per-request cProfile
+# ------------------------------------------------------------
+# Set by the middleware for requests flagged with X-Profile and a
+# valid admin token; the dict is shared with the worker thread so
+# @profiled can hand back the stored profile id.
+PROFILE_REQUEST_HEADER = "x-profile"
+_profile_request = contextvars.ContextVar("profile_request", default=None)
+_profiles = OrderedDict()  # id -> {"endpoint", "created", "seconds", "stats"}
+_profiles_lock = threading.Lock()
+
+
+def begin_request_profile(headers):
+    """Flag the current request for profiling if it asked for it; returns the shared slot or None."""
+    if not headers.get(PROFILE_REQUEST_HEADER) or not is_admin(headers.get("x-admin-token")):
+        return None
+    slot = {}
+    _profile_request.set(slot)
+    return slot
+
+
+def profiled(fn):
+    """Run the endpoint under cProfile when the current request was flagged (same thread as fn)."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        slot = _profile_request.get()
+        if slot is None:
+            return fn(*args, **kwargs)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profiler.create_stats()
+            profile_id = uuid.uuid4().hex
+            with _profiles_lock:
+                _profiles[profile_id] = {
+                    "endpoint": fn.__name__,
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "seconds": round(time.perf_counter() - start, 6),
+                    "stats": profiler.stats,
+                }
+                while len(_profiles) > MAX_STORED_PROFILES:
+                    _profiles.popitem(last=False)
+            slot["id"] = profile_id
+    return wrapper
+
+
+# ------------------------------------------------------------
+# Admin endpoints
+# ------------------------------------------------------------
+router = APIRouter(prefix="/admin/profile", dependencies=[Depends(require_admin)])
+_sampler_lock = threading.Lock()
+
+
+@router.get("")
+def sample_stacks(seconds: float = 10.0, hz: float = 100.0, format: str = "collapsed", idle: bool = False):
+    """Sample all threads for `seconds` at `hz`; format=collapsed (text) or speedscope (JSON)."""
+    if not (0 < seconds <= MAX_SECONDS) or not (0 < hz <= MAX_HZ):
+        raise HTTPException(status_code=400, detail=f"Need 0 < seconds <= {MAX_SECONDS} and 0 < hz <= {MAX_HZ}.")
+    if format not in ("collapsed", "speedscope"):
+        raise HTTPException(status_code=400, detail="format must be 'collapsed' or 'speedscope'.")
+    if not _sampler_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running.")
+    try:
+        sampler = StackSampler(hz).run(seconds)
+    finally:
+        _sampler_lock.release()
+    headers = {"X-Profile-Samples": str(sampler.samples)}
+    if format == "speedscope":
+        headers["Content-Disposition"] = 'attachment; filename="profile.speedscope.json"'
+        return JSONResponse(sampler.speedscope(include_idle=idle), headers=headers)
+    return PlainTextResponse(sampler.collapsed(include_idle=idle), headers=headers)
+
+
+@router.get("/requests")
+def list_request_profiles():
+    with _profiles_lock:
+        return [{"id": k, **{f: v[f] for f in ("endpoint", "created", "seconds")}} for k, v in _profiles.items()]
+
+
+@router.get("/requests/{profile_id}")
+def get_request_profile(profile_id: str, format: str = "text", sort: str = "cumulative", limit: int = 50):
+    """format=text (pstats report) or pstats (binary, for snakeviz / pstats.Stats)."""
+    with _profiles_lock:
+        entry = _profiles.get(profile_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Unknown profile id.")
+    if format == "pstats":
+        return Response(marshal.dumps(entry["stats"]), media_type="application/octet-stream",
+                        headers={"Content-Disposition": f'attachment; filename="{profile_id}.pstats"'})
+    out = io.StringIO()
+    stats = pstats.Stats(_StatsSource(entry["stats"]), stream=out)
+    try:
+        stats.sort_stats(sort)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unknown sort key '{sort}'.")
+    stats.print_stats(limit)
+    return PlainTextResponse(out.getvalue())
+
+
+class _StatsSource:
+    """Minimal object pstats.Stats accepts in place of a Profile (it calls create_stats and reads .stats)."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
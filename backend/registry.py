@@ -0,0 +1,107 @@
+# ============================================================
+# backend/registry.py
+# ------------------------------------------------------------
+# Lazy model registry for the API. Each model is registered as
+# a loader and built on first get() (thread-safe, once), so the
+# heavy libraries behind it (torch, lightgbm, sklearn) are only
+# imported when needed. warmup() loads everything on a
+# background thread right after startup.
+# ============================================================
+
+import threading
+import time
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._errors = {}
+        self._locks = {}
+        self._warmup_thread = None
+        self._prefetching = set()
+        self._prefetch_lock = threading.Lock()
+
+    def register(self, name, loader):
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+
+    def get(self, name):
+        """The loaded model, loading it now if needed (blocks while another thread is loading it)."""
+        try:
+            return self._models[name]
+        except KeyError:
+            pass
+        with self._locks[name]:
+            if name not in self._models:
+                start = time.perf_counter()
+                try:
+                    model = self._loaders[name]()
+                except Exception as e:
+                    self._errors[name] = f"{type(e).__name__}: {e}"
+                    raise
+                self._errors.pop(name, None)
+                self._models[name] = model
+                print(f"[INFO] Loaded {name} in {time.perf_counter() - start:.2f}s")
+        return self._models[name]
+
+    def peek(self, name):
+        """The model if it is already loaded, else None (never blocks)."""
+        return self._models.get(name)
+
+    def prefetch(self, name):
+        """Start loading `name` on a background thread, unless it is loaded, loading or failed."""
+        with self._prefetch_lock:
+            if name in self._models or name in self._errors or name in self._prefetching:
+                return
+            self._prefetching.add(name)
+
+        def run():
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"[WARN] Loading {name} failed: {type(e).__name__}: {e}")
+            finally:
+                with self._prefetch_lock:
+                    self._prefetching.discard(name)
+
+        threading.Thread(target=run, name=f"load-{name}", daemon=True).start()
+
+    def status(self):
+        return {
+            name: "loaded" if name in self._models
+            else "failed" if name in self._errors
+            else "loading" if self._locks[name].locked()
+            else "pending"
+            for name in self._loaders
+        }
+
+    def errors(self):
+        return dict(self._errors)
+
+    def ready(self):
+        return all(name in self._models for name in self._loaders)
+
+    def settled(self, names):
+        """True once every model in `names` has either loaded or failed (nothing left to wait for)."""
+        return all(name in self._models or name in self._errors for name in names)
+
+    def warmup(self, names=None, background=True):
+        """Load `names` (default: all, in registration order); on a daemon thread unless background=False."""
+        names = list(names or self._loaders)
+
+        def run():
+            start = time.perf_counter()
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f"[WARN] Warmup of {name} failed: {type(e).__name__}: {e}")
+            print(f"[✅] Warmup finished in {time.perf_counter() - start:.2f}s")
+
+        if not background:
+            run()
+            return None
+        self._warmup_thread = threading.Thread(target=run, name="model-warmup", daemon=True)
+        self._warmup_thread.start()
+        return self._warmup_thread
@@ -0,0 +1,97 @@
+# ============================================================
+# backend/singleflight.py
+# ------------------------------------------------------------
+# Request coalescing for the scoring endpoints: concurrent
+# callers asking for the same key share one computation
+# instead of each running the pipeline (e.g. thousands of
+# /evaluate calls for the same few passwords during a reset
+# campaign). Keys are keyed BLAKE2b digests (BLAKE2's MAC mode)
+# under a per-process random secret, so in-flight passwords are
+# never held as plaintext keys and digests are useless outside
+# this process.
+# Endpoints run in the threadpool, so this is thread-based.
+# ============================================================
+
+import hashlib
+import secrets
+import threading
+
+from backend import metrics
+
+_SECRET = secrets.token_bytes(32)
+
+COALESCED = metrics.REGISTRY.counter(
+    "sentinel_singleflight_total",
+    "Scoring keys computed by the caller (leader) or shared from another in-flight call (follower).",
+    labels=("role",))
+
+
+def flight_key(password):
+    return hashlib.blake2b(password.encode("utf-8", "surrogatepass"), key=_SECRET, digest_size=16).digest()
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Thread-safe single-flight: at most one computation per key is in flight at a time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key, fn):
+        """fn() once per set of concurrent callers with this key; all of them get its result (or exception)."""
+        return self.do_many([key], lambda positions: [fn()])[0]
+
+    def do_many(self, keys, fn):
+        """
+        Results for distinct `keys`. Keys nobody else is computing are claimed and computed
+        together by fn(positions), which gets the claimed positions in `keys` and returns
+        their results in that order; the rest are awaited from the calls already in flight.
+        Claimed keys are computed before waiting on others, so two overlapping batches
+        cannot deadlock.
+        """
+        calls, own = [], []
+        with self._lock:
+            for i, key in enumerate(keys):
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call()
+                    own.append(i)
+                calls.append(call)
+
+        if own:
+            try:
+                for i, result in zip(own, fn(own)):
+                    calls[i].result = result
+            except BaseException as e:
+                for i in own:
+                    calls[i].error = e
+            finally:
+                with self._lock:
+                    for i in own:
+                        del self._calls[keys[i]]
+                for i in own:
+                    calls[i].event.set()
+            COALESCED.inc(len(own), role="leader")
+        if len(own) < len(keys):
+            COALESCED.inc(len(keys) - len(own), role="follower")
+
+        results = []
+        for call in calls:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            results.append(call.result)
+        return results
@@ -0,0 +1,40 @@
+# ============================================================
+# backend/zerocopy.py
+# ------------------------------------------------------------
+# Response that serves a byte range of an open file without
+# copying it through Python when the ASGI server supports the
+# "http.response.zerocopy" extension (sendfile); otherwise the
+# range is read with a single os.pread.
+# ============================================================
+
+import os
+
+from starlette.responses import Response
+
+ZEROCOPY_EXTENSION = "http.response.zerocopy"
+
+
+class FileSliceResponse(Response):
+    """`count` bytes of `file` (an open binary file) starting at `offset`."""
+
+    def __init__(self, file, offset, count, status_code=200, headers=None, media_type="text/plain"):
+        self.file = file
+        self.offset = offset
+        self.count = count
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.body = b""
+        self.init_headers(headers)
+        self.headers["content-length"] = str(count)
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope.get("method") == "HEAD" or self.count == 0:
+            await send({"type": "http.response.body", "body": b""})
+        elif ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+            await send({"type": ZEROCOPY_EXTENSION, "file": self.file, "offset": self.offset,
+                        "count": self.count, "more_body": False})
+        else:
+            body = os.pread(self.file.fileno(), self.count, self.offset)
+            await send({"type": "http.response.body", "body": body})
@@ -152,11 +152,12 @@ export const PasswordAnalyzer = ({ isVisible }: PasswordAnalyzerProps) => {
                   <div className="flex items-center justify-between">
                     <span className="text-muted-foreground">Anomaly Score</span>
                     <span className="text-2xl font-bold text-secondary">
-                      {result.anomaly_detection.score.toFixed(2)}
+                      {result.anomaly_detection ? result.anomaly_detection.score.toFixed(2) : '—'}
                     </span>
                   </div>
                   <p className="text-sm text-foreground/70">
-                    {result.anomaly_detection.is_anomaly ? 'Unusual pattern detected' : 'Normal pattern'}
+                    {!result.anomaly_detection ? (result.degraded ? 'Skipped (server under high load)' : 'Skipped (clear-cut result)') :
+                     result.anomaly_detection.is_anomaly ? 'Unusual pattern detected' : 'Normal pattern'}
                   </p>
                 </div>
 
@@ -20,12 +20,15 @@ export interface PasswordEvaluation {
     is_leaked: boolean;
     message: string;
   };
+  // null when the backend is shedding load (degraded) or the student pre-filter answered alone
   anomaly_detection: {
     score: number;
     is_anomaly: boolean;
     reconstruction_error: number;
-  };
+  } | null;
   feedback: string[];
+  degraded?: boolean;
+  prefiltered?: boolean;
 }
 
 export interface GeneratePasswordRequest {
@@ -1,15 +1,22 @@
 import pandas as pd
 import os
 
+from src.data.dataset import write_dataset
+from src.config import LABELED_DATASET_DIR
+
 # === Define paths ===
 LABELED_1 = os.path.join("data", "labeled", "data.csv")
-LABELED_2 = os.path.join("data", "labeled", "xato_labeled.csv")
+LABELED_2 = os.path.join("data", "labeled", "xato_labeled.parquet")  # from src/data/auto_label_xato.py
+LABELED_2_CSV = os.path.join("data", "labeled", "xato_labeled.csv")
 OUTPUT_PATH = os.path.join("data", "labeled", "combined.csv")
 
 # === Load datasets safely ===
 print("[INFO] Loading datasets...")
 df1 = pd.read_csv(LABELED_1, on_bad_lines="skip", encoding="utf-8")
-df2 = pd.read_csv(LABELED_2, on_bad_lines="skip", encoding="utf-8")
+if os.path.exists(LABELED_2):
+    df2 = pd.read_parquet(LABELED_2)
+else:
+    df2 = pd.read_csv(LABELED_2_CSV, on_bad_lines="skip", encoding="utf-8")
 
 print(f"[INFO] Dataset 1 shape: {df1.shape}")
 print(f"[INFO] Dataset 2 shape: {df2.shape}")
@@ -37,3 +44,7 @@ print(dist)
 os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
 df.to_csv(OUTPUT_PATH, index=False)
 print(f"\n✅ Saved combined dataset → {OUTPUT_PATH}")
+
+# === Columnar copy with precomputed features (used by training) ===
+write_dataset(df, LABELED_DATASET_DIR, source=OUTPUT_PATH)
+print(f"✅ Saved Parquet dataset → {LABELED_DATASET_DIR}")
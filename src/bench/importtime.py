@@ -0,0 +1,91 @@
+# ============================================================
+# src/bench/importtime.py
+# ------------------------------------------------------------
+# Import-time breakdown of an entrypoint, from a fresh
+# interpreter run with `python -X importtime`.
+#   - slowest modules by cumulative time (with nesting depth)
+#   - self time summed per top-level package
+#
+#   python -m src.bench.importtime                 # backend.app
+#   python -m src.bench.importtime src.unsupervised.detector --top 15
+#   python -m src.bench.importtime backend.app --json importtime.json
+# ============================================================
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S.*)$")
+
+
+def measure(module, env=None):
+    """Import `module` in a fresh interpreter; returns (entries, wall seconds)."""
+    env = dict(os.environ if env is None else env)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    return parse(proc.stderr), wall
+
+
+def parse(text):
+    """Entries {module, self_us, cumulative_us, depth} in the order Python reports them."""
+    entries = []
+    for line in text.splitlines():
+        m = LINE_RE.match(line)
+        if m:
+            entries.append({
+                "module": m.group(4).strip(),
+                "self_us": int(m.group(1)),
+                "cumulative_us": int(m.group(2)),
+                "depth": (len(m.group(3)) - 1) // 2,
+            })
+    return entries
+
+
+def by_package(entries):
+    totals = defaultdict(int)
+    for e in entries:
+        totals[e["module"].split(".")[0]] += e["self_us"]
+    return dict(sorted(totals.items(), key=lambda kv: -kv[1]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="-X importtime breakdown of a module import")
+    parser.add_argument("module", nargs="?", default="backend.app")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--json", help="write the full breakdown here")
+    args = parser.parse_args()
+
+    entries, wall = measure(args.module)
+    total_us = sum(e["self_us"] for e in entries)
+    print(f"[INFO] import {args.module}: {total_us / 1e3:.1f} ms in imports, "
+          f"{wall * 1e3:.0f} ms process wall time, {len(entries)} modules")
+
+    print(f"\n{'cumulative ms':>13} {'self ms':>8}  module")
+    for e in sorted(entries, key=lambda e: -e["cumulative_us"])[: args.top]:
+        print(f"{e['cumulative_us'] / 1e3:13.1f} {e['self_us'] / 1e3:8.1f}  {'  ' * e['depth']}{e['module']}")
+
+    packages = by_package(entries)
+    print(f"\n{'self ms':>8} {'share':>6}  top-level package")
+    for name, us in list(packages.items())[: args.top]:
+        print(f"{us / 1e3:8.1f} {us / max(1, total_us):6.1%}  {name}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"module": args.module, "total_us": total_us, "wall_s": round(wall, 3),
+                       "packages_us": packages, "modules": entries}, f, indent=2)
+        print(f"[✅] Import-time breakdown saved to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+# ============================================================
+# src/bench/load_test.py
+# ------------------------------------------------------------
+# End-to-end load test for the FastAPI service on the stub
+# artifacts from src/bench/stubs.py.
+#   --mode inprocess  backend.app driven through httpx's ASGI
+#                     transport (no network, one process)
+#   --mode uvicorn    `uvicorn --workers N` subprocesses on a
+#                     local port, one per --workers value
+# Each (workers, endpoint, distribution, batch size) is run at
+# every --concurrency level with an async client. The report
+# has per-run latency percentiles and histograms and the
+# throughput curve (RPS / p99 vs concurrency).
+#
+#   python -m src.bench.load_test --concurrency 1 8 32 64
+#   python -m src.bench.load_test --mode uvicorn --workers 1 2 4 \
+#       --endpoints evaluate_batch --batch-sizes 10 100
+# ============================================================
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# Local imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from src.bench.stubs import build_stub_artifacts, use_stub_artifacts, weak_passwords, STRONG_ALPHABET
+from src.bench.run_benchmarks import BASE_WORDS, DEFAULT_ARTIFACTS
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+ENDPOINTS = ["evaluate", "evaluate_batch", "generate_password"]
+DISTRIBUTIONS = ["weak-repeated", "unique-strong", "mixed"]
+# Histogram bucket upper bounds (ms); the last bucket is open-ended
+HIST_BOUNDS_MS = [0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+# ------------------------------------------------------------
+#  Password distributions
+# ------------------------------------------------------------
+class PasswordMix:
+    """
+    Request payloads for one distribution:
+      weak-repeated  Zipf-weighted draws from a small pool of leak-style passwords (cache-friendly)
+      unique-strong  a fresh random password on every draw (cache-hostile)
+      mixed          50/50 of the above
+    """
+
+    def __init__(self, distribution, seed=0, pool_size=200):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution '{distribution}'")
+        self.distribution = distribution
+        self.rnd = random.Random(seed)
+        self.pool = list(dict.fromkeys(weak_passwords(pool_size * 5, seed=seed)))[:pool_size]
+        self.weights = [1.0 / (i + 1) for i in range(len(self.pool))]
+
+    def _weak(self):
+        return self.rnd.choices(self.pool, weights=self.weights)[0]
+
+    def _strong(self):
+        return "".join(self.rnd.choice(STRONG_ALPHABET) for _ in range(self.rnd.randint(12, 20)))
+
+    def password(self):
+        if self.distribution == "weak-repeated" or (self.distribution == "mixed" and self.rnd.random() < 0.5):
+            return self._weak()
+        return self._strong()
+
+    def base_word(self):
+        if self.distribution == "weak-repeated" or (self.distribution == "mixed" and self.rnd.random() < 0.5):
+            return self.rnd.choice(BASE_WORDS)
+        return "".join(self.rnd.choice(string.ascii_lowercase) for _ in range(self.rnd.randint(5, 10)))
+
+    def request(self, endpoint, batch_size):
+        """(path, json body, items in the request)."""
+        if endpoint == "evaluate":
+            return "/evaluate", {"password": self.password()}, 1
+        if endpoint == "evaluate_batch":
+            return "/evaluate_batch", {"passwords": [self.password() for _ in range(batch_size)]}, batch_size
+        if endpoint == "generate_password":
+            return "/generate_password", {"base": self.base_word()}, 1
+        raise ValueError(f"Unknown endpoint '{endpoint}'")
+
+
+# ------------------------------------------------------------
+#  Driver
+# ------------------------------------------------------------
+async def drive(client, mix, endpoint, concurrency, n_requests, batch_size=1, warmup=None):
+    """Run n_requests with `concurrency` in flight; returns (latencies_s, items, errors, elapsed_s)."""
+    async def one():
+        path, body, items = mix.request(endpoint, batch_size)
+        t = time.perf_counter()
+        try:
+            resp = await client.post(path, json=body)
+            ok = resp.status_code == 200
+        except Exception:
+            ok = False
+        return time.perf_counter() - t, items, ok
+
+    for _ in range(warmup if warmup is not None else concurrency):
+        await one()
+
+    latencies, items_done, errors = [], 0, 0
+    remaining = n_requests
+
+    async def worker():
+        nonlocal remaining, items_done, errors
+        while remaining > 0:
+            remaining -= 1
+            latency, items, ok = await one()
+            if ok:
+                latencies.append(latency)
+                items_done += items
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, items_done, errors, time.perf_counter() - start
+
+
+def histogram(latencies_ms):
+    counts = np.bincount(np.searchsorted(HIST_BOUNDS_MS, latencies_ms), minlength=len(HIST_BOUNDS_MS) + 1)
+    labels = [f"<={b}ms" for b in HIST_BOUNDS_MS] + [f">{HIST_BOUNDS_MS[-1]}ms"]
+    return dict(zip(labels, counts.tolist()))
+
+
+def summarize(latencies, items, errors, elapsed):
+    ms = np.asarray(latencies, dtype=np.float64) * 1e3
+    if len(ms) == 0:
+        return {"requests": 0, "errors": errors}
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(ms) / elapsed, 1),
+        "items_per_s": round(items / elapsed, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p90_ms": round(float(np.percentile(ms, 90)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "max_ms": round(float(ms.max()), 2),
+        "histogram": histogram(ms),
+    }
+
+
+async def run_matrix(client, args, workers):
+    runs = []
+    for endpoint in args.endpoints:
+        batch_sizes = args.batch_sizes if endpoint == "evaluate_batch" else [1]
+        for distribution in args.distributions:
+            for batch_size in batch_sizes:
+                for concurrency in args.concurrency:
+                    mix = PasswordMix(distribution, seed=args.seed)
+                    lat, items, errors, elapsed = await drive(
+                        client, mix, endpoint, concurrency, args.requests, batch_size)
+                    run = {"workers": workers, "endpoint": endpoint, "distribution": distribution,
+                           "batch_size": batch_size, "concurrency": concurrency,
+                           **summarize(lat, items, errors, elapsed)}
+                    runs.append(run)
+                    print(f"[INFO] w={workers} {endpoint:17s} {distribution:13s} b={batch_size:<4d} "
+                          f"c={concurrency:<4d} rps={run.get('rps', 0):>8.1f} "
+                          f"p50={run.get('p50_ms', 0):>8.2f}ms p99={run.get('p99_ms', 0):>8.2f}ms "
+                          f"errors={errors}")
+    return runs
+
+
+def throughput_curves(runs):
+    """'<endpoint>/<distribution>/b<batch>/w<workers>' -> [[concurrency, rps, p99_ms], ...]."""
+    curves = {}
+    for r in runs:
+        key = f"{r['endpoint']}/{r['distribution']}/b{r['batch_size']}/w{r['workers']}"
+        curves.setdefault(key, []).append([r["concurrency"], r.get("rps", 0.0), r.get("p99_ms")])
+    return curves
+
+
+# ------------------------------------------------------------
+#  Targets
+# ------------------------------------------------------------
+async def run_inprocess(args):
+    import httpx
+    from backend.app import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60.0) as client:
+        return await run_matrix(client, args, workers=1)
+
+
+def start_server(workers, port, env):
+    cmd = [sys.executable, "-m", "uvicorn", "backend.app:app", "--host", "127.0.0.1",
+           "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL)
+    deadline = time.time() + 180
+    import httpx
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1.0).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError("uvicorn did not become ready in time")
+
+
+async def run_uvicorn(args):
+    import httpx
+
+    runs = []
+    for workers in args.workers:
+        proc = start_server(workers, args.port, dict(os.environ))
+        try:
+            limits = httpx.Limits(max_connections=max(args.concurrency))
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits,
+                                         timeout=60.0) as client:
+                runs += await run_matrix(client, args, workers)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+    return runs
+
+
+def plot(report, path):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, (ax_rps, ax_p99) = plt.subplots(1, 2, figsize=(12, 5))
+    for key, points in report["curves"].items():
+        c, rps, p99 = zip(*points)
+        ax_rps.plot(c, rps, marker="o", label=key)
+        ax_p99.plot(c, p99, marker="o", label=key)
+    for ax, title in ((ax_rps, "Throughput (req/s)"), (ax_p99, "p99 latency (ms)")):
+        ax.set_xscale("log", base=2)
+        ax.set_xlabel("concurrency")
+        ax.set_title(title)
+    ax_rps.legend(fontsize=7)
+    fig.tight_layout()
+    fig.savefig(path)
+    print(f"[✅] Throughput curves saved to: {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the API on stub artifacts")
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--artifacts", default=DEFAULT_ARTIFACTS)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="uvicorn worker counts")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=["evaluate", "generate_password"])
+    parser.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS,
+                        default=["weak-repeated", "unique-strong"])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--requests", type=int, default=500, help="requests per run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="load_test_results.json")
+    parser.add_argument("--plot", help="save throughput / p99 curves to this PNG")
+    args = parser.parse_args()
+
+    # Env overrides must be in place before src.config is imported (also inherited by uvicorn)
+    use_stub_artifacts(args.artifacts)
+    build_stub_artifacts(args.artifacts)
+
+    runner = run_inprocess if args.mode == "inprocess" else run_uvicorn
+    runs = asyncio.run(runner(args))
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "mode": args.mode,
+        "requests_per_run": args.requests,
+        "histogram_bounds_ms": HIST_BOUNDS_MS,
+        "runs": runs,
+        "curves": throughput_curves(runs),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[✅] Load test results saved to: {args.output}")
+    if args.plot:
+        plot(report, args.plot)
+
+
+if __name__ == "__main__":
+    main()
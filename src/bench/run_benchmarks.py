@@ -0,0 +1,237 @@
+# ============================================================
+# src/bench/run_benchmarks.py
+# ------------------------------------------------------------
+# Micro-benchmarks for every scoring hot path, run against the
+# stub artifacts from src/bench/stubs.py (no LFS data needed).
+#   - per-call latency percentiles (p50 / p90 / p99, µs)
+#   - batch throughput (items/s) for the batch APIs
+# Results are JSON; --save-baseline stores them and --compare
+# fails (exit 1) when a benchmark regresses past --tolerance.
+# No baseline is committed (timings are machine-specific):
+# --compare without one exits 2 before running anything.
+#
+#   python -m src.bench.run_benchmarks --save-baseline
+#   python -m src.bench.run_benchmarks --compare
+# ============================================================
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Local imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from src.bench.stubs import build_stub_artifacts, strong_passwords, use_stub_artifacts, weak_passwords
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_ARTIFACTS = os.path.join(tempfile.gettempdir(), "sentinel-bench")
+BASE_WORDS = ["sunshine", "dragon", "coffee", "blue sky", "mountain", "Pa55"]
+
+
+# ------------------------------------------------------------
+#  Measurement
+# ------------------------------------------------------------
+def measure_calls(fn, inputs, iterations, warmup=50, max_seconds=10.0):
+    """Time fn(x) call by call, cycling through inputs. Stops early after max_seconds."""
+    for i in range(min(warmup, iterations)):
+        fn(inputs[i % len(inputs)])
+    timings = []
+    deadline = time.perf_counter() + max_seconds
+    for i in range(iterations):
+        x = inputs[i % len(inputs)]
+        t = time.perf_counter_ns()
+        fn(x)
+        timings.append(time.perf_counter_ns() - t)
+        if time.perf_counter() > deadline:
+            break
+    us = np.asarray(timings, dtype=np.float64) / 1e3
+    return {
+        "kind": "call",
+        "n": len(us),
+        "p50_us": round(float(np.percentile(us, 50)), 2),
+        "p90_us": round(float(np.percentile(us, 90)), 2),
+        "p99_us": round(float(np.percentile(us, 99)), 2),
+        "mean_us": round(float(us.mean()), 2),
+        "throughput": round(float(1e6 / us.mean()), 1),
+    }
+
+
+def measure_batch(fn, inputs, batch_size, repeats=5):
+    """Best-of-`repeats` throughput (items/s) of fn(batch)."""
+    batch = [inputs[i % len(inputs)] for i in range(batch_size)]
+    fn(batch)
+    best = float("inf")
+    for _ in range(repeats):
+        t = time.perf_counter()
+        fn(batch)
+        best = min(best, time.perf_counter() - t)
+    return {
+        "kind": "batch",
+        "n": batch_size,
+        "seconds": round(best, 6),
+        "throughput": round(batch_size / best, 1),
+    }
+
+
+# ------------------------------------------------------------
+#  Benchmarks
+# ------------------------------------------------------------
+def build_benchmarks():
+    """name -> (kind, fn, inputs). Imports happen here, after the stub paths are set."""
+    import torch
+
+    from src.config import MODEL_A_PATH, MODEL_B_PATH, MODEL_C_PATH, GUESS_NUMBER_PATH
+    from src.features.extractors import extract_features, features_matrix
+    from src.features.patterns import get_matcher
+    from src.generator.password_generator import generate_password, generate_batch
+    from src.generator.rng import SeededRNG
+    from src.models.anomaly_model import PasswordAutoencoder
+    from src.models.classifier_model import PasswordClassifier
+    from src.models.guess_number import GuessNumberEstimator
+    from src.models.hacker_risk import HackerRiskModel
+    from src.models.leak_model import LeakRiskScorer
+    from src.unsupervised import detector
+
+    torch.set_num_threads(1)
+    passwords = weak_passwords(500, seed=123) + strong_passwords(500, seed=456)
+    np.random.default_rng(0).shuffle(passwords)
+
+    classifier = PasswordClassifier.load(MODEL_A_PATH)
+    leak = LeakRiskScorer()
+    hr = HackerRiskModel.load(MODEL_B_PATH)
+    model_c = PasswordAutoencoder.load(MODEL_C_PATH)
+    matcher = get_matcher()
+    guesser = GuessNumberEstimator.load(GUESS_NUMBER_PATH)
+    rng = SeededRNG(0)
+
+    return {
+        "features.extract_features": ("call", extract_features, passwords),
+        "features.features_matrix": ("batch", features_matrix, passwords),
+        "patterns.analyze": ("call", matcher.analyze, passwords),
+        "classifier.predict": ("call", classifier.predict, passwords),
+        "classifier.predict_proba": ("batch", classifier.predict_proba, passwords),
+        "leak.score": ("call", leak.score, passwords),
+        "hacker_risk.freq_percentile": ("call", hr.freq_percentile, passwords),
+        "hacker_risk.lm_logprob": ("call", hr.lm_logprob, passwords),
+        "hacker_risk.min_edit_distance_topk": ("call", lambda pw: hr.min_edit_distance_topk(pw, k=1000), passwords),
+        "hacker_risk.structural_score": ("call", hr.structural_score, passwords),
+        "hacker_risk.compute_score": ("call", hr.compute_score, passwords),
+        "guess_number.log10_guess_number": ("call", guesser.log10_guess_number, passwords),
+        "anomaly.reconstruction_error": ("batch", lambda pws: model_c.reconstruction_error(features_matrix(pws)), passwords),
+        "detector.score_password": ("call", detector.score_password, passwords),
+        "generator.generate_password": ("call", lambda base: generate_password(base, rng=rng), BASE_WORDS),
+        "generator.generate_batch": ("call", lambda base: generate_batch(
+            base, leak_table=leak.freq_table, risk_model=hr, classifier=classifier, rng=rng), BASE_WORDS),
+    }
+
+
+def run(only=None, iterations=2000, batch_size=1000):
+    results = {}
+    for name, (kind, fn, inputs) in build_benchmarks().items():
+        if only and not any(o in name for o in only):
+            continue
+        r = measure_calls(fn, inputs, iterations) if kind == "call" else measure_batch(fn, inputs, batch_size)
+        results[name] = r
+        if kind == "call":
+            print(f"[INFO] {name:38s} p50={r['p50_us']:>10.1f}µs p90={r['p90_us']:>10.1f}µs "
+                  f"p99={r['p99_us']:>10.1f}µs  ({r['n']} calls)")
+        else:
+            print(f"[INFO] {name:38s} {r['throughput']:>12,.0f} items/s (batch of {r['n']})")
+    return results
+
+
+def environment():
+    import lightgbm
+    import torch
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "lightgbm": lightgbm.__version__,
+        "torch": torch.__version__,
+    }
+
+
+# ------------------------------------------------------------
+#  Baselines
+# ------------------------------------------------------------
+def compare(current, baseline, tolerance):
+    """
+    Names of benchmarks that regressed: call p50 latency above baseline * (1 + tolerance),
+    or batch throughput below baseline / (1 + tolerance).
+    """
+    regressions = []
+    print(f"\n{'benchmark':38s} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if base is None or base["kind"] != cur["kind"]:
+            continue
+        if cur["kind"] == "call":
+            old, new, unit = base["p50_us"], cur["p50_us"], "µs"
+            change = new / old - 1.0
+        else:
+            old, new, unit = base["throughput"], cur["throughput"], "/s"
+            change = old / new - 1.0
+        mark = " REGRESSION" if change > tolerance else ""
+        if mark:
+            regressions.append(name)
+        print(f"{name:38s} {old:>10.1f}{unit} {new:>10.1f}{unit} {change:>+7.1%}{mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scoring hot paths on stub artifacts")
+    parser.add_argument("--artifacts", default=DEFAULT_ARTIFACTS, help="stub artifact directory (built if missing)")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the stub artifacts")
+    parser.add_argument("--only", nargs="*", help="run benchmarks whose name contains any of these")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE_PATH, metavar="PATH")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH, metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args()
+    if args.compare and args.compare != args.save_baseline and not os.path.exists(args.compare):
+        print(f"[WARN] No baseline at {args.compare}; record one on this machine with --save-baseline")
+        sys.exit(2)
+
+    # Env overrides must be in place before src.config is imported
+    use_stub_artifacts(args.artifacts)
+    build_stub_artifacts(args.artifacts, force=args.rebuild)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": environment(),
+        "iterations": args.iterations,
+        "batch_size": args.batch_size,
+        "results": run(args.only, args.iterations, args.batch_size),
+    }
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"[✅] Results saved to: {path}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("environment") != report["environment"]:
+            print("[WARN] Baseline was recorded on a different environment; comparison is indicative only")
+        regressions = compare(report["results"], baseline["results"], args.tolerance)
+        if regressions:
+            print(f"[WARN] {len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("[✅] No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
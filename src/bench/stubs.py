@@ -0,0 +1,139 @@
+# ============================================================
+# src/bench/stubs.py
+# ------------------------------------------------------------
+# Small, deterministic stand-ins for every model artifact, so
+# benchmarks and load tests run without the LFS datasets.
+# The files mirror the real layout under a models/ and data/
+# directory; point the app at them with
+#   SENTINEL_MODEL_DIR=<dir>/models SENTINEL_DATA_DIR=<dir>/data
+# ============================================================
+
+import json
+import os
+import random
+import string
+
+import joblib
+import numpy as np
+
+COMMON_WORDS = [
+    "123456", "password", "qwerty", "abc123", "letmein", "monkey", "dragon",
+    "iloveyou", "sunshine", "princess", "football", "baseball", "welcome",
+    "shadow", "master", "superman", "michael", "jessica", "charlie", "111111",
+]
+STRONG_ALPHABET = string.ascii_letters + string.digits + "!@#$%&*?+-=_"
+
+
+def weak_passwords(n, seed=0):
+    """Leak-style passwords: common words with small numeric suffixes, with repeats."""
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        word = rnd.choice(COMMON_WORDS)
+        if rnd.random() < 0.6:
+            word += str(rnd.randint(0, 99 if rnd.random() < 0.8 else 2024))
+        out.append(word)
+    return out
+
+
+def strong_passwords(n, seed=1, min_len=10, max_len=20):
+    """Unique random passwords over letters, digits and symbols."""
+    rnd = random.Random(seed)
+    return ["".join(rnd.choice(STRONG_ALPHABET) for _ in range(rnd.randint(min_len, max_len)))
+            for _ in range(n)]
+
+
+def stub_paths(root):
+    models, data = os.path.join(root, "models"), os.path.join(root, "data")
+    unsup = os.path.join(models, "unsupervised")
+    return {
+        "model_dir": models,
+        "data_dir": data,
+        "leaks": os.path.join(data, "leaks", "rockyou.txt"),
+        "model_a": os.path.join(models, "model_a_classifier.pkl"),
+        "model_b": os.path.join(models, "hacker_risk_model.pkl"),
+        "model_c": os.path.join(models, "model_c_autoencoder.pt"),
+        "guess_number": os.path.join(models, "guess_number.npz"),
+        "range_blob": os.path.join(data, "leaks", "range", "range.blob"),
+        "char2idx": os.path.join(unsup, "char2idx.json"),
+        "seq_ae": os.path.join(unsup, "autoencoder.pt"),
+        "isoforest": os.path.join(unsup, "isoforest.pkl"),
+        "isoforest_table": os.path.join(unsup, "isoforest_table.npz"),
+        "unsup_meta": os.path.join(unsup, "unsup_meta.json"),
+    }
+
+
+def build_stub_artifacts(root, n_leaks=50_000, seed=0, force=False):
+    """
+    Write stand-in artifacts under `root` (skipped if already present unless force=True):
+      data/leaks/rockyou.txt, data/leaks/range/*, models/model_a_classifier.pkl, models/hacker_risk_model.pkl,
+      models/model_c_autoencoder.pt, models/guess_number.npz and models/unsupervised/* for the detector.
+    Models are untrained or trained on the stub corpus: scores are meaningless, costs are real.
+    Returns the stub_paths dict.
+    """
+    import torch
+    from lightgbm import LGBMClassifier
+    from sklearn.ensemble import IsolationForest
+
+    from src.features.extractors import features_matrix
+    from src.models.anomaly_model import PasswordAutoencoder
+    from src.models.guess_number import GuessNumberEstimator
+    from src.data import range_index
+    from src.models.hacker_risk import HackerRiskModel
+    from src.unsupervised.isoforest_table import build_table as build_if_table, common_rows
+    from src.unsupervised.seq_model import SeqAutoencoder
+    from src.unsupervised.tokenizer import CharTokenizer
+    from src.unsupervised.train_autoencoder import extract_struct_features, MAX_LEN
+
+    paths = stub_paths(root)
+    if not force and all(os.path.exists(p) for k, p in paths.items() if not k.endswith("_dir")):
+        return paths
+    for p in (paths["leaks"], paths["char2idx"]):
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+
+    # ---------- Leak corpus (rank order = file order, like rockyou) ----------
+    leaks = weak_passwords(n_leaks, seed=seed)
+    with open(paths["leaks"], "w", encoding="utf-8") as f:
+        f.write("\n".join(leaks) + "\n")
+    range_index.build(paths["leaks"], os.path.dirname(paths["range_blob"]))
+
+    # ---------- Model A: LightGBM on the 8 numeric features ----------
+    corpus = leaks[:5_000] + strong_passwords(5_000, seed=seed + 1, min_len=6)
+    X = features_matrix(corpus)
+    y = np.where(X[:, 6] < 40, 0, np.where(X[:, 6] < 70, 1, 2))
+    model_a = LGBMClassifier(n_estimators=100, num_leaves=25, random_state=seed, verbose=-1).fit(X, y)
+    joblib.dump(model_a, paths["model_a"])
+
+    # ---------- Model B: hacker-risk model built from the stub leaks ----------
+    hr = HackerRiskModel(leak_path=paths["leaks"], top_k_for_edit=20000, ngram_n=3).build_from_leaks()
+    hr.save(paths["model_b"])
+    GuessNumberEstimator.from_hacker_risk(hr).build_table(20_000, seed=seed).save(paths["guess_number"])
+
+    # ---------- Model C: dense autoencoder (untrained, fitted normalization) ----------
+    torch.manual_seed(seed)
+    model_c = PasswordAutoencoder(X.shape[1])
+    model_c.set_normalization(X)
+    model_c.save(paths["model_c"])
+
+    # ---------- Unsupervised detector: GRU autoencoder + IsolationForest ----------
+    tokenizer = CharTokenizer.from_passwords(corpus, MAX_LEN)
+    tokenizer.save(paths["char2idx"])
+    vocab_size = tokenizer.vocab_size
+    torch.save(SeqAutoencoder(vocab_size, pad_idx=tokenizer.pad).state_dict(), paths["seq_ae"])
+    feats = np.array([extract_struct_features(p) for p in corpus])
+    iso = IsolationForest(n_estimators=200, contamination=0.01, random_state=seed).fit(feats)
+    joblib.dump(iso, paths["isoforest"])
+    build_if_table(iso, common_rows(leaks, extract_struct_features, 5_000), paths["isoforest_table"])
+    with open(paths["unsup_meta"], "w", encoding="utf-8") as f:
+        json.dump({"char2idx": "char2idx.json", "max_len": MAX_LEN, "vocab_size": vocab_size}, f)
+
+    print(f"[✅] Stub artifacts written -> {root}")
+    return paths
+
+
+def use_stub_artifacts(root):
+    """Point src.config at the stubs (must run before src.config is first imported)."""
+    paths = stub_paths(root)
+    os.environ["SENTINEL_MODEL_DIR"] = paths["model_dir"]
+    os.environ["SENTINEL_DATA_DIR"] = paths["data_dir"]
+    return paths
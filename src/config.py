@@ -2,17 +2,28 @@ import os
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 
-DATA_DIR = os.path.join(BASE_DIR, "data")
+# SENTINEL_DATA_DIR / SENTINEL_MODEL_DIR point the app at other artifacts (e.g. the benchmark stubs)
+DATA_DIR = os.environ.get("SENTINEL_DATA_DIR", os.path.join(BASE_DIR, "data"))
 LABELED_PATH = os.path.join(DATA_DIR, "labeled", "combined.csv")
+LABELED_DATASET_DIR = os.path.join(DATA_DIR, "labeled", "combined_parquet")
+FEATURE_CACHE_DIR = os.path.join(DATA_DIR, "feature_cache")
 LEAK_PATH = os.path.join(DATA_DIR, "leaks", "rockyou.txt")
+PATTERNS_DIR = os.path.join(DATA_DIR, "patterns")
+RANGE_DIR = os.path.join(DATA_DIR, "leaks", "range")
 UNLABELED_PATH = os.path.join(DATA_DIR, "unlabeled", "xato.txt")
-ROCKYOU_PATH = os.path.join("data", "leaks", "rockyou.txt")
+XATO_PATH = os.path.join(DATA_DIR, "xato", "10-million-passwords.txt")
+ROCKYOU_PATH = LEAK_PATH
 
 
-MODEL_DIR = os.path.join(BASE_DIR, "models")
+MODEL_DIR = os.environ.get("SENTINEL_MODEL_DIR", os.path.join(BASE_DIR, "models"))
 MODEL_A_PATH = os.path.join(MODEL_DIR, "model_a_classifier.pkl")
-MODEL_B_PATH = os.path.join("models", "hacker_risk_model.pkl")
+MODEL_B_PATH = os.path.join(MODEL_DIR, "hacker_risk_model.pkl")
 MODEL_C_PATH = os.path.join(MODEL_DIR, "model_c_autoencoder.pt")
 MODEL_D_PATH = os.path.join(MODEL_DIR, "model_d_generator.pt")
+STUDENT_PATH = os.path.join(MODEL_DIR, "student_model.pkl")
+FUSION_PATH = os.path.join(MODEL_DIR, "fusion_calibration.json")
+GUESS_NUMBER_PATH = os.path.join(MODEL_DIR, "guess_number.npz")
+UNSUPERVISED_DIR = os.path.join(MODEL_DIR, "unsupervised")
+ANOMALY_THRESHOLDS_PATH = os.path.join(MODEL_DIR, "anomaly_thresholds.json")
 
 FREQ_TABLE_PATH = os.path.join(MODEL_DIR, "frequency_rank.csv")
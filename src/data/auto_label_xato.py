@@ -1,20 +1,36 @@
-import pandas as pd
-import numpy as np
-import re
+# ============================================================
+# src/data/auto_label_xato.py
+# ------------------------------------------------------------
+# Rule-based strength labels for the xato.net password list.
+# Streams the input in chunks, labels each chunk with vectorized
+# rules (worker processes), dedups with a hashed set and writes
+# Parquet row groups -- memory stays bounded by the chunk size.
+#
+#   python -m src.data.auto_label_xato [--input ...] [--output ...]
+# ============================================================
+
+import argparse
+import math
 import os
-from tqdm import tqdm
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
-# Define file paths
-DATA_PATH = os.path.join("data", "xato", "10-million-passwords.txt")
-OUTPUT_PATH = os.path.join("data", "labeled", "xato_labeled.csv")
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
 
-# Load the raw passwords
-print("[INFO] Loading xato.net password list...")
-with open(DATA_PATH, "r", encoding="utf-8", errors="ignore") as f:
-    passwords = [line.strip() for line in f if line.strip()]
+from src.config import DATA_DIR, XATO_PATH
+from src.data.corpus import iter_password_batches
+from src.features.charmatrix import (
+    ALNUM, DIGIT, LOWER, UPPER, char_flags, codepoint_matrix, lengths, unique_counts,
+)
 
-print(f"[INFO] Loaded {len(passwords):,} passwords.")
+# Define file paths (under DATA_DIR, so SENTINEL_DATA_DIR applies)
+OUTPUT_PATH = os.path.join(DATA_DIR, "labeled", "xato_labeled.parquet")
+
+CHUNK_SIZE = 500_000
+MAX_VECTOR_LEN = 64  # longer passwords (rare) go through the scalar rule
+LABEL_NAMES = {0: "Weak", 1: "Medium", 2: "Strong"}
 
 
 # Helper function to label password strength
@@ -27,7 +43,7 @@ def rule_based_strength(password):
 
     # Compute entropy
     unique_chars = len(set(password))
-    entropy = np.log2(unique_chars) * length if unique_chars > 0 else 0
+    entropy = math.log2(unique_chars) * length if unique_chars > 0 else 0
 
     # Basic heuristics
     if length < 6 or entropy < 20:
@@ -46,28 +62,117 @@ def rule_based_strength(password):
             return 0  # Weak
 
 
-# Label all passwords
-print("[INFO] Labeling passwords based on heuristic rules...")
-labeled = []
-for pw in tqdm(passwords, total=len(passwords)):
-    labeled.append((pw, rule_based_strength(pw)))
+def rule_based_strength_batch(passwords):
+    """Vectorized rule_based_strength over a list of passwords -> int8 labels."""
+    length = lengths(passwords)
+    codes = codepoint_matrix(passwords, max_len=MAX_VECTOR_LEN)
+    flags = char_flags(codes)
+    real = codes != 0
+
+    has_upper = ((flags & UPPER) != 0).any(axis=1)
+    has_lower = ((flags & LOWER) != 0).any(axis=1)
+    has_digit = ((flags & DIGIT) != 0).any(axis=1)
+    has_symbol = (real & ((flags & ALNUM) == 0)).any(axis=1)
+    uniq = unique_counts(codes)
+    with np.errstate(divide="ignore"):
+        entropy = np.where(uniq > 0, np.log2(np.maximum(uniq, 1)) * length, 0.0)
+
+    short = (length >= 6) & (length < 10)
+    long_ = length >= 10
+    strong = long_ & has_digit & has_symbol & has_upper & has_lower
+    medium = (short & (has_digit | has_upper | has_symbol)) | (long_ & has_digit & (has_upper | has_symbol))
+    labels = np.where(strong, 2, np.where(medium, 1, 0))
+    labels[(length < 6) | (entropy < 20)] = 0
+
+    for i in np.flatnonzero(length > MAX_VECTOR_LEN):
+        labels[i] = rule_based_strength(passwords[i])
+    return labels.astype(np.int8)
+
+
+def iter_password_chunks(path, chunk_size=CHUNK_SIZE):
+    """Yield lists of stripped, non-empty passwords (plain or compressed input)."""
+    yield from iter_password_batches(path, chunk_size)
+
+
+def label_chunk(passwords):
+    return pd.DataFrame({"password": passwords, "strength": rule_based_strength_batch(passwords)})
+
+
+def _ordered_map(fn, chunks, workers):
+    """Like executor.map, but keeps at most 2 * workers chunks in flight."""
+    if workers <= 1:
+        yield from map(fn, chunks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        pending = []
+        for chunk in chunks:
+            pending.append(ex.submit(fn, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for fut in pending:
+            yield fut.result()
+
+
+class HashedDedup:
+    """Keep-first dedup over a stream of chunks via a sorted array of 64-bit password hashes."""
+
+    def __init__(self):
+        self.seen = np.empty(0, dtype=np.uint64)
+
+    def filter(self, df, column="password"):
+        h = pd.util.hash_pandas_object(df[column], index=False).to_numpy()
+        _, first = np.unique(h, return_index=True)
+        keep = np.zeros(len(df), dtype=bool)
+        keep[first] = True
+        keep &= ~np.isin(h, self.seen, assume_unique=False)
+        self.seen = np.union1d(self.seen, h[keep])
+        return df[keep]
+
+
+def run(input_path=XATO_PATH, output_path=OUTPUT_PATH, chunk_size=CHUNK_SIZE, workers=None):
+    """Label input_path into a deduplicated Parquet file at output_path. Returns label counts."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    workers = workers or os.cpu_count() or 1
+    print(f"[INFO] Labeling {input_path} in chunks of {chunk_size:,} ({workers} workers)...")
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    dedup = HashedDedup()
+    counts = Counter()
+    writer = None
+    try:
+        chunks = iter_password_chunks(input_path, chunk_size)
+        for df in tqdm(_ordered_map(label_chunk, chunks, workers), unit="chunk"):
+            df = dedup.filter(df)
+            counts.update(df["strength"].value_counts().to_dict())
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    # Show distribution
+    total = sum(counts.values())
+    print("\n[INFO] Label Distribution:")
+    for k, v in sorted(counts.items()):
+        pct = v / max(1, total) * 100
+        print(f"  {LABEL_NAMES[k]:7s} → {v:,} ({pct:.2f}%)")
+    print(f"\n✅ Saved labeled dataset to: {output_path}")
+    return counts
 
-# Convert to DataFrame
-df = pd.DataFrame(labeled, columns=["password", "strength"])
 
-# Drop duplicates for efficiency
-df = df.drop_duplicates(subset="password").reset_index(drop=True)
+def main():
+    parser = argparse.ArgumentParser(description="Rule-based labeling of the xato password list")
+    parser.add_argument("--input", default=XATO_PATH)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    run(args.input, args.output, args.chunk_size, args.workers)
 
-# Show distribution
-counts = Counter(df["strength"])
-total = sum(counts.values())
-print("\n[INFO] Label Distribution:")
-for k, v in sorted(counts.items()):
-    pct = v / total * 100
-    label = {0: "Weak", 1: "Medium", 2: "Strong"}[k]
-    print(f"  {label:7s} → {v:,} ({pct:.2f}%)")
 
-# Save labeled dataset
-os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-df.to_csv(OUTPUT_PATH, index=False)
-print(f"\n✅ Saved labeled dataset to: {OUTPUT_PATH}")
+if __name__ == "__main__":
+    main()
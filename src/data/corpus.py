@@ -0,0 +1,172 @@
+# ============================================================
+# src/data/corpus.py
+# ------------------------------------------------------------
+# Shared reader for password corpora (leak dumps, xato, ...),
+# plain or compressed: .gz / .bz2 / .xz / .zst, detected from
+# the file's magic bytes. Compressed input is streamed through
+# a parallel decompressor when one is on PATH
+#   gz -> pigz, bz2 -> lbzip2 / pbzip2, xz -> xz -T0, zst -> zstd
+# and through the stdlib (or the optional `zstandard` package)
+# otherwise. Lines are yielded in large batches.
+#
+#   python -m src.data.corpus data/leaks/rockyou.txt.zst   # count lines
+# ============================================================
+
+import argparse
+import io
+import itertools
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+BATCH_SIZE = 100_000
+READ_BUFFER = 1 << 20
+STDERR_TAIL = 4096  # bytes of decompressor stderr quoted in errors
+
+MAGIC = [
+    (b"\x1f\x8b", "gz"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zst"),
+]
+
+# Parallel decompressors, best first; each writes the decompressed stream to stdout
+DECOMPRESSORS = {
+    "gz": [["pigz", "-dc"], ["gzip", "-dc"]],
+    "bz2": [["lbzip2", "-dc"], ["pbzip2", "-dc"], ["bzip2", "-dc"]],
+    "xz": [["xz", "-dc", "-T0"]],
+    "zst": [["zstd", "-dc", "-q"]],
+}
+
+
+def detect_compression(path):
+    """'gz' / 'bz2' / 'xz' / 'zst', or None for plain text."""
+    with open(path, "rb") as f:
+        head = f.read(6)
+    for magic, kind in MAGIC:
+        if head.startswith(magic):
+            return kind
+    return None
+
+
+def _external_command(kind):
+    for cmd in DECOMPRESSORS.get(kind, []):
+        if shutil.which(cmd[0]):
+            return cmd
+    return None
+
+
+def _python_stream(path, kind):
+    if kind == "gz":
+        import gzip
+        return gzip.open(path, "rb")
+    if kind == "bz2":
+        import bz2
+        return bz2.open(path, "rb")
+    if kind == "xz":
+        import lzma
+        return lzma.open(path, "rb")
+    if kind == "zst":
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError(f"{path} is zstd-compressed: install `zstd` or the `zstandard` package")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True, closefd=True)
+    return open(path, "rb", buffering=READ_BUFFER)
+
+
+class CorpusReader:
+    """
+    Context manager over one corpus file, exposing a text stream.
+    Decoding follows `encoding` / `errors` (any codec error handler: "ignore" drops
+    undecodable bytes, "replace" substitutes U+FFFD, "strict" raises).
+    Newlines are universal ("\\r\\n" reads as "\\n"), as with open(path, "r").
+    """
+
+    def __init__(self, path, encoding="utf-8", errors="ignore", external=True):
+        self.path = path
+        self.kind = detect_compression(path)
+        self.command = _external_command(self.kind) if external and self.kind else None
+        self._proc = None
+        self._stderr = None
+        self.text = io.TextIOWrapper(self._open_raw(), encoding=encoding, errors=errors)
+
+    def _open_raw(self):
+        if self.command:
+            # stderr goes to a temp file, not a pipe: nobody reads it until close(), and a
+            # decompressor with a pipe's worth of warnings would block on a full pipe
+            self._stderr = tempfile.TemporaryFile()
+            self._proc = subprocess.Popen(self.command + [self.path], stdout=subprocess.PIPE,
+                                          stderr=self._stderr, bufsize=READ_BUFFER)
+            return self._proc.stdout
+        return _python_stream(self.path, self.kind)
+
+    def __iter__(self):
+        return iter(self.text)
+
+    def close(self, check=False):
+        self.text.close()
+        if self._proc is not None:
+            rc = self._proc.wait()
+            err = ""
+            if rc != 0:
+                self._stderr.seek(max(0, self._stderr.seek(0, io.SEEK_END) - STDERR_TAIL))
+                err = self._stderr.read().decode(errors="replace").strip()
+            self._stderr.close()
+            # A negative code after an early close is just SIGPIPE
+            if check and rc != 0:
+                raise RuntimeError(f"{self.command[0]} failed on {self.path} (exit {rc}): {err}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(check=exc_type is None)
+
+
+def iter_line_batches(path, batch_size=BATCH_SIZE, encoding="utf-8", errors="ignore", external=True):
+    """
+    Lists of up to batch_size lines, newline removed and nothing else: blank lines are
+    kept so callers can rely on line positions (e.g. leak rank = line index + 1).
+    """
+    with CorpusReader(path, encoding=encoding, errors=errors, external=external) as reader:
+        it = iter(reader)
+        while True:
+            lines = list(itertools.islice(it, batch_size))
+            if not lines:
+                return
+            yield [line[:-1] if line.endswith("\n") else line for line in lines]
+
+
+def iter_password_batches(path, batch_size=BATCH_SIZE, encoding="utf-8", errors="ignore", external=True):
+    """Lists of stripped, non-empty passwords (blank lines dropped)."""
+    for lines in iter_line_batches(path, batch_size, encoding, errors, external):
+        yield [pw for pw in (line.strip() for line in lines) if pw]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a (compressed) password corpus and count its lines")
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--no-external", action="store_true", help="use the Python decompressors only")
+    args = parser.parse_args()
+
+    kind = detect_compression(args.path)
+    command = _external_command(kind) if kind and not args.no_external else None
+    print(f"[INFO] {args.path}: {kind or 'plain text'}"
+          f"{' via ' + ' '.join(command) if command else ''}")
+    start = time.perf_counter()
+    n_lines = n_batches = 0
+    for lines in iter_line_batches(args.path, args.batch_size, external=not args.no_external):
+        n_lines += len(lines)
+        n_batches += 1
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(args.path)
+    print(f"[✅] {n_lines:,} lines in {n_batches:,} batches, {elapsed:.2f}s "
+          f"({size / 1e6 / max(elapsed, 1e-9):.1f} MB/s compressed input)")
+
+
+if __name__ == "__main__":
+    main()
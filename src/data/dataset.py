@@ -0,0 +1,184 @@
+# ============================================================
+# src/data/dataset.py
+# ------------------------------------------------------------
+# Columnar (Parquet/Arrow) storage for the labeled datasets.
+# Each dataset is a directory partitioned by `strength` holding
+# the password, its label and the precomputed NUMERIC_FEATURES
+# columns, so training and evaluation never re-run
+# extract_features. Reads support column projection and
+# predicate pushdown through pyarrow.dataset.
+#
+#   python -m src.data.dataset data/labeled/combined.csv
+# ============================================================
+
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as pads
+import pyarrow.parquet as pq
+
+from src.features.extractors import FEATURE_VERSION, NUMERIC_FEATURES, features_matrix
+from src.config import LABELED_PATH, LABELED_DATASET_DIR
+
+META_FILE = "_dataset.json"
+PARTITION_COL = "strength"
+CHUNK_SIZE = 1_000_000
+
+
+def _read_chunks(src_path, chunk_size):
+    """Yield raw (password, strength) frames from a CSV or Parquet file."""
+    if src_path.endswith(".parquet"):
+        pf = pq.ParquetFile(src_path)
+        for batch in pf.iter_batches(batch_size=chunk_size, columns=["password", "strength"]):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(
+            src_path, usecols=["password", "strength"], dtype={"password": str},
+            on_bad_lines="skip", encoding="utf-8", chunksize=chunk_size,
+        )
+
+
+def _with_features(df):
+    """Clean a raw frame and attach the NUMERIC_FEATURES columns."""
+    df = df.assign(strength=pd.to_numeric(df["strength"], errors="coerce"))
+    df = df.dropna(subset=["password", "strength"])
+    df = df.assign(password=df["password"].astype(str), strength=df["strength"].astype(np.int8))
+    X = features_matrix(df["password"].tolist())
+    for i, col in enumerate(NUMERIC_FEATURES):
+        df[col] = X[:, i]
+    return df.reset_index(drop=True)
+
+
+def _write_part(df, out_dir, part):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_to_dataset(
+        table, out_dir, partition_cols=[PARTITION_COL],
+        basename_template=f"part-{part:05d}-{{i}}.parquet",
+    )
+
+
+def _write_meta(out_dir, rows, source=None):
+    meta = {
+        "feature_version": FEATURE_VERSION,
+        "features": NUMERIC_FEATURES,
+        "rows": int(rows),
+        "source": os.path.abspath(source) if source else None,
+        "source_mtime": os.path.getmtime(source) if source else None,
+    }
+    with open(os.path.join(out_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+def read_meta(out_dir):
+    path = os.path.join(out_dir, META_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def convert(src_path=LABELED_PATH, out_dir=LABELED_DATASET_DIR, chunk_size=CHUNK_SIZE):
+    """Convert a labeled CSV/Parquet file into a partitioned dataset with feature columns."""
+    print(f"[INFO] Converting {src_path} -> {out_dir}")
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(out_dir)
+    rows = 0
+    for part, chunk in enumerate(_read_chunks(src_path, chunk_size)):
+        df = _with_features(chunk)
+        _write_part(df, out_dir, part)
+        rows += len(df)
+        print(f"[INFO]   part {part}: {rows:,} rows")
+    _write_meta(out_dir, rows, source=src_path)
+    print(f"[✅] Dataset written: {rows:,} rows")
+    return out_dir
+
+
+def write_dataset(df, out_dir=LABELED_DATASET_DIR, chunk_size=CHUNK_SIZE, source=None):
+    """
+    Write an in-memory (password, strength) frame as a dataset with feature columns.
+    Pass the file the frame was saved to as `source` so is_fresh() can tell when it changes.
+    """
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(out_dir)
+    rows = 0
+    for part, start in enumerate(range(0, len(df), chunk_size)):
+        chunk = _with_features(df.iloc[start : start + chunk_size][["password", "strength"]])
+        _write_part(chunk, out_dir, part)
+        rows += len(chunk)
+    _write_meta(out_dir, rows, source=source)
+    return out_dir
+
+
+def is_fresh(out_dir, src_path=None):
+    """True if out_dir holds a dataset with current features (and not older than src_path)."""
+    meta = read_meta(out_dir)
+    if meta is None or meta.get("feature_version") != FEATURE_VERSION:
+        return False
+    if src_path and os.path.exists(src_path):
+        # A dataset with no recorded source can't be checked against src_path: rebuild it
+        return (meta.get("source_mtime") is not None
+                and meta["source"] == os.path.abspath(src_path)
+                and os.path.getmtime(src_path) <= meta["source_mtime"])
+    return True
+
+
+def ensure_dataset(src_path=LABELED_PATH, out_dir=LABELED_DATASET_DIR):
+    """Return out_dir, converting src_path first if the dataset is missing or stale."""
+    if not is_fresh(out_dir, src_path):
+        convert(src_path, out_dir)
+    return out_dir
+
+
+# ------------------------------------------------------------
+# Reading
+# ------------------------------------------------------------
+def open_dataset(out_dir=LABELED_DATASET_DIR):
+    return pads.dataset(out_dir, format="parquet", partitioning="hive")
+
+
+def _filter_expr(filters):
+    """Accept a pyarrow Expression or DNF tuples like [("length", ">=", 8)]."""
+    if filters is None or isinstance(filters, pads.Expression):
+        return filters
+    return pq.filters_to_expression(filters)
+
+
+def load_dataset(out_dir=LABELED_DATASET_DIR, columns=None, filters=None):
+    """
+    Load (a projection of) the dataset as a DataFrame.
+    Only the requested columns / matching row groups are read from disk.
+    """
+    table = open_dataset(out_dir).to_table(columns=columns, filter=_filter_expr(filters))
+    df = table.to_pandas()
+    if PARTITION_COL in df.columns:
+        df[PARTITION_COL] = df[PARTITION_COL].astype(np.int8)
+    return df
+
+
+def iter_batches(out_dir=LABELED_DATASET_DIR, columns=None, filters=None, batch_size=CHUNK_SIZE):
+    """Stream the dataset as DataFrames of at most batch_size rows."""
+    scanner = open_dataset(out_dir).scanner(
+        columns=columns, filter=_filter_expr(filters), batch_size=batch_size,
+    )
+    for batch in scanner.to_batches():
+        if batch.num_rows == 0:
+            continue
+        df = batch.to_pandas()
+        if PARTITION_COL in df.columns:
+            df[PARTITION_COL] = df[PARTITION_COL].astype(np.int8)
+        yield df
+
+
+def feature_matrix(df):
+    """NUMERIC_FEATURES columns of a loaded frame as a float matrix (N, 8)."""
+    return df[NUMERIC_FEATURES].to_numpy(dtype=np.float64)
+
+
+if __name__ == "__main__":
+    convert(sys.argv[1] if len(sys.argv) > 1 else LABELED_PATH,
+            sys.argv[2] if len(sys.argv) > 2 else LABELED_DATASET_DIR)
@@ -0,0 +1,147 @@
+# ============================================================
+# src/data/range_index.py
+# ------------------------------------------------------------
+# k-anonymity range index over the leak corpus (HIBP-style):
+# clients send the first 5 hex chars of a password's SHA-1 and
+# get back every "SUFFIX:COUNT" line in that bucket, so the
+# server never sees the password or its full hash.
+#
+# On disk (RANGE_DIR):
+#   range.blob   all buckets back to back, "SUFFIX:COUNT\r\n" lines
+#                (35 uppercase hex chars of the SHA-1 after the prefix)
+#   range.idx    16^5 + 1 little-endian uint64 byte offsets into the blob
+# A query is one index lookup and one pread of the bucket.
+#
+#   python -m src.data.range_index            # build from LEAK_PATH
+# ============================================================
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Local imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from src.config import LEAK_PATH, RANGE_DIR
+from src.data.corpus import iter_password_batches
+
+N_BUCKETS = 16 ** 5
+PREFIX_LEN = 5
+HASH_CHUNK = 1_000_000
+HEX_DIGITS = set("0123456789abcdefABCDEF")
+_HEX = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+
+
+def blob_path(out_dir=RANGE_DIR):
+    return os.path.join(out_dir, "range.blob")
+
+
+def index_path(out_dir=RANGE_DIR):
+    return os.path.join(out_dir, "range.idx")
+
+
+# ------------------------------------------------------------
+# Offline build
+# ------------------------------------------------------------
+def hash_corpus(path):
+    """Sorted unique SHA-1 digests (N, 20) uint8 and their occurrence counts."""
+    # Same normalization as LeakRiskScorer: utf-8 (errors ignored), stripped, blanks skipped
+    sha1 = hashlib.sha1
+    parts = [np.frombuffer(b"".join([sha1(pw.encode("utf-8")).digest() for pw in batch]), dtype="S20")
+             for batch in iter_password_batches(path, HASH_CHUNK)]
+    digests = np.concatenate(parts) if parts else np.empty(0, dtype="S20")
+    unique, counts = np.unique(digests, return_counts=True)
+    return unique.view(np.uint8).reshape(-1, 20), counts
+
+
+def build(leak_path=LEAK_PATH, out_dir=RANGE_DIR):
+    start = time.perf_counter()
+    digests, counts = hash_corpus(leak_path)
+    print(f"[INFO] {len(digests):,} unique hashes in {time.perf_counter() - start:.1f}s")
+
+    # Hex-encode all digests at once: (N, 40) ASCII
+    hexed = np.empty((len(digests), 40), dtype=np.uint8)
+    hexed[:, 0::2] = _HEX[digests >> 4]
+    hexed[:, 1::2] = _HEX[digests & 0x0F]
+    prefixes = (digests[:, 0].astype(np.int64) << 12) | (digests[:, 1].astype(np.int64) << 4) | (digests[:, 2] >> 4)
+
+    # Rows are sorted by digest, hence by prefix: write them in order, tracking line sizes
+    os.makedirs(out_dir, exist_ok=True)
+    tmp_blob, tmp_idx = blob_path(out_dir) + ".tmp", index_path(out_dir) + ".tmp"
+    sizes = np.empty(len(digests), dtype=np.int64)
+    with open(tmp_blob, "wb") as f:
+        for lo in range(0, len(digests), HASH_CHUNK):
+            suffixes = hexed[lo:lo + HASH_CHUNK, PREFIX_LEN:].tobytes()
+            lines = [suffixes[i * 35:(i + 1) * 35] + b":%d\r\n" % c
+                     for i, c in enumerate(counts[lo:lo + HASH_CHUNK].tolist())]
+            sizes[lo:lo + len(lines)] = [len(line) for line in lines]
+            f.write(b"".join(lines))
+
+    # Bucket b spans [offsets[b], offsets[b + 1]) in the blob
+    offsets = np.zeros(N_BUCKETS + 1, dtype="<u8")
+    np.cumsum(np.bincount(prefixes, weights=sizes, minlength=N_BUCKETS).astype(np.uint64), out=offsets[1:])
+    offsets.tofile(tmp_idx)
+    os.replace(tmp_blob, blob_path(out_dir))
+    os.replace(tmp_idx, index_path(out_dir))
+    with open(os.path.join(out_dir, "range_meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"source": os.path.abspath(leak_path), "hashes": int(len(digests)),
+                   "occurrences": int(counts.sum()), "blob_bytes": int(offsets[-1])}, f, indent=2)
+    print(f"[✅] Range index ({int(offsets[-1]) / 1e6:.1f} MB) saved -> {out_dir} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+# ------------------------------------------------------------
+# Query side
+# ------------------------------------------------------------
+class RangeIndex:
+    """Read-only view of a built index: the offsets are memory-mapped, buckets read with os.pread."""
+
+    def __init__(self, out_dir=RANGE_DIR):
+        self.offsets = np.memmap(index_path(out_dir), dtype="<u8", mode="r", shape=(N_BUCKETS + 1,))
+        self.file = open(blob_path(out_dir), "rb", buffering=0)
+        self.fd = self.file.fileno()
+
+    @staticmethod
+    def bucket(prefix):
+        """Bucket number of a 5-hex-char prefix (ValueError if malformed)."""
+        if len(prefix) != PREFIX_LEN or not set(prefix) <= HEX_DIGITS:
+            raise ValueError("prefix must be 5 hex characters")
+        return int(prefix, 16)
+
+    def span(self, prefix):
+        """(offset, length) of the bucket in the blob."""
+        b = self.bucket(prefix)
+        start, end = int(self.offsets[b]), int(self.offsets[b + 1])
+        return start, end - start
+
+    def read(self, prefix):
+        offset, length = self.span(prefix)
+        return os.pread(self.fd, length, offset) if length else b""
+
+    def count(self, password):
+        """Occurrences of a plaintext password (local convenience; clients should hash themselves)."""
+        digest = hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
+        for line in self.read(digest[:PREFIX_LEN]).splitlines():
+            suffix, _, n = line.partition(b":")
+            if suffix.decode() == digest[PREFIX_LEN:]:
+                return int(n)
+        return 0
+
+    def close(self):
+        self.file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the k-anonymity SHA-1 range index")
+    parser.add_argument("--input", default=LEAK_PATH)
+    parser.add_argument("--output-dir", default=RANGE_DIR)
+    args = parser.parse_args()
+    build(args.input, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# ============================================================
+# src/features/charmatrix.py
+# ------------------------------------------------------------
+# Vectorized per-character statistics for batches of passwords.
+# A batch becomes a (N, W) uint32 codepoint matrix (0 = padding),
+# and character classes come from a codepoint lookup table, so
+# no per-character Python work is done.
+# ============================================================
+
+import string
+from functools import lru_cache
+
+import numpy as np
+
+# Character-class bit flags (same semantics as the str methods)
+UPPER = 1      # c.isupper()
+LOWER = 2      # c.islower()
+DIGIT = 4      # c.isdigit()
+ALNUM = 8      # c.isalnum()
+PUNCT = 16     # c in string.punctuation
+
+BMP_SIZE = 0x10000
+
+
+def _flags(c):
+    return (
+        (UPPER if c.isupper() else 0)
+        | (LOWER if c.islower() else 0)
+        | (DIGIT if c.isdigit() else 0)
+        | (ALNUM if c.isalnum() else 0)
+        | (PUNCT if c in string.punctuation else 0)
+    )
+
+
+@lru_cache(maxsize=None)
+def class_table():
+    """uint8 flags for every BMP codepoint (built once, ~65k entries)."""
+    table = np.fromiter((_flags(chr(i)) for i in range(BMP_SIZE)), dtype=np.uint8, count=BMP_SIZE)
+    table[0] = 0  # padding
+    return table
+
+
+def codepoint_matrix(passwords, max_len=None):
+    """
+    Encode strings as a (N, W) uint32 codepoint matrix padded with 0.
+    W is the longest string, or max_len (longer strings are truncated).
+    """
+    dtype = f"<U{max_len}" if max_len else str
+    arr = np.asarray(passwords, dtype=dtype)
+    if arr.dtype.itemsize == 0:  # every string empty
+        return np.zeros((len(arr), 1), dtype=np.uint32)
+    width = arr.dtype.itemsize // 4
+    return arr.view(np.uint32).reshape(len(arr), width)
+
+
+def char_flags(codes):
+    """Class flags per cell of a codepoint matrix (0 for padding)."""
+    table = class_table()
+    flags = table[np.minimum(codes, BMP_SIZE - 1)]
+    astral = codes >= BMP_SIZE
+    if astral.any():
+        for cp in np.unique(codes[astral]):
+            flags[codes == cp] = _flags(chr(int(cp)))
+    return flags
+
+
+def class_counts(codes):
+    """Per-row counts of upper, lower, digit, punctuation and non-alnum characters."""
+    flags = char_flags(codes)
+    real = codes != 0
+    return {
+        "upper": ((flags & UPPER) != 0).sum(axis=1),
+        "lower": ((flags & LOWER) != 0).sum(axis=1),
+        "digits": ((flags & DIGIT) != 0).sum(axis=1),
+        "special": ((flags & PUNCT) != 0).sum(axis=1),
+        "non_alnum": (real & ((flags & ALNUM) == 0)).sum(axis=1),
+    }
+
+
+def unique_counts(codes):
+    """Number of distinct characters per row."""
+    s = np.sort(codes, axis=1)
+    new = np.ones(s.shape, dtype=bool)
+    new[:, 1:] = s[:, 1:] != s[:, :-1]
+    return (new & (s != 0)).sum(axis=1)
+
+
+def lengths(passwords):
+    return np.fromiter(map(len, passwords), dtype=np.int64, count=len(passwords))
@@ -1,9 +1,15 @@
-import pandas as pd
 import numpy as np
 import math
 import string
 import os
 
+# Bump whenever extract_features changes: invalidates cached feature columns
+FEATURE_VERSION = 1
+
+# Numeric columns of extract_features, in the order the models consume them
+NUMERIC_FEATURES = ['length', 'upper', 'lower', 'digits', 'special',
+                    'diversity', 'entropy', 'sequence_score']
+
 def password_entropy(password):
     pool = 0
     if any(c.islower() for c in password): pool += 26
@@ -21,6 +27,8 @@ def extract_features(password):
     special = sum(1 for c in password if c in string.punctuation)
     diversity = len(set(password)) / length if length > 0 else 0
     entropy = password_entropy(password)
+    # Legacy 5-substring count: Model A was trained on it. The richer replacement is
+    # src.features.patterns.sequence_score (bump FEATURE_VERSION and retrain to switch).
     sequences = ['123', 'abc', 'qwe', 'xyz', 'password']
     seq_score = sum(seq in password.lower() for seq in sequences)
 
@@ -36,6 +44,14 @@ def extract_features(password):
         "password": password
     }
 
+def features_matrix(passwords):
+    """Batch version of extract_features: float matrix (N, 8) in NUMERIC_FEATURES order."""
+    X = np.empty((len(passwords), len(NUMERIC_FEATURES)), dtype=np.float64)
+    for i, pw in enumerate(passwords):
+        feats = extract_features(pw)
+        X[i] = [feats[c] for c in NUMERIC_FEATURES]
+    return X
+
 def load_passwords_from_dataset(dataset_dir):
     passwords = []
     labels = []
@@ -51,6 +67,8 @@ def load_passwords_from_dataset(dataset_dir):
     return passwords, labels
 
 def generate_features(dataset_dir="datasets/", output_path="data/password_features.csv"):
+    import pandas as pd
+
     passwords, labels = load_passwords_from_dataset(dataset_dir)
     data = [extract_features(pw) for pw in passwords]
     df = pd.DataFrame(data)
@@ -0,0 +1,301 @@
+# ============================================================
+# src/features/patterns.py
+# ------------------------------------------------------------
+# Aho–Corasick multi-pattern matcher for predictable password
+# fragments: alphabet / digit sequences, keyboard walks,
+# repeated characters, dates, common words and names.
+# The automaton is built once (get_matcher) and finds every
+# pattern occurrence in one left-to-right pass, so scan cost
+# depends on the password length, not on the pattern count.
+#
+# Extra word / name lists are read from PATTERNS_DIR when
+# present (one lowercase entry per line):
+#   words.txt  names.txt
+# Build words.txt from the leak corpus with:
+#   python -m src.features.patterns --build-words
+# ============================================================
+
+import argparse
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import NamedTuple
+
+from src.config import LEAK_PATH, PATTERNS_DIR
+from src.data.corpus import iter_line_batches
+
+MIN_PATTERN_LEN = 3
+MIN_FILE_WORD_LEN = 4
+
+# Category -> weight in sequence_score (share of the password that counts as predictable)
+CATEGORY_WEIGHTS = {
+    "sequence": 1.0,
+    "keyboard": 1.0,
+    "repeat": 1.0,
+    "date": 0.8,
+    "word": 0.7,
+    "name": 0.7,
+}
+
+FEEDBACK = {
+    "sequence": "Avoid sequences like '{}'.",
+    "keyboard": "Avoid keyboard walks like '{}'.",
+    "repeat": "Avoid repeated characters like '{}'.",
+    "date": "Avoid dates and years like '{}'.",
+    "word": "Avoid common words like '{}'.",
+    "name": "Avoid names like '{}'.",
+}
+
+KEYBOARD_ROWS = ["`1234567890-=", "qwertyuiop[]\\", "asdfghjkl;'", "zxcvbnm,./"]
+KEYBOARD_COLUMNS = ["1qaz", "2wsx", "3edc", "4rfv", "5tgb", "6yhn", "7ujm", "8ik,", "9ol.", "0p;/"]
+
+COMMON_WORDS = [
+    "password", "passwd", "pass", "admin", "letmein", "welcome", "login", "master", "secret",
+    "monkey", "dragon", "shadow", "sunshine", "princess", "iloveyou", "love", "angel", "baby",
+    "football", "baseball", "soccer", "hockey", "superman", "batman", "starwars", "pokemon",
+    "freedom", "whatever", "trustno", "hello", "test", "guest", "root", "user", "default",
+    "changeme", "money", "killer", "pepper", "cheese", "computer", "internet", "google",
+    "summer", "winter", "spring", "autumn", "flower", "tiger", "lucky", "ninja", "mustang",
+    "harley", "ranger", "buster", "cookie", "chocolate", "banana", "orange", "apple", "purple",
+    "silver", "golden", "diamond", "hunter", "soccer", "forever", "family", "friend", "qwerty",
+]
+
+COMMON_NAMES = [
+    "michael", "jessica", "ashley", "daniel", "jennifer", "thomas", "andrew", "joshua",
+    "matthew", "robert", "charlie", "jordan", "david", "john", "james", "sarah", "anna",
+    "maria", "nicole", "michelle", "amanda", "jason", "justin", "brandon", "william",
+    "hannah", "emily", "chris", "alex", "taylor", "lisa", "kevin", "steven", "george",
+    "peter", "sophie", "olivia", "emma", "lucas", "maggie", "ginger", "samantha", "melissa",
+    "anthony", "joseph", "richard", "elizabeth", "natalie", "victoria", "alexander",
+]
+
+
+class Match(NamedTuple):
+    start: int
+    end: int
+    pattern: str
+    category: str
+
+
+# ------------------------------------------------------------
+#  Automaton
+# ------------------------------------------------------------
+class PatternMatcher:
+    """
+    Aho–Corasick automaton over lowercase patterns.
+    Built from (pattern, category) pairs; the first category given for a pattern wins.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = []      # id -> (pattern, category)
+        self._goto = [{}]       # state -> {char: state}
+        self._fail = [0]
+        self._out = [()]        # state -> ids of patterns ending here (incl. via fail links)
+        seen = set()
+        for pattern, category in patterns:
+            pattern = pattern.lower()
+            if len(pattern) < MIN_PATTERN_LEN or pattern in seen:
+                continue
+            seen.add(pattern)
+            self._insert(pattern, len(self.patterns))
+            self.patterns.append((pattern, category))
+        self._link()
+
+    def _insert(self, pattern, pid):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + (pid,)
+
+    def _link(self):
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = list(goto[0].values())  # depth-1 states fail to the root
+        for state in queue:             # BFS: the list grows while we iterate
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+                queue.append(nxt)
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def find(self, text):
+        """Every pattern occurrence in text (case-insensitive), as Match(start, end, pattern, category)."""
+        lowered = text.lower()
+        if len(lowered) != len(text):   # a few characters lowercase to several; keep spans aligned
+            lowered = [c.lower() for c in text]
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        matches = []
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pid in out[state]:
+                pattern, category = patterns[pid]
+                matches.append(Match(i + 1 - len(pattern), i + 1, pattern, category))
+        return matches
+
+    def analyze(self, text):
+        """Matches, per-category counts, the non-overlapping cover and sequence_score in one pass."""
+        matches = self.find(text)
+        cover = _cover(matches)
+        return {
+            "matches": matches,
+            "counts": dict(Counter(m.category for m in matches)),
+            "cover": cover,
+            "sequence_score": _score(cover, len(text)),
+        }
+
+
+def _cover(matches):
+    """Greedy non-overlapping subset, longest matches first."""
+    taken, chosen = set(), []
+    for m in sorted(matches, key=lambda m: (m.start - m.end, m.start)):
+        span = range(m.start, m.end)
+        if not taken.intersection(span):
+            taken.update(span)
+            chosen.append(m)
+    return sorted(chosen)
+
+
+def _score(cover, length):
+    if length == 0:
+        return 0.0
+    return round(sum(CATEGORY_WEIGHTS[m.category] * (m.end - m.start) for m in cover) / length, 4)
+
+
+# ------------------------------------------------------------
+#  Pattern sets
+# ------------------------------------------------------------
+def _runs(line, min_len=MIN_PATTERN_LEN):
+    """All substrings of `line` and of its reverse with length >= min_len."""
+    out = []
+    for s in (line, line[::-1]):
+        for i in range(len(s)):
+            for j in range(i + min_len, len(s) + 1):
+                out.append(s[i:j])
+    return out
+
+
+def sequence_patterns():
+    return _runs("abcdefghijklmnopqrstuvwxyz") + _runs("0123456789")
+
+
+def keyboard_patterns():
+    walks = []
+    for row in KEYBOARD_ROWS:
+        walks += _runs(row)
+    for col in KEYBOARD_COLUMNS:
+        walks += _runs(col)
+    for width in (2, 3):  # consecutive columns: 1qaz2wsx, 1qaz2wsx3edc, ...
+        for i in range(len(KEYBOARD_COLUMNS) - width + 1):
+            walks.append("".join(KEYBOARD_COLUMNS[i : i + width]))
+    return walks
+
+
+def repeat_patterns(max_run=8):
+    chars = "abcdefghijklmnopqrstuvwxyz0123456789!@#$%&*?.-_"
+    return [c * n for n in range(MIN_PATTERN_LEN, max_run + 1) for c in chars]
+
+
+def date_patterns(first_year=1940, last_year=2030):
+    days = [31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+    dates = [str(y) for y in range(first_year, last_year + 1)]
+    for month, n_days in enumerate(days, start=1):
+        for day in range(1, n_days + 1):
+            dates += [f"{month:02d}{day:02d}", f"{day:02d}{month:02d}"]
+    return dates
+
+
+def _read_list(path, min_len):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return [w for w in (line.strip().lower() for line in f) if len(w) >= min_len]
+
+
+def default_patterns(patterns_dir=PATTERNS_DIR):
+    """(pattern, category) pairs, highest-priority category first."""
+    groups = [
+        ("sequence", sequence_patterns()),
+        ("keyboard", keyboard_patterns()),
+        ("repeat", repeat_patterns()),
+        ("date", date_patterns()),
+        ("word", COMMON_WORDS + _read_list(os.path.join(patterns_dir, "words.txt"), MIN_FILE_WORD_LEN)),
+        ("name", COMMON_NAMES + _read_list(os.path.join(patterns_dir, "names.txt"), MIN_FILE_WORD_LEN)),
+    ]
+    return [(p, category) for category, pats in groups for p in pats]
+
+
+@lru_cache(maxsize=None)
+def get_matcher(patterns_dir=PATTERNS_DIR):
+    """Single cached automaton over default_patterns()."""
+    return PatternMatcher(default_patterns(patterns_dir))
+
+
+# ------------------------------------------------------------
+#  Password-level helpers
+# ------------------------------------------------------------
+def sequence_score(password):
+    """0..1: weighted share of the password covered by known patterns (higher = more predictable)."""
+    return get_matcher().analyze(password)["sequence_score"]
+
+
+def pattern_feedback(password, analysis=None):
+    """One suggestion per matched category, naming its longest match."""
+    analysis = analysis or get_matcher().analyze(password)
+    longest = {}
+    for m in analysis["matches"]:
+        best = longest.get(m.category)
+        if best is None or len(m.pattern) > len(best):
+            longest[m.category] = m.pattern
+    return [FEEDBACK[c].format(longest[c]) for c in FEEDBACK if c in longest]
+
+
+def build_word_list(leak_path=LEAK_PATH, output_path=None, top_n=30_000):
+    """Most frequent alphabetic runs (>= MIN_FILE_WORD_LEN letters) in the leak corpus -> words.txt."""
+    output_path = output_path or os.path.join(PATTERNS_DIR, "words.txt")
+    word_re = re.compile(r"[a-z]{%d,}" % MIN_FILE_WORD_LEN)
+    counts = Counter()
+    for lines in iter_line_batches(leak_path):
+        for line in lines:
+            counts.update(word_re.findall(line.lower()))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        for word, _ in counts.most_common(top_n):
+            f.write(word + "\n")
+    print(f"[✅] {min(top_n, len(counts)):,} words saved to: {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pattern matcher utilities")
+    parser.add_argument("--build-words", action="store_true", help="build words.txt from the leak corpus")
+    parser.add_argument("--top-n", type=int, default=30_000)
+    parser.add_argument("passwords", nargs="*", help="passwords to analyze")
+    args = parser.parse_args()
+
+    if args.build_words:
+        build_word_list(top_n=args.top_n)
+    matcher = get_matcher()
+    print(f"[INFO] {len(matcher):,} patterns loaded")
+    for pw in args.passwords:
+        a = matcher.analyze(pw)
+        print(f"{pw:20} score={a['sequence_score']:.2f} counts={a['counts']} "
+              f"cover={[(m.pattern, m.category) for m in a['cover']]}")
+
+
+if __name__ == "__main__":
+    main()
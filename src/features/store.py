@@ -0,0 +1,146 @@
+# ============================================================
+# src/features/store.py
+# ------------------------------------------------------------
+# Content-addressed feature cache shared by training, evaluation
+# and threshold calibration. A labeled source file is keyed by
+# (content hash, FEATURE_VERSION); its feature matrix and labels
+# are stored once as .npy files and opened memory-mapped, so a
+# rerun with unchanged data and features skips straight to fitting.
+# ============================================================
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import NamedTuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from src.config import FEATURE_CACHE_DIR, LABELED_DATASET_DIR, LABELED_PATH
+from src.features.extractors import FEATURE_VERSION, NUMERIC_FEATURES
+
+HASH_INDEX = "hashes.json"
+_READ_BLOCK = 8 * 1024 * 1024
+
+
+class FeatureSet(NamedTuple):
+    X: np.ndarray      # (N, len(NUMERIC_FEATURES)) float64, memory-mapped
+    y: np.ndarray      # (N,) int8 strength labels, memory-mapped
+    key: str
+    path: str
+
+
+def _iter_files(path):
+    if os.path.isdir(path):
+        for root, _, files in sorted(os.walk(path)):
+            for name in sorted(files):
+                yield os.path.join(root, name)
+    else:
+        yield path
+
+
+class FeatureStore:
+    def __init__(self, root=FEATURE_CACHE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    # -------------------------
+    # Keys
+    # -------------------------
+    def _hash_index(self):
+        path = os.path.join(self.root, HASH_INDEX)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {}
+
+    def content_hash(self, source_path):
+        """blake2b of the source bytes; memoized per (path, size, mtime) so unchanged files are not re-read."""
+        index = self._hash_index()
+        h = hashlib.blake2b(digest_size=16)
+        changed = False
+        for fpath in _iter_files(source_path):
+            st = os.stat(fpath)
+            stamp = f"{os.path.abspath(fpath)}:{st.st_size}:{st.st_mtime_ns}"
+            file_hash = index.get(stamp)
+            if file_hash is None:
+                fh = hashlib.blake2b(digest_size=16)
+                with open(fpath, "rb") as f:
+                    for block in iter(lambda: f.read(_READ_BLOCK), b""):
+                        fh.update(block)
+                file_hash = index[stamp] = fh.hexdigest()
+                changed = True
+            h.update(file_hash.encode())
+        if changed:
+            with open(os.path.join(self.root, HASH_INDEX), "w", encoding="utf-8") as f:
+                json.dump(index, f, indent=1)
+        return h.hexdigest()
+
+    def key(self, source_path):
+        return f"{self.content_hash(source_path)}-v{FEATURE_VERSION}"
+
+    # -------------------------
+    # Lookup / build
+    # -------------------------
+    def get(self, key):
+        """Open a cached FeatureSet (memory-mapped) or return None."""
+        path = os.path.join(self.root, key)
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            return None
+        X = np.load(os.path.join(path, "X.npy"), mmap_mode="r")
+        y = np.load(os.path.join(path, "y.npy"), mmap_mode="r")
+        return FeatureSet(X, y, key, path)
+
+    def put(self, key, batches, n_rows):
+        """
+        Write a FeatureSet from an iterable of (X_chunk, y_chunk) with n_rows in total.
+        Written to a temp dir and renamed, so a crashed build never looks cached.
+        """
+        final = os.path.join(self.root, key)
+        tmp = f"{final}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        X = open_memmap(os.path.join(tmp, "X.npy"), mode="w+", dtype=np.float64,
+                        shape=(n_rows, len(NUMERIC_FEATURES)))
+        y = open_memmap(os.path.join(tmp, "y.npy"), mode="w+", dtype=np.int8, shape=(n_rows,))
+        pos = 0
+        for X_chunk, y_chunk in batches:
+            X[pos : pos + len(X_chunk)] = X_chunk
+            y[pos : pos + len(y_chunk)] = y_chunk
+            pos += len(X_chunk)
+        if pos != n_rows:
+            raise RuntimeError(f"Feature build wrote {pos} rows, expected {n_rows}")
+        X.flush(); y.flush()
+        del X, y
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"rows": n_rows, "features": NUMERIC_FEATURES,
+                       "feature_version": FEATURE_VERSION, "created": time.time()}, f, indent=2)
+        shutil.rmtree(final, ignore_errors=True)
+        os.rename(tmp, final)
+        return self.get(key)
+
+    def get_or_build(self, source_path=LABELED_PATH, dataset_dir=LABELED_DATASET_DIR):
+        """FeatureSet for a labeled source file, building it through the Parquet dataset on a miss."""
+        from src.data.dataset import ensure_dataset, feature_matrix, iter_batches, read_meta
+
+        key = self.key(source_path)
+        cached = self.get(key)
+        if cached is not None:
+            print(f"[INFO] Feature cache hit: {key}")
+            return cached
+
+        print(f"[INFO] Feature cache miss: {key} -- building...")
+        ensure_dataset(source_path, dataset_dir)
+        n_rows = read_meta(dataset_dir)["rows"]
+        batches = (
+            (feature_matrix(df), df["strength"].to_numpy(np.int8))
+            for df in iter_batches(dataset_dir, columns=["strength"] + NUMERIC_FEATURES)
+        )
+        return self.put(key, batches, n_rows)
+
+
+def load_features(source_path=LABELED_PATH, root=FEATURE_CACHE_DIR):
+    """Shortcut: cached FeatureSet for source_path."""
+    return FeatureStore(root).get_or_build(source_path)
@@ -5,13 +5,17 @@
 # input word or phrase (Model D - Generator)
 # ============================================================
 
-import random
 import re
 import string
-from typing import Dict
+import time
+from typing import Dict, Optional
 import os
 import sys
 
+import numpy as np
+
+from src.generator.rng import BufferedRNG, SeededRNG, get_rng
+
 # ------------------------------------------------------------
 #  Leetspeak map and symbol pools
 # ------------------------------------------------------------
@@ -30,51 +34,58 @@ SYMBOL_POOL = list("!@#$%&*?+-=_")
 # ------------------------------------------------------------
 #  Helper transformations
 # ------------------------------------------------------------
-def random_capitalize(word: str) -> str:
+# All helpers draw from `rng` (a BufferedRNG); None means the
+# process-wide secure source from src.generator.rng.get_rng().
+def random_capitalize(word: str, rng: Optional[BufferedRNG] = None) -> str:
     """Randomly capitalize ~40% of characters."""
+    rng = rng or get_rng()
     return "".join(
-        c.upper() if random.random() < 0.4 else c.lower() for c in word
+        c.upper() if rng.random() < 0.4 else c.lower() for c in word
     )
 
-def leetspeak(word: str) -> str:
+def leetspeak(word: str, rng: Optional[BufferedRNG] = None) -> str:
     """Replace letters with leetspeak equivalents."""
+    rng = rng or get_rng()
     return "".join(
-        random.choice(LEET_MAP[c.lower()])
-        if c.lower() in LEET_MAP and random.random() < 0.6
+        rng.choice(LEET_MAP[c.lower()])
+        if c.lower() in LEET_MAP and rng.random() < 0.6
         else c
         for c in word
     )
 
-def inject_symbols(word: str) -> str:
+def inject_symbols(word: str, rng: Optional[BufferedRNG] = None) -> str:
     """Randomly inject a symbol into the word."""
-    if random.random() < 0.7 and len(word) > 1:
-        pos = random.randint(1, len(word) - 1)
-        sym = random.choice(SYMBOL_POOL)
+    rng = rng or get_rng()
+    if rng.random() < 0.7 and len(word) > 1:
+        pos = rng.randint(1, len(word) - 1)
+        sym = rng.choice(SYMBOL_POOL)
         word = word[:pos] + sym + word[pos:]
     return word
 
-def add_affix(word: str) -> str:
+def add_affix(word: str, rng: Optional[BufferedRNG] = None) -> str:
     """Add random prefix/suffix digits or symbols."""
-    suffix = str(random.randint(10, 99))
-    if random.random() < 0.5:
-        prefix = random.choice(["X", "Z", "Q", "P"]) + str(random.randint(1, 9))
+    rng = rng or get_rng()
+    suffix = str(rng.randint(10, 99))
+    if rng.random() < 0.5:
+        prefix = rng.choice(["X", "Z", "Q", "P"]) + str(rng.randint(1, 9))
         return prefix + word + suffix
     return word + suffix
 
-def ensure_entropy(pw: str) -> str:
+def ensure_entropy(pw: str, rng: Optional[BufferedRNG] = None) -> str:
     """Guarantee password includes at least one uppercase, digit, and symbol."""
+    rng = rng or get_rng()
     if not any(c.isupper() for c in pw):
-        pw += random.choice(string.ascii_uppercase)
+        pw += rng.choice(string.ascii_uppercase)
     if not any(c.isdigit() for c in pw):
-        pw += random.choice(string.digits)
+        pw += rng.choice(string.digits)
     if not any(c in string.punctuation for c in pw):
-        pw += random.choice(SYMBOL_POOL)
+        pw += rng.choice(SYMBOL_POOL)
     return pw
 
 # ------------------------------------------------------------
 #  Main Generator Function
 # ------------------------------------------------------------
-def generate_password(base: str, n_variants: int = 5) -> Dict:
+def generate_password(base: str, n_variants: int = 5, rng: Optional[BufferedRNG] = None) -> Dict:
     """
     Generate multiple strong passwords from a base keyword.
     Returns dictionary with best suggestion and full list.
@@ -82,6 +93,7 @@ def generate_password(base: str, n_variants: int = 5) -> Dict:
     Args:
         base (str): user-provided word or phrase.
         n_variants (int): number of variants to generate.
+        rng (BufferedRNG): random source (defaults to the secure source).
 
     Returns:
         dict: containing base word, suggestions, and best password.
@@ -90,14 +102,15 @@ def generate_password(base: str, n_variants: int = 5) -> Dict:
     if len(base) < 3:
         raise ValueError("Base word too short. Use at least 3 letters.")
 
+    rng = rng or get_rng()
     candidates = []
     for _ in range(n_variants):
         pw = base
-        pw = random_capitalize(pw)
-        pw = leetspeak(pw)
-        pw = inject_symbols(pw)
-        pw = add_affix(pw)
-        pw = ensure_entropy(pw)
+        pw = random_capitalize(pw, rng)
+        pw = leetspeak(pw, rng)
+        pw = inject_symbols(pw, rng)
+        pw = add_affix(pw, rng)
+        pw = ensure_entropy(pw, rng)
         candidates.append(pw)
 
     # ⚙️ Placeholder ranking logic
@@ -115,6 +128,213 @@ def generate_password(base: str, n_variants: int = 5) -> Dict:
         "best_password": best_pw,
     }
 
+# ------------------------------------------------------------
+#  Batch Generator (vectorized, leak- and risk-aware)
+# ------------------------------------------------------------
+# Per-mode transformation probabilities, default length and
+# the maximum hacker-risk score (0-100) a suggestion may have.
+MODES = {
+    "memorable":    {"cap": 0.2, "leet": 0.3, "symbol": 0.5, "prefix": 0.0, "length": None, "max_risk": 60},
+    "balanced":     {"cap": 0.4, "leet": 0.6, "symbol": 0.7, "prefix": 0.5, "length": None, "max_risk": 50},
+    "hacker-proof": {"cap": 0.5, "leet": 0.8, "symbol": 1.0, "prefix": 1.0, "length": 16,   "max_risk": 35},
+}
+
+MAX_LENGTH = 64
+_PREFIX_LETTERS = np.array([ord(c) for c in "XZQP"], dtype=np.uint32)
+_SYMBOLS = np.array([ord(c) for c in SYMBOL_POOL], dtype=np.uint32)
+_FILL_POOL = np.array(
+    [ord(c) for c in string.ascii_letters + string.digits] + list(_SYMBOLS), dtype=np.uint32
+)
+_UPPER = np.array([ord(c) for c in string.ascii_uppercase], dtype=np.uint32)
+_DIGITS = np.array([ord(c) for c in string.digits], dtype=np.uint32)
+_PUNCT = np.array([ord(c) for c in string.punctuation], dtype=np.uint32)
+
+
+def _pick(pool, u):
+    """Vectorized choice: map uniforms u in [0, 1) to elements of pool (bias < len(pool) / 2**53)."""
+    return pool[(u * len(pool)).astype(np.int64)]
+
+
+def _to_strings(codes):
+    """Join rows of a codepoint matrix into strings, dropping 0 (empty) cells."""
+    order = np.argsort(codes == 0, axis=1, kind="stable")
+    packed = np.ascontiguousarray(np.take_along_axis(codes, order, axis=1))
+    return packed.view(f"<U{codes.shape[1]}").ravel().tolist()
+
+
+def _candidate_batch(base, n, params, length, rng):
+    """Build n candidates as a codepoint matrix, mirroring the per-word helpers above."""
+    L = len(base)
+    lower = np.array([ord(c.lower()) if len(c.lower()) == 1 else ord(c) for c in base], dtype=np.uint32)
+    upper = np.array([ord(c.upper()) if len(c.upper()) == 1 else ord(c) for c in base], dtype=np.uint32)
+
+    # random_capitalize
+    chars = np.where(rng.random((n, L)) < params["cap"], upper, lower)
+
+    # leetspeak
+    opts = [LEET_MAP.get(c.lower(), []) for c in base]
+    n_opts = np.array([len(o) for o in opts])
+    if n_opts.any():
+        table = np.zeros((L, n_opts.max()), dtype=np.uint32)
+        for i, o in enumerate(opts):
+            table[i, : len(o)] = [ord(x) for x in o]
+        pick = (rng.random((n, L)) * np.maximum(n_opts, 1)).astype(np.int64)
+        leet = table[np.arange(L), pick]
+        mask = (n_opts > 0) & (rng.random((n, L)) < params["leet"])
+        chars = np.where(mask, leet, chars)
+
+    # inject_symbols: one symbol at position 1..L-1 (column L stays empty otherwise)
+    inject = (rng.random(n) < params["symbol"]) & (L > 1)
+    pos = np.where(inject, 1 + (rng.random(n) * max(L - 1, 1)).astype(np.int64), L + 1)
+    cols = np.arange(L + 1)
+    src = np.clip(cols - (cols > pos[:, None]), 0, L - 1)
+    out = np.take_along_axis(chars, src, axis=1)
+    out[:, L] = np.where(inject, out[:, L], 0)
+    sym_col = cols == pos[:, None]
+    out[sym_col] = _pick(_SYMBOLS, rng.random(int(sym_col.sum())))
+
+    # add_affix: optional letter+digit prefix, two-digit suffix 10-99
+    has_prefix = rng.random(n) < params["prefix"]
+    prefix = np.stack([
+        _pick(_PREFIX_LETTERS, rng.random(n)),
+        ord("1") + (rng.random(n) * 9).astype(np.uint32),
+    ], axis=1)
+    prefix[~has_prefix] = 0
+    suffix_num = 10 + (rng.random(n) * 90).astype(np.uint32)
+    suffix = np.stack([ord("0") + suffix_num // 10, ord("0") + suffix_num % 10], axis=1)
+    codes = np.hstack([prefix, out, suffix])
+
+    # ensure_entropy
+    extra = np.zeros((n, 3), dtype=np.uint32)
+    extra[:, 0] = np.where(np.isin(codes, _UPPER).any(axis=1), 0, _pick(_UPPER, rng.random(n)))
+    extra[:, 1] = np.where(np.isin(codes, _DIGITS).any(axis=1), 0, _pick(_DIGITS, rng.random(n)))
+    extra[:, 2] = np.where(np.isin(codes, _PUNCT).any(axis=1), 0, _pick(_SYMBOLS, rng.random(n)))
+    codes = np.hstack([codes, extra])
+
+    # pad to the requested length with random fill characters
+    if length:
+        cur = (codes != 0).sum(axis=1)
+        fill = _pick(_FILL_POOL, rng.random((n, length)))
+        fill[np.arange(length) >= (length - cur)[:, None]] = 0
+        codes = np.hstack([codes, fill])
+    return codes
+
+
+def generate_batch(
+    base: str,
+    top_n: int = 5,
+    length: Optional[int] = None,
+    mode: str = "balanced",
+    n_candidates: int = 2048,
+    leak_table=None,
+    risk_model=None,
+    classifier=None,
+    budget_ms: float = 150.0,
+    seed: Optional[int] = None,
+    rng: Optional[BufferedRNG] = None,
+) -> Dict:
+    """
+    Generate thousands of candidates at once and return the top_n safest.
+
+    Args:
+        base (str): user-provided word or phrase.
+        top_n (int): number of suggestions to return.
+        length (int): exact output length (defaults to the mode's length, if any,
+            stretched to fit long bases).
+        mode (str): one of MODES ("memorable", "balanced", "hacker-proof").
+        n_candidates (int): candidates generated per round.
+        leak_table: container of leaked passwords (e.g. LeakRiskScorer.freq_table);
+            exact hits are rejected.
+        risk_model: HackerRiskModel; candidates scoring above the mode's max_risk are rejected.
+        classifier: PasswordClassifier; candidates are ranked by P(strong).
+        budget_ms (float): latency budget; generation and risk scoring stop once it is
+            spent and the candidates accepted so far are returned.
+        seed (int): shorthand for rng=SeededRNG(seed) (tests / benchmarks only).
+        rng (BufferedRNG): random source (defaults to the secure source).
+
+    Returns:
+        dict: containing base word, suggestions, best password and rejection stats.
+    """
+    start = time.perf_counter()
+    deadline = start + budget_ms / 1000.0
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Use one of: {', '.join(MODES)}.")
+    params = MODES[mode]
+
+    base = re.sub(r"\s+", "", base.strip())
+    if len(base) < 3:
+        raise ValueError("Base word too short. Use at least 3 letters.")
+    if length:
+        if length < len(base) + 4:
+            raise ValueError(f"Length must be at least {len(base) + 4} for this base word.")
+    elif params["length"] is not None:
+        # Mode default, stretched so long bases still fit every affix (prefix, symbol,
+        # suffix and up to three entropy characters); only an explicit length can be too short
+        length = max(params["length"], len(base) + 8)
+    if length and length > MAX_LENGTH:
+        raise ValueError(f"Length must be at most {MAX_LENGTH}.")
+
+    if rng is None:
+        rng = SeededRNG(seed) if seed is not None else get_rng()
+    stats = {"generated": 0, "leaked": 0, "risky": 0, "risk_scored": 0, "timed_out": False}
+
+    # 1) generate, dedup, length / leak filter -- repeat while short of candidates
+    seen, pool = set(), []
+    while True:
+        batch = _to_strings(_candidate_batch(base, n_candidates, params, length, rng))
+        stats["generated"] += len(batch)
+        for pw in batch:
+            if pw in seen or (length and len(pw) != length):
+                continue
+            seen.add(pw)
+            if leak_table is not None and pw in leak_table:
+                stats["leaked"] += 1
+                continue
+            pool.append(pw)
+        if len(pool) >= top_n or time.perf_counter() > deadline:
+            break
+
+    # 2) rank by classifier P(strong) (falls back to charset entropy)
+    if classifier is not None and pool:
+        strength = classifier.predict_proba(pool)[:, 2]
+    else:
+        strength = np.array([len(set(pw)) / len(pw) for pw in pool])
+    order = np.argsort(-strength, kind="stable")
+
+    # 3) reject high hacker-risk candidates, best first, within the budget
+    accepted = []
+    for i in order:
+        if len(accepted) >= 2 * top_n:
+            break
+        pw = pool[i]
+        if risk_model is None:
+            accepted.append((float(strength[i]), pw))
+            continue
+        if time.perf_counter() > deadline:
+            stats["timed_out"] = True
+            break
+        risk, _ = risk_model.compute_score(pw)
+        stats["risk_scored"] += 1
+        if risk > params["max_risk"]:
+            stats["risky"] += 1
+            continue
+        accepted.append((float(strength[i]) * (1.0 - risk / 100.0), pw))
+
+    ranked = [pw for _, pw in sorted(accepted, key=lambda t: t[0], reverse=True)][:top_n]
+    if not ranked:
+        if stats["timed_out"]:
+            raise TimeoutError(f"No candidate passed risk scoring within {budget_ms:g} ms.")
+        raise ValueError("Could not generate a safe password from this base word.")
+    stats["elapsed_ms"] = round((time.perf_counter() - start) * 1000.0, 2)
+
+    return {
+        "base": base,
+        "mode": mode,
+        "suggestions": ranked,
+        "best_password": ranked[0],
+        "stats": stats,
+    }
+
 # ------------------------------------------------------------
 #  CLI Demo
 # ------------------------------------------------------------
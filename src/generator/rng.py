@@ -0,0 +1,113 @@
+# ============================================================
+# src/generator/rng.py
+# ------------------------------------------------------------
+# Pluggable random source for the password generator.
+# SecureRNG (default) reads os.urandom in bulk into a buffer;
+# SeededRNG is deterministic, for tests and benchmarks only.
+# ============================================================
+
+import os
+import threading
+from typing import Optional, Sequence
+
+import numpy as np
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+_FLOAT_SCALE = 2.0 ** -53
+
+
+class BufferedRNG:
+    """
+    Random source backed by a byte buffer that is refilled in bulk.
+    Subclasses implement _fill(n) -> bytes.
+
+    Scalar helpers follow the `random` module (random, randint, choice);
+    random(size) returns a NumPy array like numpy.random.Generator.random.
+    """
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self._buf = b""
+        self._pos = 0
+        self._lock = threading.Lock()
+
+    def _fill(self, n: int) -> bytes:
+        raise NotImplementedError
+
+    def bytes(self, n: int) -> bytes:
+        """Next n random bytes. Thread-safe: no two callers ever get the same bytes."""
+        with self._lock:
+            if n > self.buffer_size:
+                return self._fill(n)
+            if self._pos + n > len(self._buf):
+                self._buf = self._buf[self._pos:] + self._fill(self.buffer_size)
+                self._pos = 0
+            out = self._buf[self._pos : self._pos + n]
+            self._pos += n
+            return out
+
+    # -------------------------
+    # Floats
+    # -------------------------
+    def random(self, size=None):
+        """Uniform float(s) in [0, 1) with 53 bits of randomness each."""
+        if size is None:
+            return (int.from_bytes(self.bytes(8), "little") >> 11) * _FLOAT_SCALE
+        count = int(np.prod(size))
+        words = np.frombuffer(self.bytes(8 * count), dtype=np.uint64)
+        return ((words >> np.uint64(11)) * _FLOAT_SCALE).reshape(size)
+
+    # -------------------------
+    # Integers / choices (unbiased, rejection sampling)
+    # -------------------------
+    def randbelow(self, n: int) -> int:
+        """Uniform int in [0, n)."""
+        if n <= 0:
+            raise ValueError("n must be positive")
+        k = n.bit_length()
+        nbytes = (k + 7) // 8
+        while True:
+            r = int.from_bytes(self.bytes(nbytes), "little") >> (8 * nbytes - k)
+            if r < n:
+                return r
+
+    def randint(self, a: int, b: int) -> int:
+        """Uniform int in [a, b], both ends included."""
+        return a + self.randbelow(b - a + 1)
+
+    def choice(self, seq: Sequence):
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[self.randbelow(len(seq))]
+
+
+class SecureRNG(BufferedRNG):
+    """Cryptographically secure source (os.urandom, same as `secrets`)."""
+
+    def _fill(self, n: int) -> bytes:
+        return os.urandom(n)
+
+
+class SeededRNG(BufferedRNG):
+    """Deterministic source for tests and benchmarks. Never use for real passwords."""
+
+    def __init__(self, seed: int, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        super().__init__(buffer_size)
+        self._gen = np.random.Generator(np.random.PCG64(seed))
+
+    def _fill(self, n: int) -> bytes:
+        return self._gen.bytes(n)
+
+
+_default_rng: BufferedRNG = SecureRNG()
+
+
+def get_rng() -> BufferedRNG:
+    """Process-wide default source (SecureRNG unless replaced with set_rng)."""
+    return _default_rng
+
+
+def set_rng(rng: Optional[BufferedRNG]) -> None:
+    """Replace the default source (e.g. SeededRNG in tests); None restores SecureRNG."""
+    global _default_rng
+    _default_rng = rng if rng is not None else SecureRNG()
@@ -1,18 +1,21 @@
 # src/inference/anomaly_detector.py
 
-import torch
-import numpy as np
-from src.models.anomaly_model import PasswordAutoencoder
-
-def anomaly_score(features, model_path, threshold=0.015):
-    model = PasswordAutoencoder(input_dim=len(features))
-    model.load_state_dict(torch.load(model_path))
-    model.eval()
-
-    x = torch.FloatTensor(features).unsqueeze(0)
-    with torch.no_grad():
-        reconstructed = model(x)
-    mse = torch.mean((x - reconstructed) ** 2).item()
+from functools import lru_cache
+
+from src.config import MODEL_C_PATH
+
+
+@lru_cache(maxsize=None)
+def get_model(model_path=MODEL_C_PATH):
+    """Single cached Model C instance per checkpoint path (torch is imported on first call)."""
+    from src.models.anomaly_model import PasswordAutoencoder
+
+    return PasswordAutoencoder.load(model_path)
+
+
+def anomaly_score(features, model_path=MODEL_C_PATH, threshold=0.015):
+    """features: one row of features_matrix (NUMERIC_FEATURES order)."""
+    mse = float(get_model(model_path).reconstruction_error(features)[0])
 
     if mse > threshold:
         return {"status": "Anomalous (weak/unusual)", "score": mse}
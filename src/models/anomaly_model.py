@@ -1,10 +1,19 @@
 # src/models/anomaly_model.py
 
+import numpy as np
 import torch
 import torch.nn as nn
 
+from src.features.extractors import NUMERIC_FEATURES
+
+
 class PasswordAutoencoder(nn.Module):
-    def __init__(self, input_dim):
+    """
+    Model C: dense autoencoder over the numeric feature matrix of extract_features.
+    Feature normalization stats live in buffers, so they are saved with the weights.
+    """
+
+    def __init__(self, input_dim=len(NUMERIC_FEATURES)):
         super(PasswordAutoencoder, self).__init__()
         self.encoder = nn.Sequential(
             nn.Linear(input_dim, 16),
@@ -17,8 +26,58 @@ class PasswordAutoencoder(nn.Module):
             nn.ReLU(),
             nn.Linear(16, input_dim)
         )
+        self.register_buffer("feature_mean", torch.zeros(input_dim))
+        self.register_buffer("feature_std", torch.ones(input_dim))
 
     def forward(self, x):
         encoded = self.encoder(x)
         decoded = self.decoder(encoded)
         return decoded
+
+    # -------------------------
+    # Normalization
+    # -------------------------
+    def set_normalization(self, X):
+        """Fit per-column mean/std from a feature matrix (N, input_dim)."""
+        X = torch.as_tensor(np.asarray(X, dtype=np.float32))
+        self.feature_mean.copy_(X.mean(dim=0))
+        self.feature_std.copy_(X.std(dim=0).clamp_min(1e-6))
+        return self
+
+    def normalize(self, x):
+        return (x - self.feature_mean) / self.feature_std
+
+    # -------------------------
+    # Scoring
+    # -------------------------
+    def reconstruction_error(self, X):
+        """
+        Per-row MSE in normalized feature space.
+        X: feature matrix (N, input_dim) from features_matrix, or a single row.
+        Returns np.ndarray of shape (N,).
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        with torch.no_grad():
+            x = self.normalize(torch.from_numpy(X))
+            recon = self(x)
+            mse = torch.mean((x - recon) ** 2, dim=1)
+        return mse.numpy()
+
+    # -------------------------
+    # Save / load
+    # -------------------------
+    def save(self, path):
+        torch.save(self.state_dict(), path)
+
+    @classmethod
+    def load(cls, path):
+        """Load weights (+ stats). Checkpoints saved before the stats existed load with identity stats."""
+        state = torch.load(path, map_location="cpu")
+        model = cls(input_dim=state["encoder.0.weight"].shape[1])
+        missing, unexpected = model.load_state_dict(state, strict=False)
+        if unexpected or set(missing) - {"feature_mean", "feature_std"}:
+            raise RuntimeError(f"Incompatible Model C checkpoint: missing={missing}, unexpected={unexpected}")
+        model.eval()
+        return model
@@ -1,7 +1,7 @@
-import joblib
 import numpy as np
-import pandas as pd
-from src.features.extractors import extract_features
+from src.features.extractors import features_matrix
+
+LABELS = {0: "weak", 1: "medium", 2: "strong"}
 
 class PasswordClassifier:
     def __init__(self, model):
@@ -9,38 +9,43 @@ class PasswordClassifier:
 
     @classmethod
     def load(cls, path):
+        import joblib  # deferred: unpickling pulls in lightgbm / sklearn anyway
+
         model = joblib.load(path)
         return cls(model)
 
-    def predict(self, password):
-        feat_dict = extract_features(password)
-        # Match training process: np.array([extract_features(pw) for pw in passwords])
-        # When sklearn receives object array of dicts, it converts to DataFrame
-        # and then to numpy. String columns might be encoded or processed.
-        
-        # Create DataFrame from dict (matching sklearn's internal conversion)
-        df = pd.DataFrame([feat_dict])
-        
-        # Get numeric features in the order they appear in extract_features
-        numeric_cols = ['length', 'upper', 'lower', 'digits', 'special', 
-                       'diversity', 'entropy', 'sequence_score']
-        X_numeric = df[numeric_cols].values
-        
+    @property
+    def n_features(self):
+        # LGBMClassifier (in-memory training) or a raw Booster (streaming training)
+        if hasattr(self.model, "n_features_"):
+            return self.model.n_features_
+        return self.model.num_feature()
+
+    def _model_input(self, X):
+        """Pad/truncate the numeric feature matrix (NUMERIC_FEATURES order) to the model's width."""
+        n_features = self.n_features
         # If model expects more features than we have, pad with zeros
         # This handles cases where the model was trained with additional features
-        if X_numeric.shape[1] < self.model.n_features_:
-            # Pad with zeros to match expected feature count
-            padding = np.zeros((1, self.model.n_features_ - X_numeric.shape[1]))
-            X = np.hstack([X_numeric, padding])
-        elif X_numeric.shape[1] > self.model.n_features_:
-            # If we have more features, take only the first n_features_
-            X = X_numeric[:, :self.model.n_features_]
-        else:
-            X = X_numeric
-            
-        feats = X.reshape(1, -1)
-        pred = self.model.predict(feats)[0]
-        probs = self.model.predict_proba(feats)[0]
+        if X.shape[1] < n_features:
+            padding = np.zeros((X.shape[0], n_features - X.shape[1]))
+            return np.hstack([X, padding])
+        # If we have more features, take only the first n_features_
+        return X[:, :n_features]
+
+    def predict_proba(self, passwords):
+        """Class probabilities (N, 3) for a batch of passwords, columns weak/medium/strong."""
+        return self.predict_proba_features(features_matrix(passwords))
+
+    def predict_proba_features(self, X):
+        """Same as predict_proba, from a precomputed features_matrix."""
+        X = self._model_input(np.asarray(X, dtype=np.float64))
+        if hasattr(self.model, "predict_proba"):
+            return self.model.predict_proba(X)
+        return self.model.predict(X)
+
+    def predict(self, password):
+        probs = self.predict_proba([password])[0]
+        pred = int(np.argmax(probs))
         conf = max(probs)
-        label = {0: "weak", 1: "medium", 2: "strong"}[pred]
+        label = LABELS[pred]
         return label, conf
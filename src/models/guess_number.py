@@ -0,0 +1,151 @@
+# src/models/guess_number.py
+import bisect
+import math
+import random
+from collections import defaultdict
+
+import numpy as np
+
+START, END = "<", ">"
+MAX_LOG_GUESSES = 700.0  # keep guess_number a finite float
+
+
+class GuessNumberEstimator:
+    """
+    Monte-Carlo guess-number estimate (Dell'Amico & Filippone, CCS 2015) on top of the
+    char n-gram counts collected by HackerRiskModel.build_from_leaks.
+
+    The n-gram counts define a Markov model with add-alpha smoothing,
+        P(x | ctx) = (c(ctx, x) + alpha) / (c(ctx) + alpha * |V|),
+    over "<password>" strings. build_table() samples n passwords from it, and for a
+    password of probability p the estimated number of guesses an attacker enumerating
+    in probability order needs is
+        G(p) = sum over samples i with p_i > p of 1 / (n * p_i).
+    The samples' -log p (sorted) and log G at each position are stored, so a query costs
+    one LM probability plus a binary search.
+    """
+
+    def __init__(self, ngram_counts, ngram_n=3, alpha=0.01):
+        self.ngram_n = ngram_n
+        self.alpha = alpha
+        self.next_counts = defaultdict(dict)  # context -> {next char: count}
+        for gram, count in ngram_counts.items():
+            if len(gram) != ngram_n:
+                continue
+            self._add(gram[:-1], gram[-1], count)
+            if gram[0] == START:  # shorter contexts at the start of a password
+                for k in range(1, ngram_n - 1):
+                    self._add(gram[:k], gram[k], count)
+        self.context_totals = {ctx: sum(nxt.values()) for ctx, nxt in self.next_counts.items()}
+        self.vocab = sorted({ch for nxt in self.next_counts.values() for ch in nxt})
+        self._sampling = {}
+        self.neg_logp = None   # sorted -log p of the Monte-Carlo sample
+        self.log_rank = None   # log G at each position of neg_logp
+
+    def _add(self, ctx, ch, count):
+        self.next_counts[ctx][ch] = self.next_counts[ctx].get(ch, 0) + count
+
+    @classmethod
+    def from_hacker_risk(cls, model, alpha=0.01):
+        return cls(model.ngram_counts, ngram_n=model.ngram_n, alpha=alpha)
+
+    # -------------------------
+    # Markov model
+    # -------------------------
+    def _context(self, s, i):
+        return s[max(0, i - (self.ngram_n - 1)):i]
+
+    def _logp(self, ctx, ch):
+        nxt = self.next_counts.get(ctx)
+        if nxt is None:
+            return -math.log(len(self.vocab))
+        return math.log((nxt.get(ch, 0) + self.alpha) / (self.context_totals[ctx] + self.alpha * len(self.vocab)))
+
+    def logprob(self, password):
+        """Natural log-probability of the password (including its end marker) under the model."""
+        s = START + password + END
+        return sum(self._logp(self._context(s, i), s[i]) for i in range(1, len(s)))
+
+    def _sampler(self, ctx):
+        table = self._sampling.get(ctx)
+        if table is None:
+            nxt = self.next_counts.get(ctx, {})
+            chars = list(nxt)
+            table = (chars, list(np.cumsum([nxt[c] for c in chars])), self.context_totals.get(ctx, 0))
+            self._sampling[ctx] = table
+        return table
+
+    def sample(self, n, seed=0, max_len=64):
+        """
+        -log p of n passwords drawn from the smoothed model. The smoothed distribution is
+        sampled as a mixture: an observed continuation with probability c(ctx) / (c(ctx) + alpha|V|),
+        otherwise a uniform character from the vocabulary. Draws longer than max_len are redrawn.
+        """
+        rnd = random.Random(seed)
+        smooth = self.alpha * len(self.vocab)
+        out = np.empty(n, dtype=np.float64)
+        i = 0
+        while i < n:
+            s, lp = START, 0.0
+            while len(s) <= max_len + 1:
+                ctx = self._context(s, len(s))
+                chars, cum, total = self._sampler(ctx)
+                r = rnd.random() * (total + smooth)
+                ch = chars[bisect.bisect_right(cum, r)] if r < total else rnd.choice(self.vocab)
+                lp += self._logp(ctx, ch)
+                s += ch
+                if ch == END:
+                    out[i] = -lp
+                    i += 1
+                    break
+        return out
+
+    # -------------------------
+    # Rank table
+    # -------------------------
+    def build_table(self, n_samples=100_000, seed=0):
+        neg_logp = np.sort(self.sample(n_samples, seed=seed))
+        # G at position k = sum_{i<k} 1 / (n p_i), accumulated in log space (1/p_i overflows)
+        terms = neg_logp - math.log(n_samples)
+        self.log_rank = np.concatenate([[-np.inf], np.logaddexp.accumulate(terms)])
+        self.neg_logp = neg_logp
+        return self
+
+    def _log_guesses(self, password):
+        k = int(np.searchsorted(self.neg_logp, -self.logprob(password), side="left"))
+        return max(0.0, float(self.log_rank[k]))
+
+    def guess_number(self, password):
+        """Estimated guesses before an attacker using this model reaches the password (>= 1)."""
+        return math.exp(min(self._log_guesses(password), MAX_LOG_GUESSES))
+
+    def log10_guess_number(self, password):
+        return self._log_guesses(password) / math.log(10)
+
+    # -------------------------
+    # Save / load (.npz)
+    # -------------------------
+    def save(self, path):
+        grams, counts = [], []
+        for ctx, nxt in self.next_counts.items():
+            if len(ctx) == self.ngram_n - 1:  # start contexts are rebuilt on load
+                for ch, c in nxt.items():
+                    grams.append(ctx + ch)
+                    counts.append(c)
+        np.savez_compressed(
+            path,
+            neg_logp=self.neg_logp,
+            log_rank=self.log_rank,
+            grams=np.array(grams, dtype=f"<U{self.ngram_n}"),
+            counts=np.array(counts, dtype=np.int64),
+            params=np.array([self.ngram_n, self.alpha], dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            ngram_n, alpha = data["params"]
+            m = cls(dict(zip(data["grams"].tolist(), data["counts"].tolist())), int(ngram_n), float(alpha))
+            m.neg_logp = data["neg_logp"]
+            m.log_rank = data["log_rank"]
+        return m
@@ -5,6 +5,7 @@ import pickle
 from collections import Counter, defaultdict
 import numpy as np
 from rapidfuzz.distance import Levenshtein
+from src.data.corpus import iter_line_batches
 
 # Helper: safe log
 def _safe_log(x):
@@ -40,12 +41,8 @@ class HackerRiskModel:
         if not self.leak_path:
             raise ValueError("leak_path not set")
 
-        with open(self.leak_path, "r", encoding="utf-8", errors="ignore") as f:
-            for line in f:
-                pw = line.rstrip("\n")
-                if pw == "":
-                    continue
-                self.freq[pw] += 1
+        for lines in iter_line_batches(self.leak_path):
+            self.freq.update(pw for pw in lines if pw != "")
 
         self.total = sum(self.freq.values())
         self.unique_count = len(self.freq)
@@ -1,18 +1,21 @@
 import math
-import torch
 from src.config import LEAK_PATH
+from src.data.corpus import iter_line_batches
 
 class LeakRiskScorer:
     def __init__(self, freq_table=None):
         self.freq_table = freq_table or self._load_leak_table()
 
     def _load_leak_table(self):
+        # Rank = line number in the (possibly compressed) dump, blank lines included
         freq = {}
-        with open(LEAK_PATH, "r", encoding="utf-8", errors="ignore") as f:
-            for i, line in enumerate(f):
+        i = 0
+        for lines in iter_line_batches(LEAK_PATH):
+            for line in lines:
+                i += 1
                 pw = line.strip()
                 if pw:
-                    freq[pw] = i + 1
+                    freq[pw] = i
         return freq
 
     def score(self, password):
@@ -0,0 +1,49 @@
+# src/models/student_model.py
+import joblib
+import numpy as np
+
+
+class StudentModel:
+    """
+    Distilled stand-in for the fused verdict of the full stack (FusionModel over Model A,
+    the leak score and the Model C autoencoder), trained by src/train/distill_ensemble.py.
+    One small GBDT maps [features_matrix, Model A probabilities, leak score / 100] -- all
+    cheap to get -- to the fused risk score (0..100).
+
+    Used by the API as a pre-filter: rows whose predicted risk is at least `margin`
+    points away from every label cutoff take the student's verdict; the rest go through
+    the full stack (autoencoder, patterns, guess number).
+    """
+
+    def __init__(self, regressor, cutoffs=(40.0, 70.0), margin=5.0, teacher=None):
+        self.regressor = regressor
+        self.cutoffs = tuple(float(c) for c in cutoffs)
+        self.margin = float(margin)
+        self.teacher = teacher  # FusionModel.to_dict() it was distilled from
+
+    @staticmethod
+    def design(X, probs, leak):
+        """Student inputs (N, n_features + 4)."""
+        return np.hstack([
+            np.asarray(X, dtype=np.float64),
+            np.asarray(probs, dtype=np.float64).reshape(-1, 3),
+            np.asarray(leak, dtype=np.float64).reshape(-1, 1) / 100.0,
+        ])
+
+    def predict_risk(self, X, probs, leak):
+        """Estimated fused risk score (N,) on the 0..100 scale."""
+        return np.clip(self.regressor.predict(self.design(X, probs, leak)), 0.0, 100.0)
+
+    def confident(self, risk, margin=None):
+        """True where the estimate is at least `margin` risk points from every label cutoff."""
+        margin = self.margin if margin is None else margin
+        gap = np.abs(np.asarray(risk)[:, None] - np.asarray(self.cutoffs)[None, :]).min(axis=1)
+        return gap >= margin
+
+    def save(self, path):
+        joblib.dump({"regressor": self.regressor, "cutoffs": self.cutoffs, "margin": self.margin,
+                     "teacher": self.teacher}, path)
+
+    @classmethod
+    def load(cls, path):
+        return cls(**joblib.load(path))
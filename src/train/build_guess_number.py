@@ -0,0 +1,38 @@
+# src/train/build_guess_number.py
+# Monte-Carlo guess-number table from the hacker-risk n-gram counts.
+#   python -m src.train.build_guess_number --samples 1000000
+import argparse
+import os
+import time
+
+from src.models.hacker_risk import HackerRiskModel
+from src.models.guess_number import GuessNumberEstimator
+from src.config import MODEL_B_PATH, GUESS_NUMBER_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the guess-number rank table")
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--alpha", type=float, default=0.01, help="add-alpha smoothing")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=GUESS_NUMBER_PATH)
+    args = parser.parse_args()
+
+    print(f"[INFO] Loading hacker-risk model from {MODEL_B_PATH}...")
+    estimator = GuessNumberEstimator.from_hacker_risk(HackerRiskModel.load(MODEL_B_PATH), alpha=args.alpha)
+    print(f"[INFO] Sampling {args.samples:,} passwords "
+          f"({len(estimator.next_counts):,} contexts, vocab {len(estimator.vocab)})...")
+    start = time.perf_counter()
+    estimator.build_table(args.samples, seed=args.seed)
+    print(f"[INFO] Sampled in {time.perf_counter() - start:.1f}s")
+
+    for pw in ["123456", "password1", "Summer2024!", "correct horse battery staple"]:
+        print(f"[INFO] {pw:30} ~10^{estimator.log10_guess_number(pw):.1f} guesses")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    estimator.save(args.output)
+    print(f"[✅] Guess-number table saved -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# ============================================================
+# src/train/distill_ensemble.py
+# ------------------------------------------------------------
+# Distills the ensemble's fused verdict into a StudentModel.
+#   1. Score a corpus offline with the serving stack: Model A,
+#      the leak score, the Model C autoencoder and FusionModel
+#      (models/fusion_calibration.json, or the default weights)
+#   2. Fit a small GBDT from the cheap inputs (features, Model A
+#      probabilities, leak score) to the fused risk score
+#   3. Pick the confidence margin: the smallest one whose
+#      confident hold-out rows agree with the fused label at
+#      least --target-agreement of the time
+# The API loads the student as a pre-filter (backend/app.py).
+#
+# The teacher is what /evaluate actually returns, not the
+# HackerRiskModel.compute_score / detector.score_password scores
+# the work order named: /evaluate fuses Model A with the leak
+# score (LeakRiskScorer) and the Model C autoencoder through
+# FusionModel (the batch form of combine_scores) and uses
+# neither of those two. A student that reproduced them could
+# not stand in for the served verdict on confident rows.
+#
+#   python -m src.train.distill_ensemble --samples 500000
+# ============================================================
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from lightgbm import LGBMRegressor
+
+# Local imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from backend.ensemble import FusionModel
+from src.data.dataset import ensure_dataset, load_dataset, feature_matrix
+from src.features.extractors import NUMERIC_FEATURES
+from src.inference.anomaly_detector import get_model as get_model_c
+from src.models.classifier_model import PasswordClassifier
+from src.models.leak_model import LeakRiskScorer
+from src.models.student_model import StudentModel
+from src.config import LABELED_PATH, LABELED_DATASET_DIR, MODEL_A_PATH, FUSION_PATH, STUDENT_PATH
+
+MARGINS = [1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 20.0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill the fused ensemble verdict into a StudentModel")
+    parser.add_argument("--samples", type=int, default=500_000)
+    parser.add_argument("--target-agreement", type=float, default=0.995,
+                        help="label agreement required on rows the student answers alone")
+    parser.add_argument("--margin", type=float, help="fixed confidence margin (risk points) instead")
+    parser.add_argument("--output", default=STUDENT_PATH)
+    args = parser.parse_args()
+
+    # ============================================================
+    # 1. Corpus (+ precomputed features)
+    # ============================================================
+    data_dir = ensure_dataset(LABELED_PATH, LABELED_DATASET_DIR)
+    df = load_dataset(data_dir, columns=["password"] + NUMERIC_FEATURES)
+    if len(df) > args.samples:
+        df = df.sample(n=args.samples, random_state=42).reset_index(drop=True)
+    X = feature_matrix(df)
+    print(f"[INFO] Distillation corpus: {len(df):,} passwords")
+
+    # ============================================================
+    # 2. Teacher: the fused verdict, as served
+    # ============================================================
+    t0 = time.perf_counter()
+    probs = PasswordClassifier.load(MODEL_A_PATH).predict_proba_features(X)
+    scorer = LeakRiskScorer()
+    leak = np.array([scorer.score(pw) for pw in df["password"]], dtype=np.float64)
+    anomaly = get_model_c().reconstruction_error(X)
+    fusion = FusionModel.load_or_default(FUSION_PATH)
+    fused = fusion.fuse(probs, leak, anomaly)
+    teacher_risk = fused["risk_score"]
+    print(f"[INFO] Teacher scored {len(df):,} passwords in {time.perf_counter() - t0:.1f}s")
+
+    # ============================================================
+    # 3. Fit the student (80/20 split)
+    # ============================================================
+    rng = np.random.default_rng(42)
+    te = rng.random(len(df)) < 0.2
+    tr = ~te
+    print("[INFO] Training student model...")
+    student = StudentModel(
+        LGBMRegressor(n_estimators=150, num_leaves=15, learning_rate=0.1, random_state=42, verbose=-1),
+        cutoffs=fusion.cutoffs,
+        teacher=fusion.to_dict(),
+    )
+    student.regressor.fit(StudentModel.design(X[tr], probs[tr], leak[tr]), teacher_risk[tr])
+
+    # ============================================================
+    # 4. Agreement with the teacher on the hold-out, per margin
+    # ============================================================
+    t0 = time.perf_counter()
+    risk = student.predict_risk(X[te], probs[te], leak[te])
+    per_student = (time.perf_counter() - t0) / max(1, te.sum()) * 1e6
+    agree = fusion.labels(risk) == fused["final_label"][te]
+    print(f"[INFO] Risk MAE: {np.mean(np.abs(risk - teacher_risk[te])):.3f}  "
+          f"label agreement (all rows): {agree.mean():.4f}  cost: {per_student:.2f}µs/password")
+    print(f"\n{'margin':>7} {'answered alone':>15} {'agreement':>10}")
+    chosen = args.margin
+    for margin in MARGINS:
+        ok = student.confident(risk, margin)
+        agreement = float(agree[ok].mean()) if ok.any() else 1.0
+        print(f"{margin:7.1f} {ok.mean():15.2%} {agreement:10.4f}")
+        if args.margin is None and chosen is None and agreement >= args.target_agreement:
+            chosen = margin
+    if chosen is None:
+        chosen = MARGINS[-1]
+        print(f"[WARN] No margin reaches {args.target_agreement}; using {chosen}")
+    student.margin = chosen
+    ok = student.confident(risk)
+    print(f"\n[INFO] Margin {chosen}: {ok.mean():.2%} of rows skip the full stack "
+          f"(label agreement {agree[ok].mean() if ok.any() else 1.0:.4f})")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    student.save(args.output)
+    print(f"[✅] Student model saved -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
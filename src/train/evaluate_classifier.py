@@ -0,0 +1,39 @@
+# ============================================================
+# src/train/evaluate_classifier.py
+# ------------------------------------------------------------
+# Evaluates the saved classifier (Model A) on the held-out split
+# of the cached feature matrix -- no feature extraction needed.
+# ============================================================
+
+import os
+import sys
+import numpy as np
+from sklearn.metrics import classification_report, confusion_matrix
+
+# Local imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from src.features.store import load_features
+from src.models.classifier_model import PasswordClassifier
+from src.config import LABELED_PATH, MODEL_A_PATH
+from src.train.split import train_test_indices
+
+
+def main():
+    features = load_features(LABELED_PATH)
+    y = features.y.astype(int)
+
+    # Same hold-out as train_classifier.py (both modes)
+    _, test_rows = train_test_indices(len(y))
+    X_test, y_test = features.X[test_rows], y[test_rows]
+
+    clf = PasswordClassifier.load(MODEL_A_PATH)
+    preds = np.argmax(clf.predict_proba_features(X_test), axis=1)
+
+    print("\n[INFO] Classification Report:")
+    print(classification_report(y_test, preds, digits=3))
+    print("\n[INFO] Confusion Matrix:")
+    print(confusion_matrix(y_test, preds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# ============================================================
+# src/train/fit_fusion.py
+# ------------------------------------------------------------
+# Fits the score-fusion stage (backend/ensemble.FusionModel):
+# learned weights over [classifier probs, leak score, anomaly]
+# plus Platt or isotonic calibration, on the classifier's
+# hold-out rows (the shared split in src/train/split.py, over
+# the feature store rows Model A was trained from). The
+# target is the ordinal "weakness" of the true label
+# (weak=1, medium=0.5, strong=0), so the fused risk is an
+# expected weakness on a 0..100 scale.
+# Writes models/fusion_calibration.json.
+#
+#   python -m src.train.fit_fusion [--method isotonic]
+# ============================================================
+
+import argparse
+import os
+import sys
+import numpy as np
+from scipy.optimize import minimize
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import Ridge
+from sklearn.metrics import classification_report, mean_squared_error
+
+# Local imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from backend.ensemble import FusionModel, LABEL_NAMES
+from src.data.dataset import ensure_dataset, load_dataset
+from src.features.store import load_features
+from src.inference.anomaly_detector import get_model as get_model_c
+from src.models.classifier_model import PasswordClassifier
+from src.models.leak_model import LeakRiskScorer
+from src.train.split import train_test_indices
+from src.config import LABELED_PATH, LABELED_DATASET_DIR, MODEL_A_PATH, FUSION_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit fusion weights + calibration")
+    parser.add_argument("--method", choices=["platt", "isotonic"], default="platt")
+    parser.add_argument("--samples", type=int, default=200_000)
+    args = parser.parse_args()
+
+    # Hold-out rows only: the classifier has not seen them (either training mode).
+    # Features come from the same store as training; passwords from the dataset it was built from.
+    features = load_features(LABELED_PATH)
+    data_dir = ensure_dataset(LABELED_PATH, LABELED_DATASET_DIR)
+    df = load_dataset(data_dir, columns=["password", "strength"])
+    if len(df) != len(features.y):
+        raise RuntimeError(f"Dataset has {len(df):,} rows but the feature store {len(features.y):,}; "
+                           "rebuild the features (python -m src.train.train_classifier)")
+    _, rows = train_test_indices(len(df))
+    if len(rows) > args.samples:
+        rows = np.sort(np.random.default_rng(42).choice(rows, args.samples, replace=False))
+    df = df.iloc[rows]
+    if not np.array_equal(df["strength"].to_numpy(), np.asarray(features.y[rows])):
+        raise RuntimeError("Dataset and feature store rows are not aligned; rebuild the features")
+    print(f"[INFO] Fitting fusion on {len(df):,} hold-out passwords")
+
+    X = np.asarray(features.X[rows])
+    probs = PasswordClassifier.load(MODEL_A_PATH).predict_proba_features(X)
+    scorer = LeakRiskScorer()
+    leak = np.array([scorer.score(pw) for pw in df["password"]], dtype=np.float64)
+    anomaly = get_model_c().reconstruction_error(X)
+
+    z = FusionModel.stack(probs, leak, anomaly)
+    target = 1.0 - df["strength"].to_numpy().astype(np.float64) / 2.0
+
+    # Learned weights (linear), then a monotone calibration of the linear score
+    reg = Ridge(alpha=1.0).fit(z, target)
+    lin = z @ reg.coef_ + reg.intercept_
+    if args.method == "isotonic":
+        iso = IsotonicRegression(out_of_bounds="clip", y_min=0.0, y_max=1.0).fit(lin, target)
+        weights, bias = reg.coef_, float(reg.intercept_)
+        calibration = {"type": "isotonic",
+                       "x": iso.X_thresholds_.tolist(), "y": iso.y_thresholds_.tolist()}
+    else:
+        # Platt scaling with soft targets: sigmoid(a * lin + c), fitted by cross-entropy
+        def nll(ac):
+            p = np.clip(1.0 / (1.0 + np.exp(-(ac[0] * lin + ac[1]))), 1e-9, 1 - 1e-9)
+            return -np.mean(target * np.log(p) + (1 - target) * np.log(1 - p))
+        a, c = minimize(nll, x0=[4.0, -2.0], method="L-BFGS-B").x
+        weights, bias = a * reg.coef_, float(a * reg.intercept_ + c)
+        calibration = {"type": "platt"}
+
+    fusion = FusionModel(weights, bias, calibration)
+    out = fusion.fuse(probs, leak, anomaly)
+    truth = LABEL_NAMES[df["strength"].to_numpy().astype(int)]
+    print(f"[INFO] Weights: {dict(zip(FusionModel.FEATURES, np.round(weights, 3)))} bias={bias:.3f}")
+    print(f"[INFO] MSE vs ordinal target: {mean_squared_error(target, out['risk_score'] / 100.0):.4f}")
+    print(classification_report(truth, out["final_label"], digits=3, zero_division=0))
+
+    fusion.save(FUSION_PATH)
+    print(f"[✅] Fusion calibration saved -> {FUSION_PATH}")
+
+
+if __name__ == "__main__":
+    main()
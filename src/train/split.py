@@ -0,0 +1,31 @@
+# ============================================================
+# src/train/split.py
+# ------------------------------------------------------------
+# The train/test split shared by every Model A script: a row
+# is held out iff the splitmix64 hash of its index (in the
+# feature store's row order) lands in the first TEST_PERCENT
+# of 100 buckets. It depends only on the row index, so the
+# in-memory trainer, the streaming trainer (chunk by chunk),
+# evaluation, the sweep and fusion fitting all agree on which
+# rows the classifier never saw.
+# ============================================================
+
+import numpy as np
+
+TEST_PERCENT = 20
+
+
+def holdout_mask(start, n, percent=TEST_PERCENT, seed=42):
+    """Deterministic ~percent% hold-out of rows start..start+n by hashing row indices (splitmix64)."""
+    with np.errstate(over="ignore"):
+        z = np.arange(start, start + n, dtype=np.uint64) + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return (z % np.uint64(100)) < percent
+
+
+def train_test_indices(n):
+    """(train_rows, test_rows) of an n-row feature matrix."""
+    is_test = holdout_mask(0, n)
+    return np.flatnonzero(~is_test), np.flatnonzero(is_test)
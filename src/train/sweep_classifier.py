@@ -0,0 +1,175 @@
+# ============================================================
+# src/train/sweep_classifier.py
+# ------------------------------------------------------------
+# Hyperparameter sweep for the classifier (Model A).
+# Trials run in a process pool on the cached feature matrix,
+# each with a bounded LightGBM thread count and early stopping
+# on a validation split. Configurations are ranked by macro-F1
+# and measured inference latency; the smallest, fastest model
+# within --f1-tolerance of the best F1 is selected. Trials see
+# a subsample of the rows outside the shared hold-out
+# (src/train/split.py), so --save-best retrains the selection
+# on the full training split before replacing Model A.
+#
+#   python -m src.train.sweep_classifier --workers 4 [--save-best]
+# ============================================================
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import lightgbm as lgb
+from sklearn.metrics import f1_score
+
+# Local imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from src.features.store import load_features
+from src.train.split import holdout_mask
+from src.train.train_classifier import LGB_PARAMS, balanced_weights, train_streaming
+from src.config import LABELED_PATH, MODEL_A_PATH, MODEL_DIR
+
+RESULTS_PATH = os.path.join(MODEL_DIR, "sweep_results.json")
+
+GRID = {
+    "num_leaves": [15, 25, 63],
+    "max_depth": [4, 6, -1],
+    "learning_rate": [0.05, 0.1],
+    "min_data_in_leaf": [20, 200],
+}
+MAX_ROUNDS = 1000
+EARLY_STOPPING = 30
+
+_DATA = {}
+
+
+def _init_worker(split_dir):
+    """Open the sweep splits once per worker process (memory-mapped)."""
+    for name in ("X_train", "y_train", "w_train", "X_val", "y_val"):
+        _DATA[name] = np.load(os.path.join(split_dir, f"{name}.npy"), mmap_mode="r")
+
+
+def run_trial(trial_id, overrides, n_jobs):
+    params = dict(LGB_PARAMS, **overrides, num_threads=n_jobs)
+    train_set = lgb.Dataset(_DATA["X_train"], label=_DATA["y_train"], weight=_DATA["w_train"])
+    val_set = lgb.Dataset(_DATA["X_val"], label=_DATA["y_val"], reference=train_set)
+
+    start = time.perf_counter()
+    booster = lgb.train(
+        params, train_set, num_boost_round=MAX_ROUNDS, valid_sets=[val_set],
+        callbacks=[lgb.early_stopping(EARLY_STOPPING, verbose=False)],
+    )
+    fit_seconds = time.perf_counter() - start
+
+    preds = np.argmax(booster.predict(_DATA["X_val"], num_iteration=booster.best_iteration), axis=1)
+    return {
+        "trial": trial_id,
+        "params": overrides,
+        "best_iteration": int(booster.best_iteration),
+        "macro_f1": float(f1_score(_DATA["y_val"], preds, average="macro")),
+        "fit_seconds": round(fit_seconds, 2),
+        "model": booster.model_to_string(num_iteration=booster.best_iteration),
+    }
+
+
+def measure_latency(booster, X, n_single=300, batch_rows=10_000):
+    """Median single-row latency (µs) and batch cost per row (µs), one thread."""
+    single = []
+    for i in range(n_single):
+        row = X[i % len(X)].reshape(1, -1)
+        t = time.perf_counter()
+        booster.predict(row, num_threads=1)
+        single.append(time.perf_counter() - t)
+    batch = np.asarray(X[:batch_rows])
+    t = time.perf_counter()
+    booster.predict(batch, num_threads=1)
+    per_row_batch = (time.perf_counter() - t) / len(batch)
+    return float(np.median(single) * 1e6), float(per_row_batch * 1e6)
+
+
+def _make_splits(features, split_dir, max_rows, val_percent=20):
+    """Subsample the training rows (outside the shared hold-out) into train/val."""
+    n = len(features.y)
+    train_rows = np.flatnonzero(~holdout_mask(0, n))
+    rng = np.random.default_rng(42)
+    if len(train_rows) > max_rows:
+        train_rows = np.sort(rng.choice(train_rows, max_rows, replace=False))
+    is_val = holdout_mask(0, len(train_rows), percent=val_percent, seed=7)
+    X = np.asarray(features.X[train_rows])
+    y = np.asarray(features.y[train_rows]).astype(np.int64)
+    os.makedirs(split_dir, exist_ok=True)
+    w = balanced_weights(y[~is_val])[y[~is_val]]
+    for name, arr in (("X_train", X[~is_val]), ("y_train", y[~is_val]), ("w_train", w),
+                      ("X_val", X[is_val]), ("y_val", y[is_val])):
+        np.save(os.path.join(split_dir, f"{name}.npy"), arr)
+    return X[is_val]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter sweep for Model A")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--max-rows", type=int, default=2_000_000)
+    parser.add_argument("--f1-tolerance", type=float, default=0.005)
+    parser.add_argument("--save-best", action="store_true",
+                        help=f"retrain the selected params on the full training split and save to {MODEL_A_PATH}")
+    args = parser.parse_args()
+
+    features = load_features(LABELED_PATH)
+    split_dir = os.path.join(features.path, "sweep")
+    X_val = _make_splits(features, split_dir, args.max_rows)
+
+    # Bound LightGBM threads per trial so workers x threads <= cores
+    n_jobs = max(1, (os.cpu_count() or 1) // args.workers)
+    trials = [dict(zip(GRID, values)) for values in itertools.product(*GRID.values())]
+    print(f"[INFO] {len(trials)} trials, {args.workers} workers x {n_jobs} threads")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(split_dir,)) as ex:
+        futures = [ex.submit(run_trial, i, t, n_jobs) for i, t in enumerate(trials)]
+        for fut in as_completed(futures):
+            r = fut.result()
+            results.append(r)
+            print(f"[INFO] trial {r['trial']:3d}: macro-F1={r['macro_f1']:.4f} "
+                  f"iters={r['best_iteration']} {r['params']}")
+
+    # Latency is measured here, sequentially, so trials don't disturb each other
+    print("[INFO] Measuring inference latency...")
+    for r in results:
+        booster = lgb.Booster(model_str=r["model"])
+        r["latency_us_single"], r["latency_us_batch_row"] = measure_latency(booster, X_val)
+        r["n_leaves"] = int(sum(t["num_leaves"] for t in booster.dump_model()["tree_info"]))
+
+    best_f1 = max(r["macro_f1"] for r in results)
+    eligible = [r for r in results if r["macro_f1"] >= best_f1 - args.f1_tolerance]
+    chosen = min(eligible, key=lambda r: (r["latency_us_single"], r["n_leaves"]))
+
+    ranked = sorted(results, key=lambda r: (-r["macro_f1"], r["latency_us_single"]))
+    print(f"\n{'trial':>5} {'macro-F1':>9} {'µs/row(1)':>10} {'µs/row(batch)':>13} {'leaves':>7}")
+    for r in ranked[:15]:
+        mark = " <-" if r is chosen else ""
+        print(f"{r['trial']:5d} {r['macro_f1']:9.4f} {r['latency_us_single']:10.1f} "
+              f"{r['latency_us_batch_row']:13.2f} {r['n_leaves']:7d}{mark}")
+    print(f"\n[✅] Selected trial {chosen['trial']}: {chosen['params']} "
+          f"(iterations={chosen['best_iteration']})")
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+        json.dump({
+            "selected": chosen["trial"],
+            "f1_tolerance": args.f1_tolerance,
+            "trials": [{k: v for k, v in r.items() if k != "model"} for r in ranked],
+        }, f, indent=2)
+    print(f"[✅] Sweep results saved to: {RESULTS_PATH}")
+
+    if args.save_best:
+        print(f"[INFO] Retraining trial {chosen['trial']} on the full training split...")
+        train_streaming(features, n_jobs=-1, overrides=chosen["params"],
+                        num_boost_round=max(1, chosen["best_iteration"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# ============================================================
+# src/train/train_anomaly.py
+# ------------------------------------------------------------
+# Trains the Feature Autoencoder used for anomaly scoring (Model C)
+# ============================================================
+
+import os
+import sys
+import numpy as np
+import torch
+import torch.nn as nn
+
+# Local imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from src.features.store import load_features
+from src.models.anomaly_model import PasswordAutoencoder
+from src.config import LABELED_PATH, MODEL_C_PATH
+
+SAMPLE_SIZE = 1_000_000
+BATCH_SIZE = 4096
+EPOCHS = 5
+
+
+def main():
+    print("[INFO] Loading cached features...")
+    features = load_features(LABELED_PATH)
+    n = len(features.y)
+    idx = np.arange(n)
+    if n > SAMPLE_SIZE:
+        idx = np.sort(np.random.default_rng(42).choice(n, SAMPLE_SIZE, replace=False))
+    print(f"[INFO] Using {len(idx):,} passwords.")
+
+    X = np.asarray(features.X[idx], dtype=np.float32)
+
+    model = PasswordAutoencoder(input_dim=X.shape[1])
+    model.set_normalization(X)
+    X_norm = model.normalize(torch.from_numpy(X))
+
+    opt = torch.optim.Adam(model.parameters(), lr=1e-3)
+    criterion = nn.MSELoss()
+
+    print("[INFO] Training feature autoencoder...")
+    model.train()
+    for epoch in range(EPOCHS):
+        perm = torch.randperm(len(X_norm))
+        total_loss = 0.0
+        for i in range(0, len(perm), BATCH_SIZE):
+            batch = X_norm[perm[i : i + BATCH_SIZE]]
+            loss = criterion(model(batch), batch)
+            opt.zero_grad(); loss.backward(); opt.step()
+            total_loss += float(loss.item()) * len(batch)
+        print(f"[INFO] Epoch {epoch+1} loss: {total_loss/len(X_norm):.4f}")
+    model.eval()
+
+    errors = model.reconstruction_error(X)
+    print(f"[INFO] Reconstruction error: mean={errors.mean():.4f} "
+          f"suggested threshold (98 pct)={np.percentile(errors, 98):.4f}")
+
+    os.makedirs(os.path.dirname(MODEL_C_PATH), exist_ok=True)
+    model.save(MODEL_C_PATH)
+    print(f"[✅] Model C saved to: {os.path.abspath(MODEL_C_PATH)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,13 @@
 # Trains the Supervised Password Strength Classifier (Model A)
 # ============================================================
 
+import argparse
 import os
 import sys
 import pandas as pd
 import numpy as np
+import lightgbm as lgb
 from lightgbm import LGBMClassifier
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix
 from joblib import dump
 from collections import Counter
@@ -21,54 +22,194 @@ import seaborn as sns
 
 # Local imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
-from src.features.extractors import extract_features
+from src.features.store import load_features
 from src.config import LABELED_PATH, MODEL_A_PATH
+from src.train.split import TEST_PERCENT, holdout_mask, train_test_indices
+
+
+def _report(y_test, preds):
+    """Print the classification report and save the confusion matrix plot."""
+    print("\n[INFO] Classification Report:")
+    print(classification_report(y_test, preds, digits=3))
+
+    cm = confusion_matrix(y_test, preds)
+    print("\n[INFO] Confusion Matrix:")
+    print(cm)
+
+    plt.figure(figsize=(6, 5))
+    sns.heatmap(
+        cm,
+        annot=True,
+        fmt="d",
+        cmap="Blues",
+        xticklabels=["Weak", "Medium", "Strong"],
+        yticklabels=["Weak", "Medium", "Strong"],
+    )
+    plt.title("Password Strength Classifier - Confusion Matrix")
+    plt.xlabel("Predicted Label")
+    plt.ylabel("True Label")
+
+    os.makedirs(os.path.dirname(MODEL_A_PATH), exist_ok=True)
+    png_path = os.path.join(os.path.dirname(MODEL_A_PATH), "confusion_matrix.png")
+    plt.savefig(png_path, bbox_inches="tight")
+    plt.close()
+    print(f"[✅] Confusion matrix saved to: {os.path.abspath(png_path)}")
+
+
+# ------------------------------------------------------------
+# Out-of-core mode: nothing is resampled or materialized in RAM.
+# Features stream from the memory-mapped feature store into a
+# LightGBM Dataset via lgb.Sequence; imbalance is handled with
+# sample weights; the binned Dataset is cached as a binary file.
+# ------------------------------------------------------------
+STREAM_CHUNK = 1_000_000
+
+LGB_PARAMS = {
+    "objective": "multiclass",
+    "num_class": 3,
+    "learning_rate": 0.08,
+    "max_depth": 6,
+    "num_leaves": 25,
+    "lambda_l1": 0.4,
+    "lambda_l2": 0.4,
+    "feature_fraction": 0.9,
+    "seed": 42,
+    "verbosity": -1,
+}
+NUM_BOOST_ROUND = 200
+
+
+class _ChunkSequence(lgb.Sequence):
+    """Rows `rows` (chunk-relative) of X[start : start + len(chunk)], read lazily from the memmap."""
+
+    def __init__(self, X, start, rows, batch_size=65536):
+        self.X = X
+        self.start = start
+        self.rows = rows
+        self.batch_size = batch_size
+
+    def __getitem__(self, idx):
+        return self.X[self.start + self.rows[idx]]
+
+    def __len__(self):
+        return len(self.rows)
+
+
+def balanced_weights(y_train):
+    """
+    Per-class sample weights n / (k * count_c). This is the effective class mass of the
+    in-memory path (partial over/under-sampling followed by class_weight="balanced")
+    without duplicating any rows.
+    """
+    counts = np.bincount(y_train, minlength=3).astype(np.float64)
+    present = counts > 0
+    w = np.zeros_like(counts)
+    w[present] = counts.sum() / (present.sum() * counts[present])
+    return w
+
+
+def train_streaming(features, n_jobs=-1, overrides=None, num_boost_round=NUM_BOOST_ROUND):
+    """
+    Train on every row outside the hold-out and save to MODEL_A_PATH. `overrides` are
+    LightGBM params on top of LGB_PARAMS (e.g. a sweep's pick); such runs bin their own
+    Dataset since some of them (min_data_in_leaf) change how it is built.
+    """
+    X, y_all = features.X, features.y
+    n = len(y_all)
+
+    print(f"[INFO] Streaming mode: {n:,} rows in chunks of {STREAM_CHUNK:,}")
+    seqs, y_train_parts, test_chunks = [], [], []
+    for start in range(0, n, STREAM_CHUNK):
+        stop = min(start + STREAM_CHUNK, n)
+        is_test = holdout_mask(start, stop - start)
+        train_rows = np.flatnonzero(~is_test).astype(np.int32)
+        seqs.append(_ChunkSequence(X, start, train_rows))
+        y_train_parts.append(np.asarray(y_all[start:stop])[train_rows])
+        test_chunks.append((start, np.flatnonzero(is_test).astype(np.int32)))
+    y_train = np.concatenate(y_train_parts).astype(np.int64)
+
+    class_w = balanced_weights(y_train)
+    print(f"[INFO] Label counts (train): {np.bincount(y_train, minlength=3).tolist()}")
+    print(f"[INFO] Class weights: {np.round(class_w, 3).tolist()}")
+
+    params = dict(LGB_PARAMS, **(overrides or {}), num_threads=n_jobs if n_jobs > 0 else 0)
+    bin_path = os.path.join(features.path, f"train_{TEST_PERCENT}pct.bin")
+    if overrides:
+        train_set = lgb.Dataset(seqs, label=y_train, params=params, free_raw_data=True)
+    elif os.path.exists(bin_path):
+        print(f"[INFO] Reusing binned training Dataset: {bin_path}")
+        train_set = lgb.Dataset(bin_path, params=params)
+    else:
+        train_set = lgb.Dataset(seqs, label=y_train, params=params, free_raw_data=True)
+        train_set.construct()
+        train_set.save_binary(bin_path)
+        print(f"[INFO] Binned training Dataset saved: {bin_path}")
+    train_set.set_weight(class_w[y_train])
+
+    print("[INFO] Training LightGBM booster...")
+    booster = lgb.train(params, train_set, num_boost_round=num_boost_round)
+    print("[INFO] Training complete!")
+
+    # Evaluate chunk by chunk on the hashed hold-out
+    y_test, preds = [], []
+    for start, rows in test_chunks:
+        if len(rows) == 0:
+            continue
+        preds.append(np.argmax(booster.predict(X[start + rows]), axis=1))
+        y_test.append(np.asarray(y_all[start + rows]))
+    _report(np.concatenate(y_test), np.concatenate(preds))
+
+    dump(booster, MODEL_A_PATH)
+    print(f"[✅] Model saved to: {os.path.abspath(MODEL_A_PATH)}")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Train the password strength classifier (Model A)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="out-of-core training from the feature store (no resampling in RAM)")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    args = parser.parse_args()
+
     # ============================================================
     # 1. Load & clean dataset
     # ============================================================
     print("[INFO] Loading labeled dataset...")
 
-    # Prefer combined dataset if exists
-    combined_path = os.path.join("data", "labeled", "combined.csv")
-    data_path = combined_path if os.path.exists(combined_path) else LABELED_PATH
-
-    df = pd.read_csv(data_path, on_bad_lines='skip', encoding='utf-8', engine='python')
-    print(f"[INFO] Loaded dataset: {data_path}")
-    print(f"[INFO] Dataset shape before cleaning: {df.shape}")
-
-    # Drop missing or invalid rows
-    df = df.dropna(subset=["password", "strength"]).reset_index(drop=True)
-    df["password"] = df["password"].astype(str)
-
-    print(f"[INFO] Dataset shape after cleaning: {df.shape}")
+    # Cached feature matrix keyed by (dataset hash, feature version);
+    # built through the Parquet dataset on first use, memory-mapped after.
+    # Rows with missing password/strength are dropped during the build.
+    features = load_features(LABELED_PATH)
+    print(f"[INFO] Loaded features: {features.path}")
+    print(f"[INFO] Dataset shape: {features.X.shape}")
 
     # Label distribution check
+    strength = pd.Series(features.y)
     print("\n[INFO] Label Distribution (Raw Counts):")
-    print(df["strength"].value_counts())
+    print(strength.value_counts())
 
     print("\n[INFO] Label Distribution (Normalized):")
-    print(df["strength"].value_counts(normalize=True).round(3))
+    print(strength.value_counts(normalize=True).round(3))
 
-    # Optional: sample to speed up training (uncomment if too slow)
-    # df = df.sample(n=1_000_000, random_state=42)
-    # print(f"[INFO] Using sampled subset: {df.shape}")
+    if args.streaming:
+        train_streaming(features, n_jobs=args.n_jobs)
+        return
 
     # ============================================================
-    # 2. Extract features
+    # 2. Features (NUMERIC_FEATURES order)
     # ============================================================
-    print("\n[INFO] Extracting features...")
-    X = np.array([extract_features(pw) for pw in df["password"]])
-    y = df["strength"].astype(int).values
+    X = features.X
+    y = features.y.astype(int)
+
+    # Optional: sample to speed up training (uncomment if too slow)
+    # idx = np.random.default_rng(42).choice(len(y), 1_000_000, replace=False)
+    # X, y = X[idx], y[idx]
 
     # ============================================================
-    # 3. Split into train/test (stratified)
+    # 3. Split into train/test (hashed hold-out, see src/train/split.py)
     # ============================================================
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
+    train_rows, test_rows = train_test_indices(len(y))
+    X_train, X_test = X[train_rows], X[test_rows]
+    y_train, y_test = y[train_rows], y[test_rows]
 
     # ============================================================
     # 4. Handle imbalance (partial over/under-sampling)
@@ -136,31 +277,7 @@ def main():
     # ============================================================
     preds = model.predict(X_test)
 
-    print("\n[INFO] Classification Report:")
-    print(classification_report(y_test, preds, digits=3))
-
-    cm = confusion_matrix(y_test, preds)
-    print("\n[INFO] Confusion Matrix:")
-    print(cm)
-
-    plt.figure(figsize=(6, 5))
-    sns.heatmap(
-        cm,
-        annot=True,
-        fmt="d",
-        cmap="Blues",
-        xticklabels=["Weak", "Medium", "Strong"],
-        yticklabels=["Weak", "Medium", "Strong"],
-    )
-    plt.title("Password Strength Classifier - Confusion Matrix")
-    plt.xlabel("Predicted Label")
-    plt.ylabel("True Label")
-
-    os.makedirs(os.path.dirname(MODEL_A_PATH), exist_ok=True)
-    png_path = os.path.join(os.path.dirname(MODEL_A_PATH), "confusion_matrix.png")
-    plt.savefig(png_path, bbox_inches="tight")
-    plt.close()
-    print(f"[✅] Confusion matrix saved to: {os.path.abspath(png_path)}")
+    _report(y_test, preds)
 
     # ============================================================
     # 7. Save model
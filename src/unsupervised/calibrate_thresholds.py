@@ -0,0 +1,189 @@
+# src/unsupervised/calibrate_thresholds.py
+# Anomaly thresholds from the full corpus in fixed memory.
+#
+# The parent is the only reader: it decompresses and parses the corpus once and
+# streams batches through a bounded queue to --shards worker processes. Each
+# worker scores whatever batches it pulls with the batched detector and Model C
+# and folds every score component into its own KLL sketches, returned when the
+# input ends. The parent merges the shard sketches and writes, per component, a
+# quantile grid and the threshold at --quantile to ANOMALY_THRESHOLDS_PATH,
+# which backend/app.py loads in place of its default.
+#   python -m src.unsupervised.calibrate_thresholds --shards 8 --quantile 0.98
+import argparse
+import itertools
+import json
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+import traceback
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from src.config import ANOMALY_THRESHOLDS_PATH, MODEL_C_PATH, XATO_PATH
+from src.data.corpus import iter_password_batches
+from src.unsupervised.sketch import DEFAULT_K, KLLSketch
+
+BATCH_SIZE = 4096
+QUEUE_BATCHES = 2  # batches queued per worker
+QUANTILE_GRID = [0.5, 0.9, 0.95, 0.98, 0.99, 0.995, 0.999]
+
+# component -> which tail is anomalous ("high": large values, "low": small values)
+COMPONENTS = {
+    "model_c.reconstruction_error": "high",   # what /evaluate flags as is_anomaly
+    "detector.reconstruction_error": "high",
+    "detector.isoforest_raw": "low",
+    "detector.anomaly_score": "high",
+}
+
+
+def score_components(passwords):
+    """component -> np.ndarray of scores for a batch of passwords."""
+    from src.features.extractors import features_matrix
+    from src.inference.anomaly_detector import get_model
+    from src.unsupervised import detector
+
+    results = detector.score_passwords(passwords)
+    return {
+        "model_c.reconstruction_error": get_model(MODEL_C_PATH).reconstruction_error(features_matrix(passwords)),
+        "detector.reconstruction_error": np.array([r["reconstruction_error"] for r in results]),
+        "detector.isoforest_raw": np.array([r["isoforest_raw"] for r in results]),
+        "detector.anomaly_score": np.array([r["anomaly_score"] for r in results]),
+    }
+
+
+def _batches(path, batch_size, limit):
+    for i, batch in enumerate(iter_password_batches(path, batch_size)):
+        if limit is not None and i * batch_size >= limit:
+            return
+        yield batch
+
+
+def _new_sketches(k, seed):
+    return {name: KLLSketch(k, seed=seed) for name in COMPONENTS}
+
+
+def _fold(sketches, batch):
+    for name, scores in score_components(batch).items():
+        sketches[name].update(scores)
+
+
+def _shard_worker(tasks, results, shard, k, threads):
+    """Score batches from `tasks` until None; put this shard's sketches (as dicts) on `results`."""
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        sketches, seen = _new_sketches(k, shard), 0
+        while (batch := tasks.get()) is not None:
+            _fold(sketches, batch)
+            seen += len(batch)
+        print(f"[INFO] shard {shard}: {seen:,} passwords")
+        results.put((shard, {name: s.to_dict() for name, s in sketches.items()}, None))
+    except BaseException:
+        results.put((shard, None, traceback.format_exc()))
+
+
+def _check_alive(procs):
+    dead = [p.name for p in procs if p.exitcode not in (None, 0)]
+    if dead:
+        raise RuntimeError(f"Calibration worker(s) died: {', '.join(dead)}")
+
+
+def calibrate(path, n_shards, k=DEFAULT_K, batch_size=BATCH_SIZE, limit=None):
+    """Merged sketch per component."""
+    if n_shards == 1:
+        import torch
+        torch.set_num_threads(os.cpu_count() or 1)
+        merged = _new_sketches(k, 0)
+        for batch in _batches(path, batch_size, limit):
+            _fold(merged, batch)
+        return merged
+
+    threads = max(1, (os.cpu_count() or 1) // n_shards)
+    tasks, results = mp.Queue(maxsize=QUEUE_BATCHES * n_shards), mp.Queue()
+    procs = [mp.Process(target=_shard_worker, args=(tasks, results, i, k, threads), name=f"shard-{i}", daemon=True)
+             for i in range(n_shards)]
+    for p in procs:
+        p.start()
+    ok = False
+    try:
+        for item in itertools.chain(_batches(path, batch_size, limit), [None] * n_shards):
+            while True:
+                try:
+                    tasks.put(item, timeout=1.0)
+                    break
+                except queue.Full:
+                    _check_alive(procs)
+        shards = []
+        while len(shards) < n_shards:
+            try:
+                shard, sketches, error = results.get(timeout=1.0)
+            except queue.Empty:
+                _check_alive(procs)
+                continue
+            if error:
+                raise RuntimeError(f"Calibration shard {shard} failed:\n{error}")
+            shards.append(sketches)
+        ok = True
+    finally:
+        for p in procs:
+            if not ok:
+                p.terminate()
+            p.join()
+
+    merged = {}
+    for name in COMPONENTS:
+        merged[name] = KLLSketch.from_dict(shards[0][name])
+        for other in shards[1:]:
+            merged[name].merge(KLLSketch.from_dict(other[name]))
+    return merged
+
+
+def thresholds_artifact(sketches, quantile, source):
+    components = {}
+    for name, tail in COMPONENTS.items():
+        s = sketches[name]
+        q = quantile if tail == "high" else 1.0 - quantile
+        components[name] = {
+            "tail": tail,
+            "quantile": q,
+            "threshold": s.quantile(q),
+            "n": s.n,
+            "quantiles": {str(g): float(v) for g, v in zip(QUANTILE_GRID, s.quantiles(QUANTILE_GRID))},
+        }
+    return {
+        "version": 1,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "source": os.path.abspath(source),
+        "sketch": {"type": "kll", "k": next(iter(sketches.values())).k},
+        "components": components,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate anomaly thresholds with mergeable quantile sketches")
+    parser.add_argument("--input", default=XATO_PATH, help="password corpus (plain or compressed)")
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1, help="scoring worker processes")
+    parser.add_argument("--quantile", type=float, default=0.98, help="share of passwords considered normal")
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help="sketch size (accuracy ~1.7/k)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--limit", type=int, help="only the first N passwords")
+    parser.add_argument("--output", default=ANOMALY_THRESHOLDS_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    sketches = calibrate(args.input, args.shards, args.k, args.batch_size, args.limit)
+    artifact = thresholds_artifact(sketches, args.quantile, args.input)
+    for name, c in artifact["components"].items():
+        print(f"[INFO] {name:32s} n={c['n']:,} threshold(q={c['quantile']:.3f})={c['threshold']:.4f}")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, indent=2)
+    print(f"[✅] Thresholds saved -> {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,58 +1,74 @@
 # src/unsupervised/detector.py
-import json, os
+# Models are loaded on first use (load_models), not at import time,
+# so importing this module does not pull in torch / sklearn.
+import os
+import threading
+from functools import lru_cache
 import numpy as np
-import torch
-import torch.nn.functional as F
-import joblib
 from pathlib import Path
 import math
 import re
 
-ROOT = Path(__file__).resolve().parents[2]
-OUT_DIR = ROOT / "models" / "unsupervised"
+from src.config import UNSUPERVISED_DIR
+from src.unsupervised.tokenizer import CharTokenizer
+from src.unsupervised.isoforest_table import TABLE_PATH as IF_TABLE_PATH, feature_key, load_table
+
+OUT_DIR = Path(UNSUPERVISED_DIR)
 CHAR2IDX_PATH = OUT_DIR / "char2idx.json"
 AE_PATH = OUT_DIR / "autoencoder.pt"
 IF_PATH = OUT_DIR / "isoforest.pkl"
 META_PATH = OUT_DIR / "unsup_meta.json"
 MAX_LEN = 32
-DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
-
-# load char2idx
-with open(CHAR2IDX_PATH, "r", encoding="utf-8") as f:
-    CHAR2IDX = json.load(f)
-PAD = CHAR2IDX.get("<pad>", 0)
-UNK = CHAR2IDX.get("<unk>", 1)
-VOCAB_SIZE = max(CHAR2IDX.values()) + 1
-
-# Model (must match training)
-import torch.nn as nn
-class SeqAutoencoder(nn.Module):
-    def __init__(self, vocab_size, emb_dim=64, hidden_dim=128, pad_idx=0):
-        super().__init__()
-        self.emb = nn.Embedding(vocab_size, emb_dim, padding_idx=pad_idx)
-        self.encoder = nn.GRU(emb_dim, hidden_dim, batch_first=True)
-        self.decoder = nn.GRU(emb_dim, hidden_dim, batch_first=True)
-        self.output = nn.Linear(hidden_dim, vocab_size)
-    def forward(self, x):
-        emb = self.emb(x)
-        _, h = self.encoder(emb)
-        dec_in = emb
-        dec_out, _ = self.decoder(dec_in, h)
-        logits = self.output(dec_out)
-        return logits
-
-AE = SeqAutoencoder(VOCAB_SIZE, emb_dim=64, hidden_dim=128, pad_idx=PAD)
-AE.load_state_dict(torch.load(AE_PATH, map_location="cpu"))
-AE.to(DEVICE).eval()
-
-IF = joblib.load(IF_PATH)
+IF_CACHE_SIZE = 65536  # feature rows outside the precomputed table
+
+_MODELS = None
+_LOAD_LOCK = threading.Lock()
+
+
+class _DetectorModels:
+    def __init__(self):
+        import joblib
+        import torch
+        from src.unsupervised.seq_model import SeqAutoencoder
+
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        # load char2idx
+        self.tokenizer = CharTokenizer.load(CHAR2IDX_PATH, max_len=MAX_LEN)
+        self.char2idx = self.tokenizer.char2idx
+        self.pad = self.tokenizer.pad
+        self.unk = self.tokenizer.unk
+
+        self.ae = SeqAutoencoder(self.tokenizer.vocab_size, emb_dim=64, hidden_dim=128, pad_idx=self.pad)
+        self.ae.load_state_dict(torch.load(AE_PATH, map_location="cpu"))
+        self.ae.to(self.device).eval()
+
+        self.isoforest = joblib.load(IF_PATH)
+        # Exact score memo: precomputed common rows + bounded LRU for the rest
+        self.if_table = load_table(IF_TABLE_PATH, self.isoforest)
+        self.if_cached = lru_cache(maxsize=IF_CACHE_SIZE)(self._if_score)
+
+    def _if_score(self, key):
+        row = np.frombuffer(key, dtype=np.float32).reshape(1, -1)
+        return float(self.isoforest.score_samples(row)[0])
+
+
+def load_models():
+    """Load (once) and return the detector's char vocab, GRU autoencoder and IsolationForest."""
+    global _MODELS
+    if _MODELS is None:
+        with _LOAD_LOCK:
+            if _MODELS is None:
+                _MODELS = _DetectorModels()
+    return _MODELS
+
 
 # helper functions
 def encode_pwd(pw, max_len=MAX_LEN):
-    idxs = [CHAR2IDX.get(c, UNK) for c in pw[:max_len]]
-    if len(idxs) < max_len:
-        idxs += [PAD] * (max_len - len(idxs))
-    return np.array(idxs, dtype=np.int64)
+    return load_models().tokenizer.encode(pw, max_len)
+
+def encode_batch(passwords, max_len=MAX_LEN):
+    """(ids [B, max_len] int64, lengths [B]) via the lookup-table tokenizer."""
+    return load_models().tokenizer.encode_batch(passwords, max_len)
 
 def extract_struct_features(pw):
     pw = str(pw)
@@ -71,27 +87,56 @@ def extract_struct_features(pw):
             ent -= p * math.log2(p)
     return np.array([l, digits, upper, lower, symbols, uniq, ent], dtype=np.float32)
 
+def isoforest_score(features):
+    """IsolationForest score_samples of one feature row, memoized on its float32 bytes."""
+    m = load_models()
+    key = feature_key(features)
+    score = m.if_table.get(key)
+    return m.if_cached(key) if score is None else score
+
 def reconstruction_error(pw_seq):
     # pw_seq: numpy array shape [L]
-    x = torch.tensor(pw_seq[None,:], dtype=torch.long, device=DEVICE)
+    import torch
+    import torch.nn.functional as F
+
+    m = load_models()
+    x = torch.tensor(pw_seq[None,:], dtype=torch.long, device=m.device)
     with torch.no_grad():
-        logits = AE(x)  # [1,L,V]
+        logits = m.ae(x)  # [1,L,V]
         probs = F.log_softmax(logits, dim=-1)  # log-probs
         # negative log-likelihood of true tokens:
         token_ll = -probs[0, torch.arange(probs.size(1)), x[0]]
         # ignore pads
-        pad_mask = (x[0] == PAD)
+        pad_mask = (x[0] == m.pad)
         token_ll = token_ll[~pad_mask]
         if token_ll.numel()==0:
             return float("inf")
         return float(token_ll.mean().cpu().item())  # mean NLL
 
-def score_password(password):
-    # returns dict with anomaly / risk metrics
-    seq = encode_pwd(password)
-    rec_err = reconstruction_error(seq)  # lower = easier to reconstruct (more like training)
-    struct = extract_struct_features(password).reshape(1,-1)
-    if_score = IF.score_samples(struct)[0]  # higher = normal (positive), lower negative -> anomalous
+def reconstruction_errors(passwords, batch_size=1024):
+    """Mean token NLL per password (inf for empty ones), batched through the autoencoder."""
+    import torch
+    import torch.nn.functional as F
+
+    m = load_models()
+    out = np.empty(len(passwords), dtype=np.float64)
+    ids = np.empty((min(batch_size, len(passwords)), MAX_LEN), dtype=np.int64)
+    for lo in range(0, len(passwords), batch_size):
+        chunk = passwords[lo:lo + batch_size]
+        seq, lengths = m.tokenizer.encode_batch(chunk, MAX_LEN, out=ids[:len(chunk)])
+        x = torch.from_numpy(seq).to(m.device)
+        with torch.no_grad():
+            log_probs = F.log_softmax(m.ae(x), dim=-1)                   # [B,L,V]
+            token_ll = -log_probs.gather(-1, x.unsqueeze(-1)).squeeze(-1)  # [B,L]
+            mask = (x != m.pad).to(token_ll.dtype)
+            n = mask.sum(dim=1)
+            err = (token_ll * mask).sum(dim=1) / n.clamp(min=1)
+        err = err.cpu().numpy().astype(np.float64)
+        err[n.cpu().numpy() == 0] = np.inf
+        out[lo:lo + len(chunk)] = err
+    return out
+
+def _combine(rec_err, if_score):
     # Normalize and combine into 0..1 anomaly score:
     # map rec_err -> 0..1 (we invert: large rec_err -> anomaly)
     # we need heuristics to scale: use plausible range
@@ -115,6 +160,19 @@ def score_password(password):
         "anomaly_score": anomaly
     }
 
+def score_passwords(passwords, batch_size=1024):
+    """score_password for a list, with one autoencoder pass per batch."""
+    passwords = [str(pw) for pw in passwords]
+    rec = reconstruction_errors(passwords, batch_size)
+    return [_combine(float(r), isoforest_score(extract_struct_features(pw))) for pw, r in zip(passwords, rec)]
+
+def score_password(password):
+    # returns dict with anomaly / risk metrics
+    seq = encode_pwd(password)
+    rec_err = reconstruction_error(seq)  # lower = easier to reconstruct (more like training)
+    if_score = isoforest_score(extract_struct_features(password))  # higher = normal (positive), lower negative -> anomalous
+    return _combine(rec_err, if_score)
+
 if __name__ == "__main__":
     for pw in ["123456","password","qwerty123","helloWORLD","S0m3Rand0m#Chars!","fbeiabig83791brob*%^#@@()"]:
         print(pw, "->", score_password(pw))
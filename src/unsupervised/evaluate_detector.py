@@ -1,13 +1,13 @@
 # src/unsupervised/evaluate_detector.py
 import numpy as np
 from pathlib import Path
-from .detector import score_password, encode_pwd, extract_struct_features
+from .detector import score_passwords, encode_pwd, extract_struct_features
 import json
 
 def scan_sample_file(sample_path, n=10000):
     with open(sample_path, "r", encoding="utf-8", errors="ignore") as f:
         pwds = [line.strip() for i,line in enumerate(f) if i<n]
-    scores = [score_password(pw)["anomaly_score"] for pw in pwds]
+    scores = [r["anomaly_score"] for r in score_passwords(pwds)]
     return scores, pwds
 
 if __name__ == "__main__":
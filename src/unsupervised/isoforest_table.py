@@ -0,0 +1,80 @@
+# src/unsupervised/isoforest_table.py
+# Precomputed IsolationForest scores for the most common structural feature rows.
+#
+# The detector's 7 features are six small integers plus an entropy that follows from
+# the character histogram, so real passwords collapse onto few distinct rows. Rows are
+# keyed on their exact float32 bytes (the dtype IsolationForest scores in), so a table
+# hit returns exactly what score_samples would. Rows outside the table go through a
+# bounded LRU in detector.py.
+#   python -m src.unsupervised.isoforest_table --input data/leaks/rockyou.txt --top-n 200000
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from src.config import LEAK_PATH, UNSUPERVISED_DIR
+from src.data.corpus import iter_password_batches
+
+TABLE_PATH = os.path.join(UNSUPERVISED_DIR, "isoforest_table.npz")
+N_FEATURES = 7
+N_CHECK = 64  # table rows re-scored at load to catch a retrained forest
+
+
+def feature_key(features):
+    """Memo key of one feature row: its float32 bytes."""
+    return np.asarray(features, dtype=np.float32).tobytes()
+
+
+def common_rows(passwords, extract, top_n):
+    """The top_n most frequent feature rows, (n, 7) float32, most frequent first."""
+    counts = Counter(feature_key(extract(pw)) for pw in passwords)
+    keys = [k for k, _ in counts.most_common(top_n)]
+    coverage = sum(counts[k] for k in keys) / max(1, sum(counts.values()))
+    print(f"[INFO] {len(counts):,} distinct feature rows; top {len(keys):,} cover {coverage:.1%} of passwords")
+    return np.frombuffer(b"".join(keys), dtype=np.float32).reshape(-1, N_FEATURES)
+
+
+def build_table(isoforest, rows, path=TABLE_PATH):
+    scores = isoforest.score_samples(rows)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, keys=rows, scores=scores.astype(np.float64))
+    print(f"[✅] IsolationForest table ({len(rows):,} rows) saved -> {path}")
+
+
+def load_table(path, isoforest):
+    """{feature_key: score}; empty if missing or if it no longer matches the forest."""
+    if not os.path.exists(path):
+        return {}
+    with np.load(path) as data:
+        keys, scores = data["keys"].astype(np.float32), data["scores"]
+    if len(keys):
+        check = np.linspace(0, len(keys) - 1, min(N_CHECK, len(keys))).astype(int)
+        if not np.array_equal(isoforest.score_samples(keys[check]), scores[check]):
+            print(f"[WARN] {path} does not match the IsolationForest; rebuild it. Scoring without the table.")
+            return {}
+    return dict(zip((row.tobytes() for row in keys), scores.tolist()))
+
+
+def main():
+    import joblib
+    from src.unsupervised.detector import IF_PATH, extract_struct_features
+
+    parser = argparse.ArgumentParser(description="Precompute IsolationForest scores for common feature rows")
+    parser.add_argument("--input", default=LEAK_PATH, help="password corpus (plain or compressed)")
+    parser.add_argument("--top-n", type=int, default=200_000)
+    parser.add_argument("--output", default=TABLE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    passwords = (pw for batch in iter_password_batches(args.input) for pw in batch)
+    rows = common_rows(passwords, extract_struct_features, args.top_n)
+    build_table(joblib.load(IF_PATH), rows, args.output)
+    print(f"[INFO] Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# src/unsupervised/seq_model.py
+# Char-level GRU autoencoder shared by training (train_autoencoder.py)
+# and scoring (detector.py). Kept in its own module so importing the
+# detector does not pull in torch until a model is actually loaded.
+import torch.nn as nn
+
+EMB_DIM = 64
+HIDDEN_DIM = 128
+
+
+class SeqAutoencoder(nn.Module):
+    def __init__(self, vocab_size, emb_dim=EMB_DIM, hidden_dim=HIDDEN_DIM, pad_idx=0):
+        super().__init__()
+        self.emb = nn.Embedding(vocab_size, emb_dim, padding_idx=pad_idx)
+        self.encoder = nn.GRU(emb_dim, hidden_dim, batch_first=True)
+        self.decoder = nn.GRU(emb_dim, hidden_dim, batch_first=True)
+        self.output = nn.Linear(hidden_dim, vocab_size)
+
+    def forward(self, x):
+        # x: [B, L]
+        emb = self.emb(x)  # [B, L, E]
+        _, h = self.encoder(emb)  # [1, B, H]
+        # Start decoding with last hidden and use teacher forcing
+        dec_in = emb  # teacher forcing: feed embeddings of input shifted, simpler: feed emb
+        dec_out, _ = self.decoder(dec_in, h)
+        logits = self.output(dec_out)  # [B, L, V]
+        return logits
@@ -0,0 +1,102 @@
+# src/unsupervised/sketch.py
+# KLL quantile sketch (Karnin, Lang & Liberty, FOCS 2016): fixed memory, mergeable.
+#
+# Items live in levels of "compactors"; an item at level h stands for 2^h inputs.
+# When a level overflows its capacity it is sorted and every other item (random
+# offset) moves up a level, so the total weight is preserved exactly and the rank
+# error stays around 1.7 / k of n. Level capacities shrink geometrically (2/3) from
+# the top, so memory is O(k) whatever n is. Sketches built on separate shards merge
+# by concatenating levels and compacting.
+import numpy as np
+
+DEFAULT_K = 2000  # ~0.05% rank error on the tails, ~2k floats retained
+_C = 2.0 / 3.0
+
+
+class KLLSketch:
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, h):
+        depth = len(self.levels) - h - 1
+        return max(2, int(np.ceil(self.k * _C ** depth)))
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                buf = np.sort(self.levels[h])
+                leftover = buf[len(buf) - len(buf) % 2:]   # odd item stays at this level
+                promoted = buf[self._rng.integers(2):len(buf) - len(leftover):2]
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                self.levels[h] = leftover
+            h += 1
+
+    def update(self, values):
+        """Add a batch of values (NaNs are dropped)."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        # Feed level 0 a capacity-sized slice at a time so bulk updates keep the error bound
+        step = max(1, self._capacity(0))
+        for lo in range(0, len(values), step):
+            self.levels[0] = np.concatenate([self.levels[0], values[lo:lo + step]])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch (same k) into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _weighted(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lv), 2.0 ** h) for h, lv in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def quantiles(self, qs):
+        """Approximate values at quantiles qs (0..1)."""
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        items, cum = self._weighted()
+        idx = np.searchsorted(cum, np.asarray(qs, dtype=np.float64) * cum[-1], side="left")
+        return items[np.minimum(idx, len(items) - 1)]
+
+    def quantile(self, q):
+        return float(self.quantiles([q])[0])
+
+    def rank(self, value):
+        """Approximate fraction of inputs <= value."""
+        if self.n == 0:
+            return float("nan")
+        items, cum = self._weighted()
+        i = np.searchsorted(items, value, side="right")
+        return float(cum[i - 1] / cum[-1]) if i else 0.0
+
+    def size(self):
+        """Items currently retained (memory footprint)."""
+        return sum(len(lv) for lv in self.levels)
+
+    # -------------------------
+    # Serialization (plain dict, JSON-friendly)
+    # -------------------------
+    def to_dict(self):
+        return {"k": self.k, "n": self.n, "levels": [lv.tolist() for lv in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data):
+        s = cls(k=data["k"])
+        s.n = data["n"]
+        s.levels = [np.asarray(lv, dtype=np.float64) for lv in data["levels"]]
+        return s
@@ -0,0 +1,82 @@
+# src/unsupervised/tokenizer.py
+# Char tokenizer for the sequence autoencoder, built from char2idx.json.
+# Code points in the BMP map through a dense NumPy table, so a whole batch is
+# encoded with array ops: the strings are joined, decoded to UTF-32 code points
+# and scattered into a preallocated (B, L) int64 array. Characters outside the
+# BMP (emoji, ...) go through a dict and fall back to <unk>.
+import json
+
+import numpy as np
+
+PAD, UNK = "<pad>", "<unk>"
+BMP_SIZE = 0x10000
+MAX_LEN = 32
+
+
+class CharTokenizer:
+    def __init__(self, char2idx, max_len=MAX_LEN):
+        self.char2idx = dict(char2idx)
+        self.max_len = max_len
+        self.pad = self.char2idx.get(PAD, 0)
+        self.unk = self.char2idx.get(UNK, 1)
+        self.vocab_size = max(self.char2idx.values()) + 1
+        self.table = np.full(BMP_SIZE, self.unk, dtype=np.int64)
+        self.astral = {}  # code point -> index, outside the BMP
+        for ch, idx in self.char2idx.items():
+            if len(ch) != 1:  # <pad> / <unk>
+                continue
+            if ord(ch) < BMP_SIZE:
+                self.table[ord(ch)] = idx
+            else:
+                self.astral[ord(ch)] = idx
+
+    @classmethod
+    def from_passwords(cls, passwords, max_len=MAX_LEN):
+        """Vocabulary of every character seen (sorted); 0 is <pad>, 1 is <unk>."""
+        chars = sorted({c for p in passwords for c in p})
+        char2idx = {ch: i + 2 for i, ch in enumerate(chars)}
+        char2idx[PAD] = 0
+        char2idx[UNK] = 1
+        return cls(char2idx, max_len)
+
+    @classmethod
+    def load(cls, path, max_len=MAX_LEN):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), max_len)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.char2idx, f, ensure_ascii=False)
+
+    def encode_batch(self, passwords, max_len=None, out=None):
+        """
+        (ids, lengths): ids is (B, max_len) int64, pad-filled, with each password truncated
+        to max_len; lengths holds the number of real tokens per row. Pass `out` to reuse
+        a preallocated (B, max_len) int64 array.
+        """
+        max_len = max_len or self.max_len
+        clipped = [pw[:max_len] for pw in passwords]
+        lengths = np.fromiter(map(len, clipped), dtype=np.int64, count=len(clipped))
+        if out is None:
+            out = np.empty((len(clipped), max_len), dtype=np.int64)
+        out.fill(self.pad)
+        total = int(lengths.sum())
+        if total == 0:
+            return out, lengths
+
+        # One UTF-32 code point per character, in row order
+        cps = np.frombuffer("".join(clipped).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        ids = self.table[np.minimum(cps, BMP_SIZE - 1)]
+        astral = np.flatnonzero(cps >= BMP_SIZE)
+        if astral.size:
+            ids[astral] = [self.astral.get(int(cp), self.unk) for cp in cps[astral]]
+
+        rows = np.repeat(np.arange(len(clipped)), lengths)
+        starts = np.cumsum(lengths) - lengths
+        cols = np.arange(total) - np.repeat(starts, lengths)
+        out[rows, cols] = ids
+        return out, lengths
+
+    def encode(self, password, max_len=None):
+        """(max_len,) int64 ids of a single password."""
+        return self.encode_batch([password], max_len)[0][0]
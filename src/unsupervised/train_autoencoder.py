@@ -1,18 +1,24 @@
 # src/unsupervised/train_autoencoder.py
 import os
+import sys
 import json
 import random
+import argparse
 from pathlib import Path
 from tqdm import tqdm
 
 import numpy as np
 import torch
 import torch.nn as nn
-from torch.utils.data import Dataset, DataLoader
 
 from sklearn.ensemble import IsolationForest
 import joblib
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from src.data.corpus import iter_password_batches
+from src.unsupervised.tokenizer import CharTokenizer
+from src.unsupervised.isoforest_table import build_table as build_if_table, common_rows
+
 # -------------------------
 # Config / paths
 # -------------------------
@@ -25,66 +31,44 @@ CHAR2IDX_PATH = OUT_DIR / "char2idx.json"
 AE_PATH = OUT_DIR / "autoencoder.pt"
 IF_PATH = OUT_DIR / "isoforest.pkl"
 META_PATH = OUT_DIR / "unsup_meta.json"
+IF_TABLE_PATH = OUT_DIR / "isoforest_table.npz"
+IF_TABLE_ROWS = 200_000
+TOKENS_PATH = OUT_DIR / "train_tokens.npy"
+CHECKPOINT_PATH = OUT_DIR / "autoencoder_ckpt.pt"
 
 MAX_LEN = 32
-EMB_DIM = 64
-HIDDEN_DIM = 128
 BATCH_SIZE = 1024
 EPOCHS = 6
+SAMPLE_SIZE = 500_000  # safe default; 0 trains on the whole corpus
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 
 # -------------------------
 # Simple char tokenizer
 # -------------------------
 def build_char_vocab(passwords):
-    chars = sorted(list({c for p in passwords for c in p}))
     # reserve 0 for pad, 1 for unk
-    char2idx = {ch: i+2 for i, ch in enumerate(chars)}
-    char2idx["<pad>"] = 0
-    char2idx["<unk>"] = 1
-    return char2idx
-
-def encode_pwd(pwd, char2idx, max_len=MAX_LEN):
-    idxs = [char2idx.get(c, char2idx["<unk>"]) for c in pwd[:max_len]]
-    if len(idxs) < max_len:
-        idxs += [char2idx["<pad>"]] * (max_len - len(idxs))
-    return idxs
+    return CharTokenizer.from_passwords(passwords, MAX_LEN).char2idx
 
 # -------------------------
-# PyTorch dataset
+# Pre-tokenized corpus (memmap shared by every rank)
 # -------------------------
-class PwDataset(Dataset):
-    def __init__(self, pw_list, char2idx):
-        self.pw_list = pw_list
-        self.char2idx = char2idx
-
-    def __len__(self):
-        return len(self.pw_list)
-
-    def __getitem__(self, idx):
-        seq = encode_pwd(self.pw_list[idx], self.char2idx)
-        return torch.tensor(seq, dtype=torch.long)
+def write_tokens(passwords, tokenizer, path=TOKENS_PATH, chunk=1_000_000):
+    """Encode passwords into an (N, MAX_LEN) .npy that training ranks memory-map."""
+    dtype = np.uint16 if tokenizer.vocab_size <= np.iinfo(np.uint16).max else np.int32
+    tokens = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(len(passwords), MAX_LEN))
+    buf = np.empty((min(chunk, len(passwords)), MAX_LEN), dtype=np.int64)
+    for lo in range(0, len(passwords), chunk):
+        part = passwords[lo:lo + chunk]
+        ids, _ = tokenizer.encode_batch(part, MAX_LEN, out=buf[:len(part)])
+        tokens[lo:lo + len(part)] = ids
+    tokens.flush()
+    del tokens
+    print(f"[✅] {len(passwords):,} tokenized passwords saved -> {path}")
 
 # -------------------------
 # Autoencoder model (char-level)
 # -------------------------
-class SeqAutoencoder(nn.Module):
-    def __init__(self, vocab_size, emb_dim=EMB_DIM, hidden_dim=HIDDEN_DIM, pad_idx=0):
-        super().__init__()
-        self.emb = nn.Embedding(vocab_size, emb_dim, padding_idx=pad_idx)
-        self.encoder = nn.GRU(emb_dim, hidden_dim, batch_first=True)
-        self.decoder = nn.GRU(emb_dim, hidden_dim, batch_first=True)
-        self.output = nn.Linear(hidden_dim, vocab_size)
-
-    def forward(self, x):
-        # x: [B, L]
-        emb = self.emb(x)  # [B, L, E]
-        _, h = self.encoder(emb)  # [1, B, H]
-        # Start decoding with last hidden and use teacher forcing
-        dec_in = emb  # teacher forcing: feed embeddings of input shifted, simpler: feed emb
-        dec_out, _ = self.decoder(dec_in, h)
-        logits = self.output(dec_out)  # [B, L, V]
-        return logits
+from src.unsupervised.seq_model import SeqAutoencoder, EMB_DIM, HIDDEN_DIM
 
 # -------------------------
 # Feature extractor for IsolationForest (simple structural features)
@@ -109,61 +93,108 @@ def extract_struct_features(pw):
     return [l, digits, upper, lower, symbols, uniq, ent]
 
 # -------------------------
-# Training loop
+# Training loop (single process, or one rank of a gloo DDP group)
 # -------------------------
-def train():
+def _save_checkpoint(path, model, opt, epoch, step, global_step, cfg):
+    tmp = f"{path}.tmp"
+    torch.save({"model": model.state_dict(), "opt": opt.state_dict(), "epoch": epoch, "step": step,
+                "global_step": global_step, "world_size": cfg["world_size"], "seed": cfg["seed"]}, tmp)
+    os.replace(tmp, path)
+
+
+def _train_rank(rank, cfg):
+    """
+    Train over the pre-tokenized memmap. With world_size > 1 this runs in one of the
+    spawned processes: gradients are all-reduced by DistributedDataParallel over gloo and
+    DistributedSampler gives each rank a disjoint, equally sized slice of every epoch.
+    """
+    import torch.distributed as dist
+    from torch.nn.parallel import DistributedDataParallel
+    from torch.utils.data.distributed import DistributedSampler
+
+    world = cfg["world_size"]
+    torch.set_num_threads(cfg["threads"])
+    if world > 1:
+        torch.set_num_interop_threads(1)
+        os.environ.setdefault("MASTER_ADDR", "127.0.0.1")
+        os.environ.setdefault("MASTER_PORT", str(cfg["port"]))
+        dist.init_process_group("gloo", rank=rank, world_size=world)
+    device = DEVICE if world == 1 else "cpu"
+    torch.manual_seed(cfg["seed"])
+
+    tokens = np.load(cfg["tokens"], mmap_mode="r")
+    model = SeqAutoencoder(cfg["vocab_size"], emb_dim=EMB_DIM, hidden_dim=HIDDEN_DIM, pad_idx=cfg["pad"]).to(device)
+    opt = torch.optim.Adam(model.parameters(), lr=cfg["lr"])
+    criterion = nn.CrossEntropyLoss(ignore_index=cfg["pad"])
+
+    start_epoch, start_step, global_step = 0, 0, 0
+    if cfg["resume"] and os.path.exists(cfg["checkpoint"]):
+        ckpt = torch.load(cfg["checkpoint"], map_location="cpu")
+        if ckpt["world_size"] != world or ckpt["seed"] != cfg["seed"]:
+            raise ValueError(f"Checkpoint was written with world_size={ckpt['world_size']}, seed={ckpt['seed']}; "
+                             "resume with the same settings")
+        model.load_state_dict(ckpt["model"])
+        opt.load_state_dict(ckpt["opt"])
+        start_epoch, start_step, global_step = ckpt["epoch"], ckpt["step"], ckpt["global_step"]
+        if rank == 0:
+            print(f"[INFO] Resuming from epoch {start_epoch + 1}, step {start_step} ({cfg['checkpoint']})")
+    net = DistributedDataParallel(model) if world > 1 else model
+
+    # Same permutation on every rank for a given (seed, epoch): resuming replays it exactly
+    sampler = DistributedSampler(range(len(tokens)), num_replicas=world, rank=rank, shuffle=True, seed=cfg["seed"])
+    batch_size = cfg["batch_size"]
+    net.train()
+    for epoch in range(start_epoch, cfg["epochs"]):
+        sampler.set_epoch(epoch)
+        order = np.fromiter(iter(sampler), dtype=np.int64)
+        n_steps = (len(order) + batch_size - 1) // batch_size
+        first = start_step if epoch == start_epoch else 0
+        total_loss, seen = 0.0, 0
+        for step in tqdm(range(first, n_steps), desc=f"Epoch {epoch+1}/{cfg['epochs']}", disable=rank != 0):
+            idx = np.sort(order[step * batch_size:(step + 1) * batch_size])  # sorted: sequential memmap reads
+            batch = torch.from_numpy(tokens[idx].astype(np.int64)).to(device)  # [B,L]
+            logits = net(batch)     # [B,L,V]
+            # compute loss: flatten
+            loss = criterion(logits.view(-1, logits.size(-1)), batch.view(-1))
+            opt.zero_grad(); loss.backward(); opt.step()
+            total_loss += float(loss.item()); seen += 1
+            global_step += 1
+            if cfg["checkpoint_every"] and global_step % cfg["checkpoint_every"] == 0 and rank == 0:
+                _save_checkpoint(cfg["checkpoint"], model, opt, epoch, step + 1, global_step, cfg)
+
+        stats = torch.tensor([total_loss, float(seen)])
+        if world > 1:
+            dist.all_reduce(stats)
+        if rank == 0:
+            print(f"[INFO] Epoch {epoch+1} loss: {stats[0].item() / max(1.0, stats[1].item()):.4f}")
+            if cfg["checkpoint_every"]:
+                _save_checkpoint(cfg["checkpoint"], model, opt, epoch + 1, 0, global_step, cfg)
+
+    if rank == 0:
+        torch.save(model.state_dict(), cfg["output"])
+        print(f"[✅] Autoencoder saved -> {cfg['output']}")
+    if world > 1:
+        dist.barrier()
+        dist.destroy_process_group()
+
+
+def load_passwords(sample_size=SAMPLE_SIZE, seed=0):
     print("[INFO] Loading sample passwords (may be large) ...")
     # We sample to keep GPU/CPU training feasible. Use more for production.
     passwords = []
-    with open(DATA_PATH, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            pw = line.strip()
-            if pw:
-                passwords.append(pw)
+    for batch in iter_password_batches(DATA_PATH):
+        passwords.extend(batch)
     print(f"[INFO] Loaded {len(passwords):,} passwords. Sampling for training...")
 
-    # Shuffle and sample (adjust sample_size as you like)
-    random.shuffle(passwords)
-    sample_size = min(500_000, len(passwords))  # safe default
-    passwords = passwords[:sample_size]
+    # Shuffle and sample (sample_size=0 keeps everything)
+    random.Random(seed).shuffle(passwords)
+    if sample_size:
+        passwords = passwords[:sample_size]
     print(f"[INFO] Using {len(passwords):,} passwords for training.")
+    return passwords
 
-    char2idx = build_char_vocab(passwords)
-    vocab_size = max(char2idx.values()) + 1
-    # Save char2idx
-    with open(CHAR2IDX_PATH, "w", encoding="utf-8") as f:
-        json.dump(char2idx, f, ensure_ascii=False)
-
-    # DataLoader
-    ds = PwDataset(passwords, char2idx)
-    dl = DataLoader(ds, batch_size=BATCH_SIZE, shuffle=True, num_workers=4, pin_memory=True)
-
-    # Model
-    model = SeqAutoencoder(vocab_size, emb_dim=EMB_DIM, hidden_dim=HIDDEN_DIM, pad_idx=char2idx["<pad>"])
-    model.to(DEVICE)
-    opt = torch.optim.Adam(model.parameters(), lr=1e-3)
-    criterion = nn.CrossEntropyLoss(ignore_index=char2idx["<pad>"])
-
-    print("[INFO] Training autoencoder on sampled passwords...")
-    model.train()
-    for epoch in range(EPOCHS):
-        total_loss = 0.0
-        for batch in tqdm(dl, desc=f"Epoch {epoch+1}/{EPOCHS}"):
-            batch = batch.to(DEVICE)  # [B,L]
-            logits = model(batch)     # [B,L,V]
-            # compute loss: flatten
-            loss = criterion(logits.view(-1, logits.size(-1)), batch.view(-1))
-            opt.zero_grad(); loss.backward(); opt.step()
-            total_loss += float(loss.item())
-        print(f"[INFO] Epoch {epoch+1} loss: {total_loss/len(dl):.4f}")
-
-    # Save AE
-    torch.save(model.state_dict(), AE_PATH)
-    print(f"[✅] Autoencoder saved -> {AE_PATH}")
 
-    # -------------------------
-    # Build IsolationForest on structural features
-    # -------------------------
+def fit_isoforest(passwords):
     print("[INFO] Extracting structural features for IsolationForest...")
     feats = np.array([extract_struct_features(p) for p in tqdm(passwords)])
     print("[INFO] Fitting IsolationForest...")
@@ -171,12 +202,67 @@ def train():
     if_model.fit(feats)
     joblib.dump(if_model, IF_PATH)
     print(f"[✅] IsolationForest saved -> {IF_PATH}")
+    # Exact scores for the most common feature rows (detector memo)
+    build_if_table(if_model, common_rows(passwords, extract_struct_features, IF_TABLE_ROWS), IF_TABLE_PATH)
+
+
+def train(world_size=1, threads=None, epochs=EPOCHS, batch_size=BATCH_SIZE, lr=1e-3, sample_size=SAMPLE_SIZE,
+          checkpoint_every=0, resume=False, seed=0, port=29500):
+    """
+    Train the autoencoder, then the IsolationForest. world_size > 1 spawns that many
+    CPU ranks (torch.distributed, gloo); each uses `threads` intra-op threads (default:
+    cores / world_size) and batches of batch_size, so the global batch is
+    world_size * batch_size. checkpoint_every saves model + optimizer every N steps
+    (and at each epoch end); resume=True continues from that checkpoint.
+    """
+    passwords = load_passwords(sample_size, seed)
+
+    tokenizer = CharTokenizer.from_passwords(passwords, MAX_LEN)
+    # Save char2idx
+    tokenizer.save(CHAR2IDX_PATH)
+    write_tokens(passwords, tokenizer, TOKENS_PATH)
+
+    cfg = {
+        "world_size": world_size,
+        "threads": threads or max(1, (os.cpu_count() or 1) // world_size),
+        "epochs": epochs, "batch_size": batch_size, "lr": lr, "seed": seed, "port": port,
+        "tokens": str(TOKENS_PATH), "vocab_size": tokenizer.vocab_size, "pad": tokenizer.pad,
+        "output": str(AE_PATH), "checkpoint": str(CHECKPOINT_PATH), "checkpoint_every": checkpoint_every, "resume": resume,
+    }
+    print(f"[INFO] Training autoencoder on {world_size} rank(s) x {cfg['threads']} thread(s)...")
+    if world_size == 1:
+        _train_rank(0, cfg)
+    else:
+        import torch.multiprocessing as mp
+        mp.spawn(_train_rank, args=(cfg,), nprocs=world_size, join=True)
+
+    # -------------------------
+    # Build IsolationForest on structural features
+    # -------------------------
+    fit_isoforest(passwords)
 
     # Save metadata
-    meta = {"char2idx": str(CHAR2IDX_PATH.name), "max_len": MAX_LEN, "vocab_size": vocab_size}
+    meta = {"char2idx": str(CHAR2IDX_PATH.name), "max_len": MAX_LEN, "vocab_size": tokenizer.vocab_size}
     with open(META_PATH, "w", encoding="utf-8") as f:
         json.dump(meta, f)
     print(f"[✅] Meta saved -> {META_PATH}")
 
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the char-level autoencoder and IsolationForest")
+    parser.add_argument("--world-size", type=int, default=1, help="CPU data-parallel ranks (gloo)")
+    parser.add_argument("--threads", type=int, help="intra-op threads per rank (default: cores / world size)")
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="per rank")
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--sample-size", type=int, default=SAMPLE_SIZE, help="0 = whole corpus")
+    parser.add_argument("--checkpoint-every", type=int, default=0, help="steps between checkpoints (0 = off)")
+    parser.add_argument("--resume", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=29500, help="rendezvous port for the ranks")
+    args = parser.parse_args()
+    train(args.world_size, args.threads, args.epochs, args.batch_size, args.lr, args.sample_size,
+          args.checkpoint_every, args.resume, args.seed, args.port)
+
 if __name__ == "__main__":
-    train()
+    main()
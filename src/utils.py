@@ -12,8 +12,3 @@ def compute_entropy(password: str):
 def clean_password(pw: str):
     """Simple cleaning (strip, lower)"""
     return pw.strip()
-
-def has_common_pattern(pw: str):
-    patterns = ["password", "12345", "qwerty", "admin", "letmein"]
-    pw_lower = pw.lower()
-    return any(p in pw_lower for p in patterns)